@@ -0,0 +1,235 @@
+"""
+LAC Translate - headless command-line batch translator
+
+Translates PDFs without the Qt GUI (PySide6 is never imported), for
+servers and scripted batches:
+
+    python -m app.cli translate contract.pdf -o contract_it.pdf
+    python -m app.cli translate a.pdf b.pdf -o out/ --src en --tgt it
+    python -m app.cli translate input/ -o output/ --workers 4 --pages 1-50
+
+Inputs may be files or directories (every *.pdf inside, --recursive for
+subdirectories). The translation engine is created once and reused for
+every document, so the OPUS-MT model is loaded only once per run. With
+LAC_MT_SERVER set, the running translation server is used instead.
+
+Every translated page is checkpointed in a journal next to the output
+(OUT.pdf.journal.sqlite3): rerunning an interrupted command resumes from
+the pages already done. The journal is removed once a document is complete.
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from app.__version__ import __version__, APP_NAME
+from app.core.config import DECODING_PROFILES, DEFAULT_PIPELINE_CONFIG
+from app.core.job_journal import JobJournal, journal_path_for
+from app.core.pdf_processor import PDFProcessor
+from app.core.translation_server import RemoteTranslationEngine
+from app.core.translator import TranslationEngine
+
+
+def parse_page_ranges(spec: str, page_count: int) -> List[int]:
+    """
+    Parse a 1-based page selection ("1-50", "3,7,10-12", "40-") into
+    0-based page numbers, clamped to the document.
+
+    Raises:
+        ValueError: Malformed selection
+    """
+    pages = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start, dash, end = part.partition("-")
+        first = int(start) if start.strip() else 1
+        last = (int(end) if end.strip() else page_count) if dash else first
+        if first < 1 or last < first:
+            raise ValueError(f"Invalid page range: {part!r}")
+        pages.extend(range(first - 1, min(last, page_count)))
+    return list(dict.fromkeys(pages))
+
+
+def collect_inputs(paths: Iterable[str], recursive: bool = False) -> List[Tuple[Path, Path]]:
+    """
+    Expand files and directories into (pdf_path, path relative to its input).
+
+    Raises:
+        FileNotFoundError: An input does not exist
+    """
+    found = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            pattern = "**/*.pdf" if recursive else "*.pdf"
+            for pdf_path in sorted(path.glob(pattern)):
+                if pdf_path.is_file():
+                    found.append((pdf_path, pdf_path.relative_to(path)))
+        elif path.is_file():
+            found.append((path, Path(path.name)))
+        else:
+            raise FileNotFoundError(f"Input not found: {raw}")
+    return found
+
+
+def output_path_for(relative: Path, output: Path, target_lang: str, single_file: bool) -> Path:
+    """Output file of one document: output itself for a single file named *.pdf, else inside output."""
+    if single_file and output.suffix.lower() == ".pdf":
+        return output
+    return output / relative.with_name(f"{relative.stem}_{target_lang}.pdf")
+
+
+def translate_command(args: argparse.Namespace) -> int:
+    try:
+        inputs = collect_inputs(args.inputs, recursive=args.recursive)
+    except FileNotFoundError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if not inputs:
+        print("error: no PDF files found", file=sys.stderr)
+        return 2
+
+    output = Path(args.output)
+    single_file = len(inputs) == 1 and not Path(args.inputs[0]).is_dir()
+
+    # One engine for the whole run: models load once and stay cached
+    try:
+        translator = None
+        if not args.local:
+            translator = RemoteTranslationEngine.from_environment(args.src, args.tgt)
+        if translator is None:
+            options = {"profile": args.profile} if args.profile else {}
+            translator = TranslationEngine(args.src, args.tgt, **options)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    pipeline = None if args.no_pipeline else DEFAULT_PIPELINE_CONFIG
+    failures = 0
+    total_pages = 0
+    t_run = time.time()
+
+    for number, (pdf_path, relative) in enumerate(inputs, start=1):
+        target = output_path_for(relative, output, args.tgt, single_file)
+        prefix = f"[{number}/{len(inputs)}] {pdf_path}"
+        t0 = time.time()
+        journal = None
+        try:
+            journal_path = journal_path_for(target)
+            if args.restart and journal_path.exists():
+                JobJournal(journal_path).discard()
+            journal = JobJournal(journal_path)
+            processor = PDFProcessor(str(pdf_path))
+            pages = (
+                parse_page_ranges(args.pages, processor.page_count)
+                if args.pages else list(range(processor.page_count))
+            )
+            # Pages are translated inside one copy of the document
+            done = []
+            result = processor.translate_document(
+                translator,
+                pages=pages,
+                workers=args.workers,
+                pipeline=pipeline,
+                journal=journal,
+                into=processor.copy_document(),
+                page_callback=lambda page_num, _: done.append(page_num),
+                decoding_profile=args.profile,
+                ocr_language=args.src,
+            )
+            translated = len(done)
+            if translated:
+                if translated < result.page_count:
+                    result.select(sorted(done))
+                target.parent.mkdir(parents=True, exist_ok=True)
+                result.save(str(target), garbage=4, deflate=True, clean=True)
+            result.close()
+            processor.close()
+        except Exception as e:
+            failures += 1
+            logging.error(f"{pdf_path}: translation failed: {e}", exc_info=args.verbose)
+            print(f"{prefix}: FAILED ({e})")
+            if journal is not None:
+                journal.close()
+            continue
+
+        resumed = journal.resumed
+        if translated == len(pages):
+            journal.discard()
+        else:
+            journal.close()
+
+        elapsed = time.time() - t0
+        total_pages += translated
+        if translated < len(pages):
+            failures += 1
+        rate = (translated - resumed) / elapsed * 60 if elapsed > 0 else 0.0
+        saved = f" -> {target}" if translated else ""
+        reused = f", {resumed} resumed" if resumed else ""
+        print(
+            f"{prefix}: {translated}/{len(pages)} pages{reused} in {elapsed:.1f}s "
+            f"({rate:.1f} pages/min){saved}"
+        )
+
+    elapsed = time.time() - t_run
+    rate = total_pages / elapsed * 60 if elapsed > 0 else 0.0
+    print(
+        f"Done: {len(inputs) - failures}/{len(inputs)} documents, {total_pages} pages "
+        f"in {elapsed:.1f}s ({rate:.1f} pages/min)"
+    )
+    return 1 if failures else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.cli",
+        description=f"{APP_NAME} {__version__} - headless PDF translation",
+    )
+    parser.add_argument("--log-level", default=os.environ.get("LOG_LEVEL", "WARNING"))
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show tracebacks of failed documents")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    translate = commands.add_parser("translate", help="Translate PDF files or directories")
+    translate.add_argument("inputs", nargs="+", metavar="IN", help="PDF files and/or directories")
+    translate.add_argument("-o", "--output", required=True, metavar="OUT",
+                           help="Output directory, or output file when translating a single PDF")
+    translate.add_argument("--src", default="en", help="Source language code (default: %(default)s)")
+    translate.add_argument("--tgt", default="it", help="Target language code (default: %(default)s)")
+    translate.add_argument("--workers", type=int, default=None,
+                           help="Worker processes per document (default: $LAC_PAGE_WORKERS or 1)")
+    translate.add_argument("--pages", help="1-based page selection, e.g. 1-50 or 1,3,10-12")
+    translate.add_argument("--profile", choices=sorted(DECODING_PROFILES), default=None,
+                           help="Decoding profile (default: the engine's)")
+    translate.add_argument("-r", "--recursive", action="store_true", help="Include subdirectories")
+    translate.add_argument("--no-pipeline", action="store_true",
+                           help="Translate pages strictly one after another")
+    translate.add_argument("--restart", action="store_true",
+                           help="Ignore checkpoints of an interrupted run and translate from scratch")
+    translate.add_argument("--local", action="store_true",
+                           help="Ignore LAC_MT_SERVER and load the models in this process")
+    translate.set_defaults(func=translate_command)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper(), logging.WARNING),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    from app.core.sentry_integration import init_sentry, flush as sentry_flush
+    init_sentry()
+    try:
+        return args.func(args)
+    finally:
+        sentry_flush()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,21 +4,50 @@ Core package initialization
 This package provides:
 - PDFProcessor: PDF processing with OCR support
 - TranslationEngine: OPUS-MT based translation
+- TranslationMemory: Persistent SQLite cache of translations
+- TranslationPlan: Document-level deduplicated segment translations
+- TranslationServer / RemoteTranslationEngine: Shared local model server and client
+- TranslationWorkerPool: Worker processes sharing one copy of the model weights
+- PagePipeline: Overlapping analysis/translation/insertion stages across pages
+- JobJournal: Per-page checkpoints for resumable translation jobs
+- TranslatedPageStore: File-backed output document with a memory budget
+- OcrResultCache: Content-addressed disk cache of OCR/layout results
+- OcrEnginePool: Several RapidOCR instances recognizing pages concurrently
+- PageAnalysis: One text extraction of a page shared by every consumer
+- TriageReport: Per-page classification and cost estimate of a document
 - Config classes: Centralized configuration
 - Formatting classes: Text formatting preservation
 - Sentry integration: Error tracking and monitoring
 """
 from .translator import TranslationEngine
+from .translation_memory import TranslationMemory
+from .translation_plan import TranslationPlan
+from .translation_server import TranslationServer, RemoteTranslationEngine
+from .worker_pool import TranslationWorkerPool, worker_translator
+from .page_pipeline import PagePipeline
+from .job_journal import JobJournal
+from .page_store import TranslatedPageStore
+from .ocr_cache import OcrResultCache
+from .ocr_pool import OcrEnginePool
+from .page_analysis import PageAnalysis
+from .page_triage import PageTriage, TriageReport
 from .pdf_processor import PDFProcessor
 from .config import (
     OCRConfig, 
     TextQualityConfig, 
     ScanDetectionConfig,
     ParagraphConfig,
+    DecodingProfile,
+    DECODING_PROFILES,
+    PipelineConfig,
+    TriageConfig,
     DEFAULT_OCR_CONFIG,
     DEFAULT_TEXT_QUALITY_CONFIG,
     DEFAULT_SCAN_DETECTION_CONFIG,
     DEFAULT_PARAGRAPH_CONFIG,
+    DEFAULT_DECODING_PROFILE,
+    DEFAULT_PIPELINE_CONFIG,
+    DEFAULT_TRIAGE_CONFIG,
 )
 from .formatting import SpanFormat, LineFormatInfo
 from .format_utils import (
@@ -42,16 +71,37 @@ from .sentry_integration import (
 __all__ = [
     # Core processors
     'TranslationEngine', 
+    'TranslationMemory',
+    'TranslationPlan',
+    'TranslationServer',
+    'RemoteTranslationEngine',
+    'TranslationWorkerPool',
+    'worker_translator',
+    'PagePipeline',
+    'JobJournal',
+    'TranslatedPageStore',
+    'OcrResultCache',
+    'OcrEnginePool',
+    'PageAnalysis',
+    'PageTriage',
+    'TriageReport',
     'PDFProcessor',
     # Config
     'OCRConfig',
     'TextQualityConfig',
     'ScanDetectionConfig', 
     'ParagraphConfig',
+    'DecodingProfile',
+    'DECODING_PROFILES',
+    'PipelineConfig',
+    'TriageConfig',
     'DEFAULT_OCR_CONFIG',
     'DEFAULT_TEXT_QUALITY_CONFIG',
     'DEFAULT_SCAN_DETECTION_CONFIG',
     'DEFAULT_PARAGRAPH_CONFIG',
+    'DEFAULT_DECODING_PROFILE',
+    'DEFAULT_PIPELINE_CONFIG',
+    'DEFAULT_TRIAGE_CONFIG',
     # Formatting
     'SpanFormat',
     'LineFormatInfo',
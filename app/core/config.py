@@ -32,6 +32,8 @@ class OCRConfig:
     # Image preprocessing
     ocr_scale: float = 2.0  # Scale factor for page-to-image conversion (2.0 = 144 DPI)
     ocr_scale_fallback: float = 1.5  # Fallback scale if memory issues
+    grayscale: bool = False  # Preprocess scans as one gray channel (1/3 of the memory)
+    native_images: bool = True  # OCR single-image scans from the embedded image, not a page render
     
     # Column detection
     column_gap_ratio: float = 0.15  # Gap > 15% page width = column boundary
@@ -108,6 +110,112 @@ class ParagraphConfig:
     cross_block_gap_factor: float = 2.0  # 2x font size gap = new para
 
 
+# ============================================
+# Translation Decoding Profiles
+# ============================================
+
+@dataclass(frozen=True)
+class DecodingProfile:
+    """Decoding settings for OPUS-MT generation.
+    
+    The output budget follows the input: max_new_tokens =
+    input_tokens * max_new_tokens_ratio + max_new_tokens_extra, capped at
+    max_new_tokens_cap. Beam width depends on the segment class
+    ("heading", "cell", "body"); short segments are decoded greedily.
+    """
+    
+    name: str
+    
+    # Output budget
+    max_new_tokens_ratio: float = 2.0  # Translations rarely exceed 2x the source tokens
+    max_new_tokens_extra: int = 8  # Headroom for very short inputs
+    max_new_tokens_cap: int = 512
+    
+    # Beam width per segment class (1 = greedy)
+    heading_beams: int = 2
+    cell_beams: int = 1
+    body_beams: int = 4
+    greedy_max_words: int = 3  # Segments up to this many words are always greedy
+    
+    # Repetition guard: an n-gram of this size never repeats (0 = off)
+    no_repeat_ngram_size: int = 5
+
+
+FAST_DECODING_PROFILE = DecodingProfile(
+    name="fast",
+    max_new_tokens_ratio=1.6,
+    heading_beams=1,
+    cell_beams=1,
+    body_beams=1,
+    no_repeat_ngram_size=4,
+)
+
+BALANCED_DECODING_PROFILE = DecodingProfile(name="balanced")
+
+QUALITY_DECODING_PROFILE = DecodingProfile(
+    name="quality",
+    max_new_tokens_ratio=3.0,
+    max_new_tokens_extra=16,
+    heading_beams=4,
+    cell_beams=4,
+    body_beams=5,
+    greedy_max_words=0,
+    no_repeat_ngram_size=6,
+)
+
+DECODING_PROFILES: Dict[str, DecodingProfile] = {
+    profile.name: profile
+    for profile in (FAST_DECODING_PROFILE, BALANCED_DECODING_PROFILE, QUALITY_DECODING_PROFILE)
+}
+
+
+# ============================================
+# Page Pipeline
+# ============================================
+
+@dataclass(frozen=True)
+class PipelineConfig:
+    """Stage layout of the page pipeline (see page_pipeline.py).
+    
+    Pages flow analyze -> translate -> insert through bounded queues, so
+    layout/OCR of page N+1 overlaps MT of page N and insertion of N-1.
+    """
+    
+    # Worker threads per stage
+    analyze_workers: int = 1
+    translate_workers: int = 1
+    insert_workers: int = 1
+    
+    # Pages waiting between two stages (bounds memory and look-ahead)
+    queue_size: int = 2
+    
+    # Upcoming pages analysed together when the analyze stage reaches a
+    # scanned page without RapidDoc output (one batched model call)
+    ocr_batch_pages: int = 8
+
+
+# ============================================
+# Document Triage
+# ============================================
+
+@dataclass(frozen=True)
+class TriageConfig:
+    """Page classification of PDFProcessor.triage() (see page_triage.py)."""
+    
+    # Grayscale thumbnail rendered for blank detection
+    thumbnail_dpi: int = 24
+    # Gray level below which a thumbnail pixel counts as ink (thin text
+    # fades at thumbnail resolution)
+    ink_threshold: int = 250
+    # Pages without words and with less ink than this fraction are blank
+    blank_ink_ratio: float = 0.001
+    
+    # Ruling lines shorter than this (points) are not table rules
+    min_rule_length: float = 20.0
+    # Table likelihood from which a page counts as complex
+    table_likelihood: float = 0.5
+
+
 # ============================================
 # Font Family Detection
 # ============================================
@@ -175,3 +283,6 @@ DEFAULT_OCR_CONFIG = OCRConfig()
 DEFAULT_TEXT_QUALITY_CONFIG = TextQualityConfig()
 DEFAULT_SCAN_DETECTION_CONFIG = ScanDetectionConfig()
 DEFAULT_PARAGRAPH_CONFIG = ParagraphConfig()
+DEFAULT_DECODING_PROFILE = BALANCED_DECODING_PROFILE
+DEFAULT_PIPELINE_CONFIG = PipelineConfig()
+DEFAULT_TRIAGE_CONFIG = TriageConfig()
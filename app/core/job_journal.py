@@ -0,0 +1,237 @@
+"""
+Job journal - per-page checkpoints of a document translation.
+
+Translated pages otherwise live only in memory until the whole document
+is saved, so a crash or cancel at page 180 of 200 loses everything. The
+journal is a small SQLite file (usually next to the output) that records
+every completed page as it finishes:
+
+- the translated single-page PDF
+- a hash of the source page content
+- a hash of the settings it was translated with (languages, model,
+  decoding profile, page options)
+- how long it took
+
+PDFProcessor.translate_document(journal=...) reuses every page whose
+source hash and settings hash still match, and translates only the rest.
+
+Usage:
+    from app.core.job_journal import JobJournal, journal_path_for
+
+    journal = JobJournal(journal_path_for("out/contract_it.pdf"))
+    doc = processor.translate_document(translator, journal=journal)
+    journal.discard()  # job complete, checkpoints no longer needed
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Journals of GUI jobs (the output path is only known at save time)
+DEFAULT_JOURNAL_DIR = Path.home() / ".lac-translate" / "jobs"
+
+JOURNAL_SUFFIX = ".journal.sqlite3"
+
+# Bump when translated page output changes for the same settings
+_JOURNAL_FORMAT = 1
+
+
+def journal_path_for(output_path: os.PathLike) -> Path:
+    """Journal file next to an output PDF (out/doc_it.pdf -> out/doc_it.pdf.journal.sqlite3)."""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + JOURNAL_SUFFIX)
+
+
+def page_source_hash(document, page_num: int) -> str:
+    """
+    Hash of what a page's translation depends on: geometry, content
+    stream, embedded images and fonts. Does not modify the page.
+    """
+    page = document[page_num]
+    digest = hashlib.sha256()
+    digest.update(repr((tuple(page.rect), page.rotation)).encode())
+    digest.update(page.read_contents())
+    for image in page.get_images(full=True):
+        try:
+            digest.update(document.xref_stream_raw(image[0]) or b"")
+        except Exception:
+            digest.update(repr(image).encode())
+    for font in page.get_fonts(full=True):
+        digest.update(repr(font[1:5]).encode())
+    return digest.hexdigest()
+
+
+def settings_hash(translator, page_options: Dict[str, Any]) -> str:
+    """Hash of the translation settings that affect the output of a page."""
+    source_lang = getattr(translator, "source_lang", None)
+    target_lang = getattr(translator, "target_lang", None)
+    profile = getattr(translator, "profile", None)
+    model_map = getattr(translator, "OPUS_MODEL_MAP", None) or {}
+    # Precision (LAC_MT_PRECISION) and backend (LAC_MT_BACKEND) change the
+    # output too; remote engines choose them on the server
+    get_precision = getattr(translator, "get_precision", None)
+    get_backend = getattr(translator, "get_backend", None)
+    settings = {
+        "format": _JOURNAL_FORMAT,
+        "source_lang": source_lang,
+        "target_lang": target_lang,
+        "model": model_map.get((source_lang, target_lang)),
+        "precision": get_precision(source_lang, target_lang) if get_precision else None,
+        "backend": get_backend() if get_backend else None,
+        "profile": getattr(profile, "name", profile),
+        "page_options": page_options,
+    }
+    encoded = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class JobJournal:
+    """
+    SQLite checkpoint file of one translation job.
+
+    Safe to use from several threads of one process; pages are committed
+    as soon as they are recorded.
+    """
+
+    def __init__(self, path: os.PathLike):
+        """
+        Open (or create) a journal.
+
+        Args:
+            path: SQLite file path (see journal_path_for())
+        """
+        self.path = Path(path)
+        self.resumed = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " page_num INTEGER PRIMARY KEY,"
+                " source_hash TEXT NOT NULL,"
+                " settings_hash TEXT NOT NULL,"
+                " pdf BLOB NOT NULL,"
+                " elapsed REAL NOT NULL,"
+                " completed_at REAL NOT NULL)"
+            )
+        logger.info(f"Job journal opened: {self.path}")
+
+    @classmethod
+    def for_source(cls, pdf_path: os.PathLike) -> "JobJournal":
+        """Journal of a source document in DEFAULT_JOURNAL_DIR (GUI jobs)."""
+        key = hashlib.sha1(str(Path(pdf_path).resolve()).encode()).hexdigest()[:16]
+        return cls(DEFAULT_JOURNAL_DIR / f"{Path(pdf_path).stem}-{key}{JOURNAL_SUFFIX}")
+
+    def completed(self, source_hashes: Dict[int, str], settings: str) -> Iterator[Tuple[int, bytes]]:
+        """
+        Pages that can be reused: recorded with the same source and settings hash.
+
+        Only the hashes are read up front; each matching page's PDF is
+        loaded as it is consumed, so a long journal is never held in
+        memory at once. A page whose PDF cannot be read is left out (and
+        translated again).
+
+        Args:
+            source_hashes: page_num -> page_source_hash() of the pages wanted
+            settings: settings_hash() of the current job
+
+        Yields:
+            (page_num, translated single-page PDF bytes), in source_hashes order
+        """
+        if not source_hashes:
+            return
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT page_num, source_hash, settings_hash FROM pages"
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Job journal read failed, translating all pages: {e}")
+            return
+
+        recorded = {page_num: (source_hash, page_settings) for page_num, source_hash, page_settings in rows}
+        reusable = [
+            page_num for page_num, source_hash in source_hashes.items()
+            if recorded.get(page_num) == (source_hash, settings)
+        ]
+        if reusable:
+            logger.info(f"Job journal: resuming {len(reusable)} completed page(s) from {self.path.name}")
+        for page_num in reusable:
+            try:
+                with self._lock:
+                    row = self._conn.execute(
+                        "SELECT pdf FROM pages WHERE page_num = ?", (page_num,)
+                    ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Job journal: page {page_num + 1} unreadable, translating it again: {e}")
+                continue
+            if row is None:
+                continue
+            self.resumed += 1
+            yield page_num, bytes(row[0])
+
+    def record(
+        self,
+        page_num: int,
+        source_hash: str,
+        settings: str,
+        pdf_bytes: bytes,
+        elapsed: float = 0.0,
+    ) -> None:
+        """Checkpoint one translated page (replaces an older entry)."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO pages "
+                    "(page_num, source_hash, settings_hash, pdf, elapsed, completed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (page_num, source_hash, settings, sqlite3.Binary(pdf_bytes), elapsed, time.time()),
+                )
+            self.recorded += 1
+        except sqlite3.Error as e:
+            logger.warning(f"Job journal write failed for page {page_num + 1}: {e}")
+
+    def stats(self) -> dict:
+        """Pages stored, resumed and recorded in this session, time spent on stored pages."""
+        try:
+            with self._lock:
+                pages, elapsed = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(elapsed), 0) FROM pages"
+                ).fetchone()
+        except sqlite3.Error:
+            pages, elapsed = -1, 0.0
+        return {
+            "path": str(self.path),
+            "pages": pages,
+            "elapsed_s": round(elapsed, 3),
+            "resumed": self.resumed,
+            "recorded": self.recorded,
+        }
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+    def discard(self) -> None:
+        """Close and delete the journal (job finished)."""
+        self.close()
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                Path(str(self.path) + suffix).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Could not remove job journal {self.path}{suffix}: {e}")
@@ -0,0 +1,275 @@
+"""
+OCR result cache - content-addressed disk cache of RapidOCR and RapidDoc output.
+
+OCR and layout analysis are the slowest part of translating a scanned
+page, and the same page is analysed again and again: by extract_text()
+and translate_page(), after the target language changes, on every run
+over the same documents. Their output depends only on the page content
+and the engine configuration, so it is cached on disk:
+
+- RapidOCR: the raw boxes, texts and scores (text reconstruction and
+  post-processing run again, so improvements there apply to cached pages)
+- RapidDoc: the Markdown plus its metadata (block_bboxes, page_size, ...)
+
+Entries are keyed by a hash of the page content (see
+job_journal.page_source_hash), the engine configuration fingerprint and
+the way the page was rendered. The file is size-bounded with
+least-recently-used eviction.
+
+Usage:
+    from app.core.ocr_cache import get_ocr_cache, cache_key
+
+    cache = get_ocr_cache()
+    key = cache_key("rapidocr", engine_fingerprint, page_hash, "render:2.0")
+    payload = cache.get(key) if cache else None
+    if payload is None:
+        payload = run_ocr()
+        cache.put(key, "rapidocr", payload)
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default location: next to the user config (~/.lac-translate/.env)
+DEFAULT_CACHE_PATH = Path.home() / ".lac-translate" / "ocr_cache.sqlite3"
+
+# Override location with LAC_OCR_CACHE (set to "off" to disable)
+CACHE_PATH_ENV = "LAC_OCR_CACHE"
+
+# Size bound in MB (LAC_OCR_CACHE_MB); a RapidOCR page is ~20-60 KB of JSON
+CACHE_SIZE_ENV = "LAC_OCR_CACHE_MB"
+DEFAULT_MAX_MB = 256
+
+# Evict down to this fraction of the size bound, so eviction runs rarely
+_EVICT_TARGET_RATIO = 0.9
+
+# Bump when the stored payload layout changes
+_CACHE_FORMAT = 1
+
+
+def cache_key(engine: str, *parts: Any) -> str:
+    """Content address of one OCR result: engine name plus everything the output depends on."""
+    digest = hashlib.sha256(f"{_CACHE_FORMAT}:{engine}".encode())
+    for part in parts:
+        digest.update(b"\0")
+        digest.update(str(part).encode())
+    return digest.hexdigest()
+
+
+def config_fingerprint(params: Dict[str, Any]) -> str:
+    """
+    Hash of an engine configuration, ignoring thread counts (they change
+    with the resource governor but not the output).
+    """
+    relevant = {
+        key: str(value)
+        for key, value in params.items()
+        if "num_threads" not in key
+    }
+    encoded = json.dumps(relevant, sort_keys=True)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+class OcrResultCache:
+    """
+    SQLite-backed OCR/layout result cache with LRU eviction by size.
+
+    One instance is shared by all PDFProcessor objects of a process (see
+    get_ocr_cache()); several processes may open the same file.
+    """
+
+    def __init__(self, path: Optional[os.PathLike] = None, max_mb: float = DEFAULT_MAX_MB):
+        """
+        Open (or create) the cache.
+
+        Args:
+            path: SQLite file path (default: DEFAULT_CACHE_PATH)
+            max_mb: Maximum size of the stored payloads before eviction
+        """
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " engine TEXT NOT NULL,"
+                " payload BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used)"
+            )
+            # Upper bound of the stored bytes, so writes need not sum the table
+            self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        logger.info(f"OCR cache opened: {self.path}")
+
+    @classmethod
+    def from_environment(cls) -> Optional["OcrResultCache"]:
+        """
+        Open the default cache, honouring LAC_OCR_CACHE and LAC_OCR_CACHE_MB.
+
+        Returns None when disabled ("off") or when the file cannot be opened,
+        so OCR keeps working without a cache.
+        """
+        location = os.environ.get(CACHE_PATH_ENV, "").strip()
+        if location.lower() in ("off", "0", "false", "none"):
+            logger.info("OCR cache disabled by environment")
+            return None
+        try:
+            max_mb = float(os.environ.get(CACHE_SIZE_ENV, DEFAULT_MAX_MB))
+        except ValueError:
+            max_mb = DEFAULT_MAX_MB
+        try:
+            return cls(location or None, max_mb=max_mb)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"OCR cache unavailable: {e}")
+            return None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Stored payload for key (marked as recently used), or None."""
+        try:
+            with self._lock, self._conn:
+                row = self._conn.execute(
+                    "SELECT payload FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key)
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"OCR cache lookup failed: {e}")
+            row = None
+
+        if row is None:
+            self.misses += 1
+            return None
+        try:
+            payload = json.loads(bytes(row[0]).decode("utf-8"))
+        except (ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"OCR cache entry unreadable, ignoring it: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return payload
+
+    def put(self, key: str, engine: str, payload: Dict[str, Any]) -> None:
+        """Store a JSON-serializable payload, evicting old entries if needed."""
+        try:
+            data = json.dumps(payload, default=_json_default).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            logger.warning(f"OCR result not cacheable: {e}")
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, engine, payload, size, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, engine, sqlite3.Binary(data), len(data), time.time()),
+                )
+                self._total += len(data)
+                self._evict_locked()
+        except sqlite3.Error as e:
+            logger.warning(f"OCR cache write failed: {e}")
+
+    def _evict_locked(self) -> None:
+        """
+        Drop least-recently-used entries above max_bytes (lock held).
+
+        The table is only summed once the running total passes max_bytes:
+        the running total also adds replaced entries and misses results
+        written by other processes, so it is resynced here.
+        """
+        if self._total <= self.max_bytes:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        self._total = total
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * _EVICT_TARGET_RATIO)
+        freed = 0
+        keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY last_used"):
+            if total - freed <= target:
+                break
+            keys.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM results WHERE key = ?", keys)
+        self._total = total - freed
+        logger.info(f"OCR cache: evicted {len(keys)} entries ({freed // 1024} KB)")
+
+    def clear(self) -> None:
+        """Remove all stored results and reset statistics."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+            self._total = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Get hit/miss statistics and current size."""
+        try:
+            with self._lock:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results"
+                ).fetchone()
+        except sqlite3.Error:
+            entries, size = -1, 0
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def _json_default(value):
+    """numpy arrays and scalars in payloads (boxes, scores)."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+_shared_cache: Optional[OcrResultCache] = None
+_shared_pid: Optional[int] = None
+_shared_lock = threading.Lock()
+
+
+def get_ocr_cache() -> Optional[OcrResultCache]:
+    """
+    The process-wide OCR cache, opened on first use (None if disabled).
+
+    Worker processes created with fork open their own connection: SQLite
+    handles must not cross a fork.
+    """
+    global _shared_cache, _shared_pid
+    with _shared_lock:
+        if _shared_pid != os.getpid():
+            _shared_pid = os.getpid()
+            _shared_cache = OcrResultCache.from_environment()
+        return _shared_cache
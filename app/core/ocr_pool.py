@@ -0,0 +1,265 @@
+"""
+OCR engine pool - several RapidOCR instances recognizing pages concurrently.
+
+RapidOcrEngine is a process-wide singleton around one RapidOCR object, so
+pages OCRed at the same time queue up on it, and one ONNX session does
+not scale past a few threads. OcrEnginePool holds several instances, each
+with a fixed per-instance thread count, and spreads a batch of page
+rasters over them:
+
+- threads:   the instances live in this process; ONNX Runtime releases
+             the GIL during inference
+- processes: one instance per worker process, for the Python pre- and
+             post-processing that holds the GIL. Rasters travel through
+             multiprocessing.shared_memory instead of being pickled.
+
+By default the pool uses the resource governor's OCR thread budget, split
+into instances of DEFAULT_THREADS_PER_INSTANCE threads.
+
+Usage:
+    from app.core.ocr_pool import get_ocr_pool
+
+    pool = get_ocr_pool()
+    results = pool.recognize_many([png_bytes_page1, array_page2])  # OcrBoxes, in order
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .rapid_ocr import OcrBoxes, create_engine, decode_image
+from .resources import get_governor
+from .sentry_integration import capture_exception
+
+logger = logging.getLogger(__name__)
+
+# Instances in the shared pool (default: OCR thread budget / threads per instance)
+OCR_INSTANCES_ENV = "LAC_OCR_INSTANCES"
+
+# "thread" (default) or "process"
+OCR_POOL_MODE_ENV = "LAC_OCR_POOL"
+
+# ONNX threads per RapidOCR instance: detection/recognition sessions stop
+# scaling at a few threads, several instances use the cores better
+DEFAULT_THREADS_PER_INSTANCE = 2
+
+POOL_MODES = ("thread", "process")
+
+OcrImage = Union[bytes, np.ndarray]
+
+# RapidOCR instance of the current worker process (set up by _init_process_worker)
+_process_engine = None
+
+
+def _as_array(image: OcrImage) -> np.ndarray:
+    """RGB uint8 array of an encoded image or an array (used as is)."""
+    if isinstance(image, np.ndarray):
+        return image
+    return decode_image(image)
+
+
+def _init_process_worker(threads: int) -> None:
+    """Pool initializer: one RapidOCR instance per worker process."""
+    global _process_engine
+    _process_engine = create_engine(threads)
+
+
+def _recognize_shared(name: str, shape: Tuple[int, ...], dtype: str):
+    """Worker: OCR of a raster in shared memory (attached, not copied)."""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        result = _process_engine(np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf))
+        return OcrBoxes.from_result(result)
+    finally:
+        block.close()
+
+
+class OcrEnginePool:
+    """
+    Pool of RapidOCR instances, in threads or worker processes.
+
+    recognize_many() is safe to call from several threads; each instance
+    runs one image at a time.
+    """
+
+    def __init__(
+        self,
+        instances: Optional[int] = None,
+        threads_per_instance: Optional[int] = None,
+        mode: str = "thread",
+        start_method: Optional[str] = None,
+    ):
+        """
+        Args:
+            instances: RapidOCR instances (default: OCR thread budget divided
+                by threads_per_instance)
+            threads_per_instance: ONNX threads of each instance
+                (default: DEFAULT_THREADS_PER_INSTANCE)
+            mode: "thread" or "process"
+            start_method: multiprocessing start method for mode="process"
+                (default: fork where available, else spawn)
+
+        Raises:
+            ValueError: Unknown mode
+        """
+        if mode not in POOL_MODES:
+            raise ValueError(f"Unknown OCR pool mode {mode!r} (expected one of {POOL_MODES})")
+        self.threads_per_instance = max(1, threads_per_instance or DEFAULT_THREADS_PER_INSTANCE)
+        if instances is None:
+            instances = get_governor().threads_for("ocr") // self.threads_per_instance
+        self.instances = max(1, instances)
+        self.mode = mode
+        self.recognized = 0
+
+        self._idle: "queue.Queue" = queue.Queue()
+        self._created = 0
+        self._create_lock = threading.Lock()
+        if mode == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=self.instances, thread_name_prefix="ocr-pool")
+        else:
+            from .worker_pool import default_start_method
+
+            context = multiprocessing.get_context(start_method or default_start_method())
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.instances,
+                mp_context=context,
+                initializer=_init_process_worker,
+                initargs=(self.threads_per_instance,),
+            )
+        logger.info(
+            f"OCR engine pool: {self.instances} RapidOCR instance(s) x "
+            f"{self.threads_per_instance} thread(s) in {mode}s"
+        )
+
+    # ------------------------------------------------------------------
+    # Thread mode
+    # ------------------------------------------------------------------
+
+    def _acquire(self):
+        """An idle instance; created lazily up to self.instances."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._create_lock:
+            if self._created < self.instances:
+                self._created += 1
+                try:
+                    return create_engine(self.threads_per_instance)
+                except Exception:
+                    self._created -= 1
+                    raise
+        return self._idle.get()
+
+    def _recognize_in_thread(self, image: OcrImage) -> OcrBoxes:
+        engine = self._acquire()
+        try:
+            return OcrBoxes.from_result(engine(_as_array(image)))
+        finally:
+            self._idle.put(engine)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def recognize_many(self, images: Sequence[OcrImage]) -> List[Optional[OcrBoxes]]:
+        """
+        Recognize several page rasters concurrently.
+
+        Args:
+            images: Encoded images (PNG, JPEG) or RGB uint8 arrays (H, W, 3)
+
+        Returns:
+            OcrBoxes per image, in input order (None where recognition failed)
+        """
+        if not images:
+            return []
+        if self.mode == "thread":
+            futures = [self._executor.submit(self._recognize_in_thread, image) for image in images]
+            blocks = []
+        else:
+            futures, blocks = self._submit_shared(images)
+
+        results: List[Optional[OcrBoxes]] = []
+        try:
+            for index, future in enumerate(futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    capture_exception(e, context={
+                        "operation": "ocr_pool_recognize",
+                        "mode": self.mode,
+                        "image": index,
+                    }, tags={"component": "ocr"})
+                    logger.error(f"OCR pool: image {index + 1}/{len(images)} failed: {e}")
+                    results.append(None)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+        self.recognized += len(images)
+        return results
+
+    def _submit_shared(self, images: Sequence[OcrImage]):
+        """Copy each raster once into shared memory and submit it to a worker."""
+        futures, blocks = [], []
+        for image in images:
+            array = np.ascontiguousarray(_as_array(image))
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            futures.append(self._executor.submit(_recognize_shared, block.name, array.shape, array.dtype.str))
+        return futures, blocks
+
+    def stats(self) -> dict:
+        """Pool layout and images recognized."""
+        return {
+            "mode": self.mode,
+            "instances": self.instances,
+            "threads_per_instance": self.threads_per_instance,
+            "recognized": self.recognized,
+        }
+
+    def close(self, wait: bool = True) -> None:
+        """Shut down the workers and release the instances."""
+        self._executor.shutdown(wait=wait)
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+    def __enter__(self) -> "OcrEnginePool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_shared_pool: Optional[OcrEnginePool] = None
+_shared_pid: Optional[int] = None
+_shared_lock = threading.Lock()
+
+
+def get_ocr_pool() -> OcrEnginePool:
+    """
+    The process-wide OCR pool, created on first use from LAC_OCR_INSTANCES
+    and LAC_OCR_POOL. Worker processes created with fork get their own.
+    """
+    global _shared_pool, _shared_pid
+    with _shared_lock:
+        if _shared_pool is None or _shared_pid != os.getpid():
+            try:
+                instances = int(os.environ.get(OCR_INSTANCES_ENV, "0")) or None
+            except ValueError:
+                instances = None
+            mode = os.environ.get(OCR_POOL_MODE_ENV, "thread").strip().lower()
+            if mode not in POOL_MODES:
+                logger.warning(f"{OCR_POOL_MODE_ENV}={mode!r} not recognized, using threads")
+                mode = "thread"
+            _shared_pool = OcrEnginePool(instances=instances, mode=mode)
+            _shared_pid = os.getpid()
+        return _shared_pool
@@ -0,0 +1,330 @@
+"""
+OPUS-MT on ONNX Runtime - no torch at inference time.
+
+The MarianMT encoder and decoder (with past key values) are exported to
+ONNX once per language pair and cached next to the Hugging Face cache.
+Decoding (greedy or beam search) runs on ONNX Runtime with numpy, which is
+already shipped for RapidOCR, so packaged builds do not need to load torch
+to translate.
+
+Export needs torch + optimum (build machine only):
+    pip install optimum[onnxruntime]
+
+Usage:
+    from app.core.onnx_marian import OnnxMarianModel, export_marian, onnx_export_dir
+
+    export_dir = onnx_export_dir("Helsinki-NLP/opus-mt-en-it", hub_cache)
+    if not OnnxMarianModel.is_exported(export_dir):
+        export_marian("Helsinki-NLP/opus-mt-en-it", export_dir)
+    model = OnnxMarianModel(export_dir, intra_op_threads=4)
+    token_ids = model.generate(input_ids, attention_mask, num_beams=4)
+"""
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Files written by optimum's seq2seq export (without decoder merging)
+_ENCODER_FILE = "encoder_model.onnx"
+_DECODER_FILE = "decoder_model.onnx"
+_DECODER_WITH_PAST_FILE = "decoder_with_past_model.onnx"
+_CONFIG_FILE = "config.json"
+
+# Finite stand-in for -inf, keeps beam arithmetic free of NaNs
+_NEG_INF = -1e9
+
+
+def onnx_export_dir(model_name: str, cache_root: Path) -> Path:
+    """Export directory for a model, e.g. <hub cache>/lac-translate-onnx/Helsinki-NLP--opus-mt-en-it."""
+    return Path(cache_root) / "lac-translate-onnx" / model_name.replace("/", "--")
+
+
+def export_marian(model_name: str, export_dir: Path) -> Path:
+    """
+    Export a MarianMT model to ONNX (encoder, decoder, decoder with past).
+
+    Writes to a temporary directory first, so an interrupted export never
+    leaves a half-written model behind.
+
+    Raises:
+        ImportError: optimum (and torch) not installed
+    """
+    from optimum.exporters.onnx import main_export
+
+    export_dir = Path(export_dir)
+    partial_dir = export_dir.with_name(export_dir.name + ".partial")
+    shutil.rmtree(partial_dir, ignore_errors=True)
+
+    logger.info(f"Exporting {model_name} to ONNX (one-time)...")
+    main_export(
+        model_name,
+        output=partial_dir,
+        task="text2text-generation-with-past",
+        no_post_process=True,  # keep decoder / decoder_with_past as separate graphs
+    )
+
+    shutil.rmtree(export_dir, ignore_errors=True)
+    export_dir.parent.mkdir(parents=True, exist_ok=True)
+    os.replace(partial_dir, export_dir)
+    logger.info(f"[OK] ONNX export cached: {export_dir}")
+    return export_dir
+
+
+def _log_softmax(logits: np.ndarray) -> np.ndarray:
+    """Numerically stable log-softmax over the last axis."""
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    return shifted - np.log(np.exp(shifted).sum(axis=-1, keepdims=True))
+
+
+def _ban_repeated_ngrams(tokens: np.ndarray, log_probs: np.ndarray, size: int) -> None:
+    """Forbid, per row, every token that would complete an n-gram already generated."""
+    prefix_len = size - 1
+    for row, sequence in enumerate(tokens.tolist()):
+        tail = sequence[len(sequence) - prefix_len:] if prefix_len else []
+        for i in range(len(sequence) - prefix_len):
+            if sequence[i:i + prefix_len] == tail:
+                log_probs[row, sequence[i + prefix_len]] = _NEG_INF
+
+
+class OnnxMarianModel:
+    """
+    MarianMT encoder-decoder running on ONNX Runtime.
+
+    generate() mirrors the subset of transformers' generate() used by the
+    translator: beam search with early stopping (num_beams=1 is greedy),
+    length penalty, n-gram repetition blocking, the pad token banned from
+    the output and EOS forced at max_length.
+    """
+
+    @staticmethod
+    def is_exported(export_dir: Path) -> bool:
+        """True if export_dir holds a complete export."""
+        export_dir = Path(export_dir)
+        return all(
+            (export_dir / name).exists()
+            for name in (_ENCODER_FILE, _DECODER_FILE, _DECODER_WITH_PAST_FILE, _CONFIG_FILE)
+        )
+
+    def __init__(self, export_dir: Path, intra_op_threads: int = 0):
+        """
+        Open the three ONNX Runtime sessions.
+
+        Args:
+            export_dir: Directory produced by export_marian()
+            intra_op_threads: Threads per operator (0 = ONNX Runtime default)
+        """
+        import onnxruntime as ort
+
+        self.export_dir = Path(export_dir)
+        self.intra_op_threads = intra_op_threads
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        providers = ["CPUExecutionProvider"]
+
+        self.encoder = ort.InferenceSession(
+            str(self.export_dir / _ENCODER_FILE), options, providers=providers
+        )
+        self.decoder = ort.InferenceSession(
+            str(self.export_dir / _DECODER_FILE), options, providers=providers
+        )
+        self.decoder_with_past = ort.InferenceSession(
+            str(self.export_dir / _DECODER_WITH_PAST_FILE), options, providers=providers
+        )
+
+        with open(self.export_dir / _CONFIG_FILE, encoding="utf-8") as f:
+            config = json.load(f)
+        self.pad_token_id = config["pad_token_id"]
+        self.eos_token_id = config["eos_token_id"]
+        self.decoder_start_token_id = config.get("decoder_start_token_id", self.pad_token_id)
+        self.forced_eos_token_id = config.get("forced_eos_token_id")
+
+        self._encoder_inputs = {i.name for i in self.encoder.get_inputs()}
+        self._decoder_inputs = {i.name for i in self.decoder.get_inputs()}
+        self._with_past_inputs = {i.name for i in self.decoder_with_past.get_inputs()}
+
+        logger.info(
+            f"ONNX Runtime MarianMT ready: {self.export_dir.name} "
+            f"(intra-op threads: {intra_op_threads or 'default'})"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the loaded graphs (each session holds its own copy of the weights)."""
+        return sum(
+            path.stat().st_size
+            for path in self.export_dir.iterdir()
+            if path.suffix in (".onnx", ".onnx_data") or path.name.endswith(".onnx.data")
+        )
+
+    def generate(
+        self,
+        input_ids: np.ndarray,
+        attention_mask: np.ndarray,
+        max_length: int = 512,
+        num_beams: int = 4,
+        length_penalty: float = 1.0,
+        no_repeat_ngram_size: int = 0,
+    ) -> List[List[int]]:
+        """
+        Decode a padded batch.
+
+        Args:
+            input_ids: (batch, src_len) int64 token ids
+            attention_mask: (batch, src_len) int64 mask
+            max_length: Maximum output length in tokens
+            num_beams: Beam width (1 = greedy)
+            length_penalty: Exponent applied to the hypothesis length
+            no_repeat_ngram_size: Forbid repeating n-grams of this size (0 = off)
+
+        Returns:
+            Output token ids per input row (without the decoder start token)
+        """
+        input_ids = input_ids.astype(np.int64)
+        attention_mask = attention_mask.astype(np.int64)
+        batch = input_ids.shape[0]
+        beams = max(1, num_beams)
+
+        encoder_feed = {"input_ids": input_ids, "attention_mask": attention_mask}
+        hidden = self.encoder.run(
+            None, {k: v for k, v in encoder_feed.items() if k in self._encoder_inputs}
+        )[0]
+
+        # One row per (sentence, beam)
+        hidden = np.repeat(hidden, beams, axis=0)
+        mask = np.repeat(attention_mask, beams, axis=0)
+        rows = batch * beams
+
+        tokens = np.full((rows, 1), self.decoder_start_token_id, dtype=np.int64)
+        scores = np.zeros((batch, beams), dtype=np.float32)
+        scores[:, 1:] = _NEG_INF  # first step expands beam 0 only
+        scores = scores.reshape(-1)
+
+        finished: List[List[Tuple[float, List[int]]]] = [[] for _ in range(batch)]
+        done = np.zeros(batch, dtype=bool)
+        past: Optional[Dict[str, np.ndarray]] = None
+
+        for step in range(max_length - 1):
+            logits, past = self._decode_step(tokens[:, -1:], hidden, mask, past)
+            log_probs = _log_softmax(logits[:, -1, :].astype(np.float32))
+            log_probs[:, self.pad_token_id] = _NEG_INF
+            if no_repeat_ngram_size > 0 and tokens.shape[1] >= no_repeat_ngram_size:
+                _ban_repeated_ngrams(tokens, log_probs, no_repeat_ngram_size)
+            if self.forced_eos_token_id is not None and step == max_length - 2:
+                # Last position: end every hypothesis, like transformers does
+                eos_scores = log_probs[:, self.forced_eos_token_id].copy()
+                log_probs[:] = _NEG_INF
+                log_probs[:, self.forced_eos_token_id] = eos_scores
+            vocab = log_probs.shape[-1]
+
+            candidates = (scores[:, None] + log_probs).reshape(batch, beams * vocab)
+            top_k = 2 * beams
+            top = np.argpartition(-candidates, top_k - 1, axis=1)[:, :top_k]
+            order = np.argsort(-np.take_along_axis(candidates, top, axis=1), axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+
+            next_rows = np.arange(rows, dtype=np.int64)
+            next_tokens = np.full(rows, self.pad_token_id, dtype=np.int64)
+            next_scores = np.full(rows, _NEG_INF, dtype=np.float32)
+
+            for b in range(batch):
+                if done[b]:
+                    continue
+                slot = 0
+                for rank, flat in enumerate(top[b]):
+                    beam, token = divmod(int(flat), vocab)
+                    row = b * beams + beam
+                    score = float(candidates[b, flat])
+                    if token == self.eos_token_id:
+                        # Same rule as transformers: only top-ranked EOS ends a hypothesis
+                        if rank < beams:
+                            hypothesis = tokens[row, 1:].tolist()
+                            finished[b].append(
+                                (score / (len(hypothesis) + 1) ** length_penalty, hypothesis)
+                            )
+                        continue
+                    target = b * beams + slot
+                    next_rows[target] = row
+                    next_tokens[target] = token
+                    next_scores[target] = score
+                    slot += 1
+                    if slot == beams:
+                        break
+                if len(finished[b]) >= beams:
+                    done[b] = True
+
+            if done.all():
+                break
+
+            tokens = np.concatenate([tokens[next_rows], next_tokens[:, None]], axis=1)
+            scores = next_scores
+            past = {name: value[next_rows] for name, value in past.items()}
+
+        # Sentences that hit max_length keep their best open beams
+        for b in range(batch):
+            if done[b]:
+                continue
+            for beam in range(beams):
+                row = b * beams + beam
+                hypothesis = tokens[row, 1:].tolist()
+                if hypothesis:
+                    finished[b].append(
+                        (float(scores[row]) / len(hypothesis) ** length_penalty, hypothesis)
+                    )
+
+        return [
+            max(hypotheses, key=lambda item: item[0])[1] if hypotheses else []
+            for hypotheses in finished
+        ]
+
+    def _decode_step(
+        self,
+        last_tokens: np.ndarray,
+        hidden: np.ndarray,
+        mask: np.ndarray,
+        past: Optional[Dict[str, np.ndarray]],
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Run one decoder step, returning logits and the updated key/value cache.
+
+        The first step uses the plain decoder (which also returns the
+        cross-attention keys/values); later steps feed the cache back into
+        decoder_with_past, which only returns self-attention keys/values.
+        """
+        if past is None:
+            session, input_names = self.decoder, self._decoder_inputs
+            feed = {
+                "input_ids": last_tokens,
+                "encoder_attention_mask": mask,
+                "encoder_hidden_states": hidden,
+            }
+            new_past: Dict[str, np.ndarray] = {}
+        else:
+            session, input_names = self.decoder_with_past, self._with_past_inputs
+            feed = {
+                "input_ids": last_tokens,
+                "encoder_attention_mask": mask,
+                "encoder_hidden_states": hidden,
+                **past,
+            }
+            new_past = dict(past)
+
+        feed = {name: value for name, value in feed.items() if name in input_names}
+        output_names = [o.name for o in session.get_outputs()]
+        outputs = session.run(output_names, feed)
+
+        logits = None
+        for name, value in zip(output_names, outputs):
+            if name == "logits":
+                logits = value
+            elif name.startswith("present."):
+                new_past["past_key_values." + name[len("present."):]] = value
+        return logits, new_past
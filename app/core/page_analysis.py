@@ -0,0 +1,223 @@
+"""
+Page analysis - one text extraction of a page, shared by every consumer.
+
+Deciding how to handle a page used to parse it again and again:
+_is_likely_scanned_page() ran get_text("dict"), _collect_page_segments()
+get_text("dict", sort=True), find_tables() and column_boxes() each read
+the page's vector graphics, then get_text("dict", clip=rect) ran once per
+column; extract_text() tried up to six extraction methods, each building
+a new TextPage.
+
+PageAnalysis builds one TextPage (page.get_textpage()) and serves the
+dict, words, blocks, plain text and clipped dict queries from it, lazily.
+The vector graphics are read once and shared by find_tables() and
+column_boxes(). Results derived from the page (scan verdict, alignment,
+tables, column rects) are memoized on it with memo().
+
+Not thread-safe, like PyMuPDF itself: use it under the processor's
+mupdf_lock. The returned dicts are shared, do not modify them.
+
+Usage:
+    from app.core.page_analysis import PageAnalysis
+
+    analysis = PageAnalysis(page)
+    text_dict = analysis.dict(sort=True)
+    column_dict = analysis.clip_dict(rect)
+    tables = analysis.tables()
+    alignment = analysis.memo("alignment", lambda: detect(text_dict))
+"""
+import logging
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import pymupdf
+
+logger = logging.getLogger(__name__)
+
+# Flags of the shared TextPage: those of get_text("dict") without image
+# blocks (nothing reads them, and each one carries the re-encoded image).
+# Plain text and words extracted from it match get_text("text") /
+# get_text("words").
+ANALYSIS_TEXT_FLAGS = pymupdf.TEXTFLAGS_DICT & ~pymupdf.TEXT_PRESERVE_IMAGES
+
+
+def _sort_blocks(blocks: List[dict]) -> List[dict]:
+    """Block order of get_text(..., sort=True): by bottom, then left edge."""
+    return sorted(blocks, key=lambda b: (b["bbox"][3], b["bbox"][0]))
+
+
+def _centre_inside(bbox, clip: pymupdf.Rect) -> bool:
+    x0, y0, x1, y1 = bbox
+    return clip.x0 <= (x0 + x1) / 2 <= clip.x1 and clip.y0 <= (y0 + y1) / 2 <= clip.y1
+
+
+def _union(bboxes) -> tuple:
+    x0s, y0s, x1s, y1s = zip(*bboxes)
+    return (min(x0s), min(y0s), max(x1s), max(y1s))
+
+
+def _inside(bbox, clip: pymupdf.Rect) -> bool:
+    x0, y0, x1, y1 = bbox
+    return clip.x0 <= x0 and clip.y0 <= y0 and x1 <= clip.x1 and y1 <= clip.y1
+
+
+def _intersects(bbox, clip: pymupdf.Rect) -> bool:
+    x0, y0, x1, y1 = bbox
+    return x0 < clip.x1 and clip.x0 < x1 and y0 < clip.y1 and clip.y0 < y1
+
+
+class PageAnalysis:
+    """
+    Lazily computed text extraction of one page, plus memoized results.
+
+    The analysis of a source page also serves copies of it (translate_page
+    works on a copy): queries never pass the TextPage back to page methods.
+    """
+
+    def __init__(self, page: pymupdf.Page, flags: int = ANALYSIS_TEXT_FLAGS):
+        """
+        Args:
+            page: Page to analyse (nothing is extracted until first use)
+            flags: Flags of the shared TextPage
+        """
+        self.page = page
+        self.flags = flags
+        self._textpages: Dict[int, pymupdf.TextPage] = {}
+        self._memo: Dict[Hashable, Any] = {}
+        self._dicts: Dict[bool, dict] = {}
+        self._rawdict: Optional[dict] = None
+        self._drawings: Optional[List[dict]] = None
+
+    # ------------------------------------------------------------------
+    # Text extraction
+    # ------------------------------------------------------------------
+
+    def textpage(self, flags: Optional[int] = None) -> pymupdf.TextPage:
+        """
+        The page's TextPage, built on first use.
+
+        Flags other than the analysis flags (extract_text's whitespace and
+        dehyphenation fallbacks) build and keep a TextPage of their own.
+        """
+        flags = self.flags if flags is None else flags
+        textpage = self._textpages.get(flags)
+        if textpage is None:
+            textpage = self.page.get_textpage(flags=flags)
+            self._textpages[flags] = textpage
+        return textpage
+
+    def dict(self, sort: bool = False) -> dict:
+        """get_text("dict", sort=sort) of the page, text blocks only."""
+        text_dict = self._dicts.get(sort)
+        if text_dict is None:
+            if sort:
+                base = self.dict()
+                text_dict = {**base, "blocks": _sort_blocks(base["blocks"])}
+            else:
+                text_dict = self.textpage().extractDICT(cb=self.page.cropbox)
+            self._dicts[sort] = text_dict
+        return text_dict
+
+    def text(self, flags: Optional[int] = None) -> str:
+        """get_text("text") of the page (with flags: from a TextPage with those flags)."""
+        return self.textpage(flags).extractText()
+
+    def words(self) -> list:
+        """get_text("words") of the page."""
+        return self.textpage().extractWORDS()
+
+    def blocks(self, flags: Optional[int] = None) -> list:
+        """get_text("blocks") of the page (with flags: from a TextPage with those flags)."""
+        return self.textpage(flags).extractBLOCKS()
+
+    def clip_dict(self, clip, sort: bool = True) -> dict:
+        """
+        get_text("dict", clip=clip, sort=sort), served from the page dict.
+
+        Blocks, lines and spans entirely inside the clip are kept as they
+        are, those entirely outside dropped. Spans crossing the clip edge
+        are cut to the characters whose box centre lies inside it (read
+        from the same TextPage's rawdict, only when needed).
+        """
+        clip = pymupdf.Rect(clip)
+        blocks = []
+        for block_index, block in enumerate(self.dict()["blocks"]):
+            bbox = block["bbox"]
+            if not _intersects(bbox, clip):
+                continue
+            if _inside(bbox, clip) or "lines" not in block:
+                blocks.append(block)
+                continue
+            clipped = self._clip_block(block_index, block, clip)
+            if clipped is not None:
+                blocks.append(clipped)
+        if sort:
+            blocks = _sort_blocks(blocks)
+        base = self.dict()
+        return {"width": base["width"], "height": base["height"], "blocks": blocks}
+
+    def _clip_block(self, block_index: int, block: dict, clip: pymupdf.Rect) -> Optional[dict]:
+        lines = []
+        for line_index, line in enumerate(block["lines"]):
+            bbox = line["bbox"]
+            if not _intersects(bbox, clip):
+                continue
+            if _inside(bbox, clip):
+                lines.append(line)
+                continue
+            spans = []
+            for span_index, span in enumerate(line["spans"]):
+                if _inside(span["bbox"], clip):
+                    spans.append(span)
+                elif _intersects(span["bbox"], clip):
+                    chars = self._chars(block_index, line_index, span_index)
+                    kept = [c for c in chars if _centre_inside(c["bbox"], clip)]
+                    if kept:
+                        spans.append({
+                            **span,
+                            "text": "".join(c["c"] for c in kept),
+                            "bbox": _union(c["bbox"] for c in kept),
+                            "origin": kept[0]["origin"],
+                        })
+            if spans:
+                lines.append({**line, "spans": spans, "bbox": _union(s["bbox"] for s in spans)})
+        if not lines:
+            return None
+        return {**block, "lines": lines, "bbox": _union(line["bbox"] for line in lines)}
+
+    def _chars(self, block_index: int, line_index: int, span_index: int) -> List[dict]:
+        """Characters of a span (the rawdict of the shared TextPage has the dict's layout)."""
+        if self._rawdict is None:
+            self._rawdict = self.textpage().extractRAWDICT(cb=self.page.cropbox)
+        return self._rawdict["blocks"][block_index]["lines"][line_index]["spans"][span_index]["chars"]
+
+    # ------------------------------------------------------------------
+    # Vector graphics and tables
+    # ------------------------------------------------------------------
+
+    def drawings(self) -> List[dict]:
+        """
+        page.get_drawings(), read once.
+
+        Each call returns fresh path dicts with their own "rect":
+        find_tables() and column_boxes() grow those rects in place.
+        """
+        if self._drawings is None:
+            self._drawings = self.page.get_drawings()
+        return [{**path, "rect": pymupdf.Rect(path["rect"])} for path in self._drawings]
+
+    def tables(self):
+        """page.find_tables() on the shared vector graphics, memoized (exceptions propagate)."""
+        return self.memo("tables", lambda: self.page.find_tables(paths=self.drawings()))
+
+    # ------------------------------------------------------------------
+    # Memoized results
+    # ------------------------------------------------------------------
+
+    def memo(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Result stored under key, computed on first request."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = compute()
+            self._memo[key] = value
+            return value
@@ -0,0 +1,398 @@
+"""
+Page pipeline - overlapping analysis, translation and insertion across pages.
+
+translate_page() runs its phases strictly in sequence, and the next page
+starts only after the previous one is fully inserted. The pipeline splits
+the work into three stages connected by bounded queues:
+
+- analyze:   scan detection and segment collection (find_tables,
+             column_boxes, span extraction); RapidOCR/RapidDoc for scanned pages
+- translate: MT of the page's segments (for scanned pages, of the OCR text)
+- insert:    redaction + insert_htmlbox (translate_page() resolving every
+             segment from the previous stages)
+
+so layout/OCR of page N+1 overlaps MT of page N and insertion of page N-1.
+Each stage has its own worker threads. PyMuPDF is not thread-safe, so the
+stages that touch the document hold PDFProcessor.mupdf_lock; ONNX Runtime,
+OpenVINO and torch release the GIL and run concurrently with them. While
+the pipeline runs, the resource governor splits each worker's threads
+between OCR and MT (overlap mode).
+
+Scanned pages get their OCR in the analyze stage and their MT in the
+translate stage; only their layout runs in the insert stage, so MT never
+holds mupdf_lock.
+
+Back-pressure: for every stage the pipeline records time spent working,
+starved (waiting for input) and blocked (waiting for room in the next
+queue). A stage that is often blocked is faster than the one after it.
+
+Usage:
+    from app.core.page_pipeline import PagePipeline
+
+    pipeline = PagePipeline(processor, translator)
+    translated = pipeline.run(pages=range(10))  # {page_num: pdf_bytes}
+    pipeline.stats()
+"""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .config import DEFAULT_PIPELINE_CONFIG, PipelineConfig
+from .resources import get_governor
+from .sentry_integration import capture_exception
+from .translation_plan import TranslationPlan
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("analyze", "translate", "insert")
+
+# End-of-input marker passed down the queues
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Timing of one pipeline stage (seconds, summed over its workers)."""
+    name: str
+    workers: int
+    processed: int = 0
+    busy: float = 0.0
+    starved: float = 0.0
+    blocked: float = 0.0
+    max_queue: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "busy_s": round(self.busy, 3),
+            "starved_s": round(self.starved, 3),
+            "blocked_s": round(self.blocked, 3),
+            "max_queue": self.max_queue,
+        }
+
+
+@dataclass
+class _PageJob:
+    """One page travelling through the stages."""
+    page_num: int
+    scanned: bool = False
+    collected: Optional[Dict[str, Any]] = None
+    ocr_result: Optional[Dict[str, Any]] = None
+    translations: Dict[str, str] = field(default_factory=dict)
+    pdf_bytes: Optional[bytes] = None
+    inserted: bool = False  # translated in place into the output document
+    error: Optional[str] = None
+
+
+class PagePipeline:
+    """
+    Translates pages of one PDFProcessor through overlapping stages.
+
+    Segments translated for earlier pages are reused for later ones (a
+    running document-level dedup, like TranslationPlan but built as pages
+    flow).
+    """
+
+    def __init__(
+        self,
+        processor,
+        translator,
+        config: PipelineConfig = DEFAULT_PIPELINE_CONFIG,
+        into=None,
+        **page_options,
+    ):
+        """
+        Args:
+            processor: PDFProcessor of the document
+            translator: Translation engine instance
+            config: Workers per stage and queue size
+            into: Whole-document copy (processor.copy_document()) or
+                TranslatedPageStore to translate pages in place; pages are
+                then not serialized
+            **page_options: Passed to translate_page() (use_original_color,
+                preserve_line_breaks, decoding_profile, ...)
+        """
+        self.processor = processor
+        self.translator = translator
+        self.config = config
+        self.into = into
+        self.page_options = page_options
+        self.preserve_line_breaks = page_options.get("preserve_line_breaks", True)
+        self.decoding_profile = page_options.get("decoding_profile")
+
+        self._known: Dict[str, str] = {}
+        self._known_lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self._stats: Dict[str, StageStats] = {}
+        self._stats_lock = threading.Lock()
+        self._elapsed = 0.0
+        self._pages: List[int] = []
+        self._page_index: Dict[int, int] = {}
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def _analyze(self, job: _PageJob) -> None:
+        processor = self.processor
+        with processor.mupdf_lock:
+            job.scanned, _ = processor._page_scan_verdict(job.page_num)
+            if not job.scanned:
+                if self._plan is not None:
+                    job.collected = self._plan.take_collected(job.page_num, self.preserve_line_breaks)
+                if job.collected is None:
+                    analysis = processor.page_analysis(job.page_num)
+                    job.collected = processor._collect_page_segments(
+                        analysis.page, job.page_num, self.preserve_line_breaks, analysis=analysis
+                    )
+        if job.scanned:
+            # Rendering takes the lock inside ocr_page(); inference does not.
+            # RapidDoc analyses the next pages along with this one.
+            index = self._page_index.get(job.page_num, 0)
+            batch = self._pages[index:index + max(1, self.config.ocr_batch_pages)]
+            job.ocr_result = processor.ocr_page(job.page_num, batch=batch)
+
+    def _translate(self, job: _PageJob) -> None:
+        from .pdf_processor import _translate_segments
+
+        if job.scanned:
+            segments, classes = self.processor._scanned_page_segments(job.ocr_result)
+        else:
+            segments, classes = job.collected["segments"], job.collected["segment_classes"]
+        with self._known_lock:
+            known = dict(self._known)
+        job.translations = _translate_segments(
+            self.translator,
+            segments,
+            known=known,
+            classes=classes,
+            profile=self.decoding_profile,
+        )
+        with self._known_lock:
+            self._known.update(job.translations)
+
+    def _insert(self, job: _PageJob) -> None:
+        page_plan = TranslationPlan(
+            pages=[job.page_num],
+            translations=job.translations,
+            preserve_line_breaks=self.preserve_line_breaks,
+            collected={job.page_num: job.collected} if not job.scanned else {},
+        )
+        job.collected = None
+        with self.processor.mupdf_lock:
+            translated_doc = self.processor.translate_page(
+                job.page_num,
+                self.translator,
+                plan=page_plan,
+                ocr_result=job.ocr_result,
+                into=self.into,
+                **self.page_options,
+            )
+            if self.into is not None:
+                job.inserted = True
+            elif translated_doc is not None:
+                job.pdf_bytes = translated_doc.tobytes()
+                translated_doc.close()
+        job.ocr_result = None
+
+    # ------------------------------------------------------------------
+    # Plumbing
+    # ------------------------------------------------------------------
+
+    def _stage_worker(
+        self,
+        name: str,
+        work: Callable[[_PageJob], None],
+        inbox: queue.Queue,
+        outbox: queue.Queue,
+        remaining: List[int],
+    ) -> None:
+        stats = self._stats[name]
+        while True:
+            started = time.monotonic()
+            job = inbox.get()
+            waited = time.monotonic() - started
+
+            if job is _DONE:
+                inbox.put(_DONE)  # let the sibling workers see it too
+                with self._stats_lock:
+                    stats.starved += waited
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    outbox.put(_DONE)
+                return
+
+            started = time.monotonic()
+            if job.error is None and not self._cancelled.is_set():
+                try:
+                    work(job)
+                except Exception as e:
+                    capture_exception(e, context={
+                        "operation": f"page_pipeline_{name}",
+                        "page_num": job.page_num,
+                    }, tags={"component": "page_pipeline"})
+                    logger.error(f"Page {job.page_num + 1}: {name} stage failed: {e}")
+                    job.error = f"{name}: {e}"
+            worked = time.monotonic() - started
+
+            started = time.monotonic()
+            outbox.put(job)
+            blocked = time.monotonic() - started
+
+            with self._stats_lock:
+                stats.processed += 1
+                stats.busy += worked
+                stats.starved += waited
+                stats.blocked += blocked
+                stats.max_queue = max(stats.max_queue, inbox.qsize() + 1)
+
+    def run(
+        self,
+        pages: Optional[Iterable[int]] = None,
+        plan: Optional[TranslationPlan] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        page_callback: Optional[Callable[[int, Optional[bytes]], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+    ) -> Dict[int, Optional[bytes]]:
+        """
+        Translate pages through the pipeline.
+
+        Args:
+            pages: Pages to translate (default: all pages)
+            plan: Optional TranslationPlan; its translations seed the
+                running dedup and its collected structures are reused
+            progress_callback: Called as (pages done, pages total) as pages complete
+            page_callback: Called as (page_num, pdf_bytes) in completion order
+                (pdf_bytes is None for pages translated in place)
+            should_cancel: Polled between pages; True stops feeding new pages
+
+        Returns:
+            Translated pages as PDF bytes, by page number (failed pages
+            missing; None values for pages translated into the output document)
+        """
+        pages = list(range(self.processor.page_count)) if pages is None else list(pages)
+        total = len(pages)
+        results: Dict[int, Optional[bytes]] = {}
+        if not pages:
+            return results
+
+        t0 = time.time()
+        self._plan = plan
+        self._pages = pages
+        self._page_index = {page_num: index for index, page_num in enumerate(pages)}
+        if plan is not None:
+            self._known.update(plan.translations)
+        self._cancelled.clear()
+
+        config = self.config
+        workers = {
+            "analyze": max(1, config.analyze_workers),
+            "translate": max(1, config.translate_workers),
+            "insert": max(1, config.insert_workers),
+        }
+        self._stats = {name: StageStats(name, workers[name]) for name in STAGES}
+
+        size = max(1, config.queue_size)
+        queues = [queue.Queue()] + [queue.Queue(maxsize=size) for _ in STAGES[1:]] + [queue.Queue()]
+        stage_work = {"analyze": self._analyze, "translate": self._translate, "insert": self._insert}
+
+        # OCR and MT now run at the same time: split the thread budget
+        governor = get_governor()
+        previous_overlap = governor.overlap
+        governor.configure(overlap=True)
+
+        threads = []
+        for index, name in enumerate(STAGES):
+            remaining = [workers[name]]
+            for number in range(workers[name]):
+                thread = threading.Thread(
+                    target=self._stage_worker,
+                    args=(name, stage_work[name], queues[index], queues[index + 1], remaining),
+                    name=f"page-{name}-{number}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        # Feed pages as the analyze stage frees up (its queue is unbounded,
+        # but the stages after it are not, so look-ahead stays bounded)
+        feeder_queue, output = queues[0], queues[-1]
+        fed = 0
+        done = 0
+        try:
+            for page_num in pages:
+                if should_cancel and should_cancel():
+                    logger.info("Page pipeline cancelled")
+                    self._cancelled.set()
+                    break
+                feeder_queue.put(_PageJob(page_num))
+                fed += 1
+                # Collect whatever is ready without blocking the feed
+                while done < fed and fed - done > size * len(STAGES):
+                    done += self._collect(output.get(), results, done, total, progress_callback, page_callback)
+            feeder_queue.put(_DONE)
+
+            while True:
+                job = output.get()
+                if job is _DONE:
+                    break
+                done += self._collect(job, results, done, total, progress_callback, page_callback)
+                if should_cancel and should_cancel() and not self._cancelled.is_set():
+                    logger.info("Page pipeline cancelled")
+                    self._cancelled.set()
+        finally:
+            for thread in threads:
+                thread.join(timeout=1.0)
+            governor.configure(overlap=previous_overlap)
+            self._plan = None
+
+        self._elapsed = time.time() - t0
+        logger.info(
+            f"Page pipeline: {len(results)}/{total} pages in {self._elapsed:.1f}s "
+            f"({self.bottleneck()} bound)"
+        )
+        return results
+
+    def _collect(
+        self,
+        job: _PageJob,
+        results: Dict[int, Optional[bytes]],
+        done: int,
+        total: int,
+        progress_callback: Optional[Callable[[int, int], None]],
+        page_callback: Optional[Callable[[int, Optional[bytes]], None]],
+    ) -> int:
+        """Hand a finished page to the caller; returns 1."""
+        if job.pdf_bytes is not None or job.inserted:
+            results[job.page_num] = job.pdf_bytes
+            if page_callback:
+                page_callback(job.page_num, job.pdf_bytes)
+        elif job.error:
+            logger.warning(f"Page {job.page_num + 1}: not translated ({job.error})")
+        if progress_callback:
+            progress_callback(done + 1, total)
+        return 1
+
+    # ------------------------------------------------------------------
+    # Diagnostics
+    # ------------------------------------------------------------------
+
+    def bottleneck(self) -> Optional[str]:
+        """Stage with the most busy time per worker in the last run."""
+        if not self._stats:
+            return None
+        return max(self._stats.values(), key=lambda s: s.busy / s.workers).name
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-stage timings and back-pressure of the last run."""
+        with self._stats_lock:
+            return {
+                "elapsed_s": round(self._elapsed, 3),
+                "bottleneck": self.bottleneck(),
+                "stages": {name: stats.as_dict() for name, stats in self._stats.items()},
+            }
@@ -0,0 +1,256 @@
+"""
+Translated page store - the output document of an interactive session,
+bounded in memory.
+
+Pages are translated in place inside one copy of the source document
+(see PDFProcessor.copy_document()). Kept in memory, that copy grows with
+every translated page: new content streams, embedded fonts, plus the
+decoded images MuPDF caches while pages are rendered. On a 500-page scan
+this adds up to gigabytes.
+
+TranslatedPageStore keeps the copy in a temporary PDF file instead:
+
+- the document is opened from the file, so untouched pages stay on disk
+- when the estimated memory held by translated-but-unsaved pages plus
+  MuPDF's resource cache exceeds the budget, the changes are spilled:
+  appended to the file (incremental save), the document reopened from
+  it and the cache trimmed
+- only the last few viewed pages are kept rendered
+- save() writes the output straight from the file
+
+Pass the store as `into` to PDFProcessor.translate_document() or
+translate_page(); the current document is looked up on every use, so a
+spill may happen between pages of a running translation.
+
+Usage:
+    from app.core.page_store import TranslatedPageStore
+
+    store = TranslatedPageStore(processor, budget_mb=512)
+    processor.translate_document(translator, into=store)
+    png, width, height = store.render_png(0)
+    view = store.render_png(1, wait=False)  # None while a page is being inserted
+    store.save("contract_it.pdf")
+    store.close()
+"""
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+import pymupdf
+
+logger = logging.getLogger(__name__)
+
+# RAM budget for unsaved translated pages + MuPDF's cache, in MB
+PAGE_STORE_BUDGET_ENV = "LAC_PAGE_STORE_MB"
+DEFAULT_BUDGET_MB = 512
+
+# Rendered pages kept for navigation (PNG bytes)
+DEFAULT_VIEW_CACHE = 4
+
+# Per translated page on top of its content stream: fonts embedded by
+# insert_htmlbox, redaction bookkeeping, object overhead
+_PAGE_OVERHEAD_BYTES = 256 * 1024
+
+
+def _mupdf_store_size() -> int:
+    """Bytes held in MuPDF's resource cache (decoded images, fonts); 0 if not reported."""
+    size = pymupdf.TOOLS.store_size
+    size = size() if callable(size) else size
+    return int(size or 0)
+
+
+def default_budget_mb() -> float:
+    """LAC_PAGE_STORE_MB, or DEFAULT_BUDGET_MB."""
+    try:
+        return float(os.environ.get(PAGE_STORE_BUDGET_ENV, DEFAULT_BUDGET_MB))
+    except ValueError:
+        return DEFAULT_BUDGET_MB
+
+
+class TranslatedPageStore:
+    """
+    File-backed output document with a memory budget.
+
+    Thread-safe: every access to the document holds the processor's
+    mupdf_lock, which also serializes it with page translation.
+    """
+
+    def __init__(
+        self,
+        processor,
+        budget_mb: Optional[float] = None,
+        spill_dir: Optional[os.PathLike] = None,
+        view_cache: int = DEFAULT_VIEW_CACHE,
+    ):
+        """
+        Copy the source document to a temporary file and open it.
+
+        Args:
+            processor: PDFProcessor of the source document
+            budget_mb: Memory budget before spilling (default: LAC_PAGE_STORE_MB or 512)
+            spill_dir: Directory of the temporary file (default: system temp)
+            view_cache: Rendered pages to keep
+        """
+        self.processor = processor
+        self.lock = processor.mupdf_lock
+        self.budget_bytes = int((budget_mb if budget_mb is not None else default_budget_mb()) * 1024 * 1024)
+        self.view_cache = max(1, view_cache)
+        self.spills = 0
+
+        self._translated: Set[int] = set()
+        self._pending_bytes = 0
+        self._views: "OrderedDict[Tuple[int, float], Tuple[bytes, int, int]]" = OrderedDict()
+        # Bumped by mark_translated(): a render that started before the page
+        # changed is not cached
+        self._versions: Dict[int, int] = {}
+        self._views_lock = threading.Lock()
+
+        handle, path = tempfile.mkstemp(prefix="lac-translated-", suffix=".pdf", dir=spill_dir)
+        os.close(handle)
+        self.path = Path(path)
+        with self.lock:
+            processor.document.save(str(self.path))
+            self._document = pymupdf.open(str(self.path))
+        logger.info(f"Translated page store: {self.path} (budget {self.budget_bytes // (1024 * 1024)} MB)")
+
+    @property
+    def document(self) -> pymupdf.Document:
+        """Current output document (changes after a spill; hold lock while using it)."""
+        return self._document
+
+    @property
+    def page_count(self) -> int:
+        return self._document.page_count
+
+    def __contains__(self, page_num: int) -> bool:
+        return page_num in self._translated
+
+    def __len__(self) -> int:
+        return len(self._translated)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(sorted(self._translated))
+
+    def mark_translated(self, page_num: int) -> None:
+        """Record a page translated into the document; spills if over budget."""
+        with self.lock:
+            self._translated.add(page_num)
+            try:
+                content = len(self._document[page_num].read_contents())
+            except Exception:
+                content = 0
+            self._pending_bytes += content + _PAGE_OVERHEAD_BYTES
+            if self._pending_bytes + _mupdf_store_size() > self.budget_bytes:
+                self._spill_locked()
+        with self._views_lock:
+            self._versions[page_num] = self._versions.get(page_num, 0) + 1
+            for key in [key for key in self._views if key[0] == page_num]:
+                del self._views[key]
+
+    def spill(self) -> None:
+        """Write pending changes to the file and release their memory."""
+        with self.lock:
+            self._spill_locked()
+
+    def _spill_locked(self) -> None:
+        document = self._document
+        if document.can_save_incrementally():
+            document.save(str(self.path), incremental=True, encryption=pymupdf.PDF_ENCRYPT_KEEP)
+            document.close()
+        else:
+            # Repaired documents cannot be appended to: rewrite the file
+            handle, path = tempfile.mkstemp(prefix="lac-translated-", suffix=".pdf", dir=self.path.parent)
+            os.close(handle)
+            document.save(path, garbage=1)
+            document.close()
+            os.replace(path, self.path)
+        self._document = pymupdf.open(str(self.path))
+        pymupdf.TOOLS.store_shrink(100)
+        logger.info(
+            f"Translated page store: spilled {self._pending_bytes // 1024} KB of pending pages "
+            f"({len(self._translated)} translated)"
+        )
+        self._pending_bytes = 0
+        self.spills += 1
+
+    def render_png(
+        self, page_num: int, zoom: float = 1.5, wait: bool = True
+    ) -> Optional[Tuple[bytes, int, int]]:
+        """
+        Rendered page as (PNG bytes, width, height); recently viewed pages are cached.
+
+        With wait=False, returns None instead of waiting while another
+        thread holds the document (e.g. inserting a translated page), so a
+        GUI thread can render later or from a worker thread.
+        """
+        key = (page_num, zoom)
+        with self._views_lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+        if not self.lock.acquire(blocking=wait):
+            return None
+        try:
+            with self._views_lock:
+                version = self._versions.get(page_num, 0)
+            pix = self._document[page_num].get_pixmap(matrix=pymupdf.Matrix(zoom, zoom))
+        finally:
+            self.lock.release()
+        view = (pix.tobytes("png"), pix.width, pix.height)
+        with self._views_lock:
+            # Translated meanwhile: the next call renders the new page
+            if self._versions.get(page_num, 0) == version:
+                self._views[key] = view
+                while len(self._views) > self.view_cache:
+                    self._views.popitem(last=False)
+        return view
+
+    def save(self, output_path: os.PathLike) -> int:
+        """
+        Write the translated pages, in page order, to output_path.
+
+        The output is produced from the spilled file, not from an
+        in-memory copy. Returns the number of pages written.
+        """
+        with self.lock:
+            self._spill_locked()
+            pages = sorted(self._translated)
+            with pymupdf.open(str(self.path)) as output:
+                if len(pages) < output.page_count:
+                    output.select(pages)
+                output.save(str(output_path), garbage=4, deflate=True, clean=True)
+        return len(pages)
+
+    def stats(self) -> dict:
+        """Translated pages, pending memory estimate, spills and file size."""
+        try:
+            file_bytes = self.path.stat().st_size
+        except OSError:
+            file_bytes = 0
+        return {
+            "path": str(self.path),
+            "translated": len(self._translated),
+            "pending_bytes": self._pending_bytes,
+            "mupdf_store_bytes": _mupdf_store_size(),
+            "budget_bytes": self.budget_bytes,
+            "spills": self.spills,
+            "file_bytes": file_bytes,
+            "views": len(self._views),
+        }
+
+    def close(self) -> None:
+        """Close the document and delete the temporary file."""
+        with self.lock:
+            if self._document is not None:
+                self._document.close()
+                self._document = None
+        with self._views_lock:
+            self._views.clear()
+        try:
+            self.path.unlink()
+        except OSError as e:
+            logger.warning(f"Could not remove {self.path}: {e}")
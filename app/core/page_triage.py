@@ -0,0 +1,320 @@
+"""
+Document triage - per-page classification and cost estimate before a batch.
+
+Which pages are scanned, multi-column, table-heavy or blank is otherwise
+only found out inside translate_page(), one page at a time.
+PDFProcessor.triage() runs a fast pass over the document first (in
+worker processes for long documents) and returns a TriageReport: one
+PageTriage per page plus an estimated processing time. Schedulers can
+send the scanned pages to OCR early, skip blank pages and show an ETA
+before the user commits.
+
+Each page is put in one class:
+
+- blank:    no words and (almost) no ink on a low-DPI thumbnail
+- scanned:  needs OCR (PDFProcessor._is_likely_scanned_page)
+- complex:  native, with ruled tables or several columns
+- native:   everything else
+
+The estimate uses the seconds per page measured for each class by
+earlier translations (ThroughputModel, persisted next to the user
+config). Until a class has been measured, a rough default is used.
+
+Usage:
+    from app.core.pdf_processor import PDFProcessor
+
+    processor = PDFProcessor("contract.pdf")
+    report = processor.triage(workers=4)
+    report.summary()  # "120 pages: 4 blank, 18 scanned, 12 complex, 86 native; ~6.5 min ..."
+    ocr_first = report.pages_of("scanned")
+"""
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pymupdf
+
+from .config import DEFAULT_TRIAGE_CONFIG, TriageConfig
+from .preprocess_for_ocr import pixmap_to_array
+
+logger = logging.getLogger(__name__)
+
+PAGE_CLASSES = ("blank", "scanned", "complex", "native")
+
+# Seconds per page until a class has been measured: OCR of a scanned page
+# takes ~1-3 s on CPU, MT of a full native page about as long
+DEFAULT_SECONDS_PER_PAGE: Dict[str, float] = {
+    "blank": 0.2,
+    "scanned": 4.0,
+    "complex": 3.0,
+    "native": 2.0,
+}
+
+# Measured seconds per page, kept across sessions
+DEFAULT_THROUGHPUT_PATH = Path.home() / ".lac-translate" / "throughput.json"
+
+# Weight of a new measurement once a class has several samples
+_THROUGHPUT_SMOOTHING = 0.2
+
+
+@dataclass
+class PageTriage:
+    """
+    Triage of one page.
+
+    Attributes:
+        page_num: Page number (0-based)
+        page_class: "blank", "scanned", "complex" or "native"
+        scanned: Scan verdict of the page
+        reason: Reason given with the scan verdict
+        image_coverage: Fraction of the page covered by images
+        word_count: Words of the text layer
+        table_likelihood: 0.0-1.0, from the ruling lines of the page
+        columns: Text columns found by column_boxes (None for scanned and
+            blank pages)
+        ink_ratio: Fraction of dark pixels on the thumbnail
+        blank: Page without words and (almost) without ink
+        scan_dpi: Resolution of the page's single scanned image, if any
+        estimated_seconds: Expected processing time (set by triage())
+    """
+    page_num: int
+    page_class: str
+    scanned: bool
+    reason: str
+    image_coverage: float = 0.0
+    word_count: int = 0
+    table_likelihood: float = 0.0
+    columns: Optional[int] = None
+    ink_ratio: float = 0.0
+    blank: bool = False
+    scan_dpi: Optional[float] = None
+    estimated_seconds: float = 0.0
+
+
+@dataclass
+class TriageReport:
+    """
+    Triage of a set of pages, in page order.
+
+    Attributes:
+        pages: PageTriage per page
+        workers: Processes the triage ran in
+        elapsed: Triage time in seconds
+    """
+    pages: List[PageTriage] = field(default_factory=list)
+    workers: int = 1
+    elapsed: float = 0.0
+
+    def pages_of(self, page_class: str) -> List[int]:
+        """Page numbers of one class."""
+        return [entry.page_num for entry in self.pages if entry.page_class == page_class]
+
+    def counts(self) -> Dict[str, int]:
+        """Pages per class."""
+        return {page_class: len(self.pages_of(page_class)) for page_class in PAGE_CLASSES}
+
+    @property
+    def estimated_seconds(self) -> float:
+        """Expected processing time of all pages."""
+        return sum(entry.estimated_seconds for entry in self.pages)
+
+    def to_dict(self) -> dict:
+        """JSON-serializable form (for manifests and schedulers)."""
+        return {
+            "pages": [asdict(entry) for entry in self.pages],
+            "counts": self.counts(),
+            "estimated_seconds": round(self.estimated_seconds, 1),
+            "workers": self.workers,
+            "elapsed": round(self.elapsed, 3),
+        }
+
+    def summary(self) -> str:
+        """One-line description for logs and status bars."""
+        counts = ", ".join(f"{count} {name}" for name, count in self.counts().items() if count)
+        seconds = self.estimated_seconds
+        estimate = f"{seconds:.0f}s" if seconds < 120 else f"{seconds / 60:.1f} min"
+        return (
+            f"{len(self.pages)} pages: {counts or 'none'}; "
+            f"~{estimate} estimated "
+            f"(triage {self.elapsed:.1f}s, {self.workers} worker(s))"
+        )
+
+
+# ----------------------------------------------------------------------
+# Page measurements
+# ----------------------------------------------------------------------
+
+def thumbnail_ink_ratio(page: pymupdf.Page, config: TriageConfig = DEFAULT_TRIAGE_CONFIG) -> float:
+    """Fraction of dark pixels on a grayscale thumbnail of the page."""
+    pix = page.get_pixmap(dpi=config.thumbnail_dpi, colorspace=pymupdf.csGRAY, alpha=False)
+    if not pix.width or not pix.height:
+        return 0.0
+    gray = pixmap_to_array(pix)
+    return float(np.count_nonzero(gray < config.ink_threshold)) / gray.size
+
+
+def table_likelihood(drawings: Sequence[dict], config: TriageConfig = DEFAULT_TRIAGE_CONFIG) -> float:
+    """
+    Likelihood (0.0-1.0) that a page holds ruled tables, from its drawings.
+
+    Counts distinct horizontal and vertical rules (lines, thin rectangles
+    and the edges of stroked boxes); a grid needs both. Cheaper than
+    find_tables(), which runs a layout model.
+    """
+    min_length = config.min_rule_length
+    horizontal, vertical = set(), set()
+    for path in drawings:
+        stroked = "s" in (path.get("type") or "")
+        for item in path["items"]:
+            if item[0] == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.y - p2.y) < 1 and abs(p1.x - p2.x) >= min_length:
+                    horizontal.add(round(p1.y))
+                elif abs(p1.x - p2.x) < 1 and abs(p1.y - p2.y) >= min_length:
+                    vertical.add(round(p1.x))
+            elif item[0] == "re":
+                rect = item[1]
+                if rect.height <= 2 and rect.width >= min_length:
+                    horizontal.add(round(rect.y0))
+                elif rect.width <= 2 and rect.height >= min_length:
+                    vertical.add(round(rect.x0))
+                elif stroked and rect.width >= min_length and rect.height >= min_length / 2:
+                    horizontal.update((round(rect.y0), round(rect.y1)))
+                    vertical.update((round(rect.x0), round(rect.x1)))
+    rules = min(len(horizontal), len(vertical))
+    if rules < 2:
+        return 0.0
+    return rules / (rules + 2)
+
+
+def column_count(rects: Sequence[pymupdf.Rect]) -> int:
+    """Most text rects side by side at any height (column_boxes() output)."""
+    best = 0
+    for rect in rects:
+        beside = sorted(
+            (other for other in rects if other.y0 < rect.y1 and rect.y0 < other.y1),
+            key=lambda other: other.x1,
+        )
+        count, right = 0, float("-inf")
+        for other in beside:
+            if other.x0 >= right:
+                count += 1
+                right = other.x1
+        best = max(best, count)
+    return best
+
+
+def classify(
+    scanned: bool,
+    word_count: int,
+    ink_ratio: float,
+    tables: float,
+    columns: Optional[int],
+    config: TriageConfig = DEFAULT_TRIAGE_CONFIG,
+) -> str:
+    """Page class from the triage measurements."""
+    if word_count == 0 and ink_ratio < config.blank_ink_ratio:
+        return "blank"
+    if scanned:
+        return "scanned"
+    if tables >= config.table_likelihood or (columns or 0) > 1:
+        return "complex"
+    return "native"
+
+
+# ----------------------------------------------------------------------
+# Measured throughput
+# ----------------------------------------------------------------------
+
+class ThroughputModel:
+    """
+    Seconds per page of each page class, measured by translations.
+
+    observe() takes the wall time of one translated page; the first
+    measurements average, later ones are blended in with a fixed weight.
+    Thread-safe.
+    """
+
+    def __init__(self, path: Optional[os.PathLike] = None):
+        """
+        Args:
+            path: JSON file of the measurements (default: DEFAULT_THROUGHPUT_PATH);
+                read now, written by save()
+        """
+        self.path = Path(path) if path else DEFAULT_THROUGHPUT_PATH
+        self.seconds: Dict[str, float] = dict(DEFAULT_SECONDS_PER_PAGE)
+        self.samples: Dict[str, int] = {page_class: 0 for page_class in PAGE_CLASSES}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Throughput measurements unreadable, using defaults: {e}")
+            return
+        for page_class in PAGE_CLASSES:
+            try:
+                samples = int(data.get("samples", {}).get(page_class, 0))
+                seconds = float(data.get("seconds", {})[page_class])
+            except (KeyError, TypeError, ValueError, AttributeError):
+                continue
+            if samples > 0 and seconds > 0:
+                self.seconds[page_class] = seconds
+                self.samples[page_class] = samples
+
+    def observe(self, page_class: str, seconds: float) -> None:
+        """Record the time one page of page_class took."""
+        if page_class not in self.seconds or seconds <= 0:
+            return
+        with self._lock:
+            samples = self.samples[page_class] + 1
+            weight = max(1.0 / samples, _THROUGHPUT_SMOOTHING)
+            self.seconds[page_class] += weight * (seconds - self.seconds[page_class])
+            self.samples[page_class] = samples
+
+    def estimate(self, page_class: str) -> float:
+        """Expected seconds for one page of page_class."""
+        return self.seconds.get(page_class, DEFAULT_SECONDS_PER_PAGE["native"])
+
+    def save(self) -> None:
+        """Write the measurements (failures are logged, not raised)."""
+        with self._lock:
+            data = {"seconds": dict(self.seconds), "samples": dict(self.samples)}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_name(self.path.name + ".tmp")
+            temp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save throughput measurements: {e}")
+
+    def stats(self) -> dict:
+        """Seconds per page and samples per class."""
+        with self._lock:
+            return {
+                page_class: {"seconds": round(self.seconds[page_class], 3), "samples": self.samples[page_class]}
+                for page_class in PAGE_CLASSES
+            }
+
+
+_shared_model: Optional[ThroughputModel] = None
+_shared_pid: Optional[int] = None
+_shared_lock = threading.Lock()
+
+
+def get_throughput_model() -> ThroughputModel:
+    """The process-wide throughput measurements, loaded on first use."""
+    global _shared_model, _shared_pid
+    with _shared_lock:
+        if _shared_model is None or _shared_pid != os.getpid():
+            _shared_model = ThroughputModel()
+            _shared_pid = os.getpid()
+        return _shared_model
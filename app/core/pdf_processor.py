@@ -13,16 +13,30 @@ OCR Engine: RapidOCR (ONNX Runtime + PP-OCRv4/v5)
 - Modelli PP-OCRv5 (detection) + PP-OCRv4 (recognition EN)
 - Nessun server esterno (tutto in-process)
 """
+import inspect
 import logging
 import math
+import multiprocessing
+import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Callable, Optional, Tuple, List, Dict, Any
+import numpy as np
 import pymupdf
 from PIL import Image
 
 # Import sentence-aware translation helpers
-from .translator import split_into_sentences, align_sentences_to_lines
+from .translator import TranslationEngine, split_into_sentences, align_sentences_to_lines
+
+# Import worker processes sharing the translation model (page-parallel mode)
+from .worker_pool import TranslationWorkerPool, default_start_method, worker_translator
+
+# Import the CPU count used to size the triage pass
+from .resources import available_cpus
 
 # Import centralized configuration
 from .config import (
@@ -30,11 +44,44 @@ from .config import (
     DEFAULT_TEXT_QUALITY_CONFIG,
     DEFAULT_SCAN_DETECTION_CONFIG,
     DEFAULT_PARAGRAPH_CONFIG,
+    DEFAULT_PIPELINE_CONFIG,
+    DEFAULT_TRIAGE_CONFIG,
+    PipelineConfig,
+    TriageConfig,
 )
 
 # Import formatting classes
 from .formatting import SpanFormat, LineFormatInfo
 
+# Import document-level translation plan
+from .translation_plan import TranslationPlan
+
+# Import overlapping page stages (single-process mode)
+from .page_pipeline import PagePipeline
+
+# Import per-page checkpoints (resumable jobs)
+from .job_journal import JobJournal, page_source_hash, settings_hash
+
+# Import the file-backed output document (interactive sessions)
+from .page_store import TranslatedPageStore
+
+# Import the content-addressed OCR/layout result cache
+from .ocr_cache import cache_key, get_ocr_cache
+
+# Import the shared per-page text extraction
+from .page_analysis import PageAnalysis
+
+# Import the document triage manifest and measured per-class throughput
+from .page_triage import (
+    PageTriage,
+    TriageReport,
+    classify as _classify_page,
+    column_count as _column_count,
+    get_throughput_model,
+    table_likelihood as _table_likelihood,
+    thumbnail_ink_ratio as _thumbnail_ink_ratio,
+)
+
 # Import formatting utilities
 from .format_utils import (
     map_formatting_to_translation,
@@ -45,6 +92,9 @@ from .format_utils import (
 # Import OCR post-processing
 from .ocr_utils import post_process_ocr_text
 
+# Import raster handoff to OCR (pixmap samples as arrays, no PNG)
+from .preprocess_for_ocr import find_scan_image, native_page_array, pixmap_to_array
+
 # Import Sentry integration
 from .sentry_integration import capture_exception
 
@@ -199,9 +249,127 @@ def _is_likely_footnote_marker(text: str, font_size: float, page_height: float,
     return is_small_font or is_bottom_of_page
 
 
+def _accepts_decoding_options(batch_fn) -> bool:
+    """True if a translate_batch() implementation takes profile/segment_classes."""
+    try:
+        params = inspect.signature(batch_fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return 'profile' in params and 'segment_classes' in params
+
+
+def _translate_segments(
+    translator,
+    texts: List[str],
+    known: Optional[Dict[str, str]] = None,
+    classes: Optional[Dict[str, str]] = None,
+    profile: Optional[str] = None,
+) -> Dict[str, str]:
+    """
+    Translate a page's segments in one batched call.
+
+    Segments are deduplicated and sent to translator.translate_batch() when
+    available (falling back to translate() per segment for engines without
+    batching). Segments already in known (e.g. a TranslationPlan) are not
+    translated again. classes maps segments to "heading"/"cell"/"body" and
+    profile overrides the decoding profile, for engines that support them.
+    Returns a dict mapping each source segment to its translation; callers
+    look translations up by source text.
+    """
+    unique = list(dict.fromkeys(t for t in texts if t and t.strip()))
+    if known:
+        resolved = {t: known[t] for t in unique if t in known}
+        missing = [t for t in unique if t not in resolved]
+        if missing:
+            resolved.update(_translate_segments(translator, missing, classes=classes, profile=profile))
+        return resolved
+    if not unique:
+        return {}
+
+    batch_fn = getattr(translator, 'translate_batch', None)
+    if batch_fn is not None:
+        options = {}
+        if (classes or profile) and _accepts_decoding_options(batch_fn):
+            options['profile'] = profile
+            if classes:
+                options['segment_classes'] = [classes.get(t) for t in unique]
+        try:
+            return dict(zip(unique, batch_fn(unique, **options)))
+        except Exception as e:
+            capture_exception(e, context={"operation": "translate_segments", "segments": len(unique)},
+                              tags={"component": "pdf_processor"})
+            logging.error(f"Batch translation failed: {e}, translating segments one by one")
+
+    translations = {}
+    for text in unique:
+        try:
+            translations[text] = translator.translate(text)
+        except Exception as e:
+            logging.warning(f"Translation failed for segment: {e}")
+            translations[text] = text
+    return translations
+
+
+# Pages translated in parallel by translate_document() (worker processes)
+PAGE_WORKERS_ENV = "LAC_PAGE_WORKERS"
+
+
+def default_page_workers() -> int:
+    """Worker processes for translate_document() (LAC_PAGE_WORKERS, default 1)."""
+    try:
+        return max(1, int(os.environ.get(PAGE_WORKERS_ENV, "1")))
+    except ValueError:
+        logging.warning(f"Ignoring invalid {PAGE_WORKERS_ENV}: '{os.environ.get(PAGE_WORKERS_ENV)}'")
+        return 1
+
+
+# Processors opened by this worker process, by path: PyMuPDF documents
+# cannot be shared between processes, so each worker opens its own
+_worker_processors: Dict[str, "PDFProcessor"] = {}
+
+
+def _output_document(into):
+    """Document behind an `into` argument: a Document or a TranslatedPageStore."""
+    return into.document if isinstance(into, TranslatedPageStore) else into
+
+
+def _translate_page_in_worker(
+    pdf_path: str,
+    page_num: int,
+    plan: Optional[TranslationPlan],
+    page_options: Dict[str, Any],
+) -> Tuple[int, Optional[bytes]]:
+    """translate_page() in a pool worker; returns the page as PDF bytes."""
+    processor = _worker_processors.get(pdf_path)
+    if processor is None:
+        processor = PDFProcessor(pdf_path)
+        _worker_processors[pdf_path] = processor
+    translated_doc = processor.translate_page(page_num, worker_translator(), plan=plan, **page_options)
+    if translated_doc is None:
+        return page_num, None
+    try:
+        return page_num, translated_doc.tobytes()
+    finally:
+        translated_doc.close()
+
+
+# Fewest pages worth a triage worker process (start-up and document opening)
+_TRIAGE_PAGES_PER_WORKER = 8
+
+
+def _triage_pages_in_worker(pdf_path: str, pages: List[int], config: TriageConfig) -> List[PageTriage]:
+    """PDFProcessor._triage_pages() in a worker process, on its own copy of the document."""
+    processor = PDFProcessor(pdf_path)
+    try:
+        return processor._triage_pages(pages, config)
+    finally:
+        processor.close()
+
+
 # OCR integration via RapidOCR (ONNX Runtime)
 try:
-    from .rapid_ocr import RapidOcrEngine
+    from .rapid_ocr import OcrBoxes, RapidOcrEngine, engine_fingerprint as _rapidocr_fingerprint
+    from .ocr_pool import get_ocr_pool
     _ocr_engine_instance = RapidOcrEngine()
     OCR_AVAILABLE = _ocr_engine_instance.is_available()
     if not OCR_AVAILABLE:
@@ -213,7 +381,7 @@ except ImportError as e:
 
 # RapidDoc integration for structured document parsing (layout + OCR + table)
 try:
-    from .rapid_doc_engine import RapidDocEngine
+    from .rapid_doc_engine import RapidDocEngine, engine_fingerprint as _rapiddoc_fingerprint
     _rapiddoc_engine_instance = RapidDocEngine()
     RAPIDDOC_AVAILABLE = _rapiddoc_engine_instance.is_available()
     if RAPIDDOC_AVAILABLE:
@@ -229,6 +397,12 @@ except Exception as e:
     _rapiddoc_engine_instance = None
     logging.warning(f"RapidDoc initialization error: {e}")
 
+# Scanned pages per RapidDoc pipeline call (the models run batched over them)
+RAPIDDOC_BATCH_PAGES = 8
+
+# RapidOCR render scale of scanned pages: 2x = 144 DPI, good balance of quality vs speed
+OCR_RENDER_SCALE = 2.0
+
 
 class PDFProcessor:
     """
@@ -242,6 +416,14 @@ class PDFProcessor:
     - Automatic model download (~15 MB)
     """
     
+    # Rendering of scanned pages for RapidOCR (_render_for_ocr), in OCR cache
+    # keys; the cached boxes are in page coordinates
+    _OCR_PAGE_VARIANT = f"page:{OCR_RENDER_SCALE}" + (":native" if DEFAULT_OCR_CONFIG.native_images else "")
+    
+    # Source pages whose PageAnalysis is kept (page_analysis()); the page
+    # pipeline analyses a few pages ahead of the one being inserted
+    _PAGE_ANALYSIS_CACHE = 8
+    
     def __init__(self, pdf_path: str):
         """
         Initialize PDF processor.
@@ -253,6 +435,23 @@ class PDFProcessor:
         self.document = None
         self.page_count = 0
         self._hdr_info = None  # Lazy-initialized IdentifyHeaders
+        # PyMuPDF is not thread-safe: threads sharing this processor (page
+        # pipeline) hold this lock around document access
+        self.mupdf_lock = threading.RLock()
+        self._source_bytes: Optional[bytes] = None  # PDF file, read once for RapidDoc
+        # RapidDoc output of scanned pages (page_num -> ocr_page() result),
+        # filled in batches by analyze_scanned_pages()
+        self._rapiddoc_results: Dict[int, Dict[str, Any]] = {}
+        self._rapiddoc_lock = threading.Lock()
+        self._page_hashes: Dict[int, str] = {}  # page content hashes (OCR cache keys)
+        # RapidOCR boxes of scanned pages ((page_num, variant) -> OcrBoxes)
+        self._rapidocr_boxes: Dict[Tuple[int, str], Any] = {}
+        # Text extraction of recently used source pages (page_num -> PageAnalysis)
+        self._page_analyses: "OrderedDict[int, PageAnalysis]" = OrderedDict()
+        # Scan verdicts of source pages, kept after their analysis is evicted
+        self._scan_verdicts: Dict[int, Tuple[bool, str]] = {}
+        # Page classes found by triage() (page_num -> "native", "scanned", ...)
+        self._page_classes: Dict[int, str] = {}
         self._load_document()
         
     def _load_document(self) -> None:
@@ -297,7 +496,100 @@ class PDFProcessor:
             return self.document[page_num]
         raise IndexError(f"Page {page_num} out of range (0-{self.page_count-1})")
     
-    def _is_likely_scanned_page(self, page: pymupdf.Page) -> Tuple[bool, str]:
+    def page_analysis(self, page_num: int) -> PageAnalysis:
+        """
+        Shared PageAnalysis of a source page.
+        
+        Scan detection, text extraction and segment collection of the page
+        read one TextPage through it. The last _PAGE_ANALYSIS_CACHE pages
+        are kept. Use it under mupdf_lock.
+        """
+        with self.mupdf_lock:
+            analysis = self._page_analyses.get(page_num)
+            if analysis is not None:
+                self._page_analyses.move_to_end(page_num)
+                return analysis
+            analysis = PageAnalysis(self.get_page(page_num))
+            self._page_analyses[page_num] = analysis
+            while len(self._page_analyses) > self._PAGE_ANALYSIS_CACHE:
+                self._page_analyses.popitem(last=False)
+            return analysis
+    
+    def copy_document(self) -> pymupdf.Document:
+        """
+        Copy of the whole document, for translating pages in place.
+        
+        Images, fonts and other resources shared between pages stay shared
+        (one object each), as do outlines, links and metadata.
+        """
+        with self.mupdf_lock:
+            return pymupdf.open("pdf", self.document.tobytes())
+    
+    @staticmethod
+    def _replace_page(document: pymupdf.Document, page_num: int, pdf_bytes: bytes) -> None:
+        """Replace a page of document with a single-page PDF."""
+        with pymupdf.open("pdf", pdf_bytes) as page_doc:
+            document.insert_pdf(page_doc, start_at=page_num)
+        document.delete_page(page_num + 1)
+    
+    @staticmethod
+    def _page_bytes(document: pymupdf.Document, page_num: int) -> bytes:
+        """One page of document as a standalone PDF."""
+        with pymupdf.open() as page_doc:
+            page_doc.insert_pdf(document, from_page=page_num, to_page=page_num)
+            return page_doc.tobytes()
+    
+    @staticmethod
+    def _image_coverage(page: pymupdf.Page) -> Tuple[float, int, int]:
+        """
+        Images placed on a page.
+        
+        Placements (inline images included) come from get_image_info(),
+        which reads them from the page content (get_image_rects() would
+        decode and hash every image to find them).
+        
+        Returns:
+            Tuple of (fraction of the page covered, placements covering more
+            than half of it, images on the page)
+        """
+        page_rect = page.rect
+        page_area = page_rect.width * page_rect.height
+        image_list = page.get_images(full=True)
+        total_image_area = 0
+        large_images = 0
+        
+        try:
+            placements = page.get_image_info()
+        except Exception:
+            placements = []
+        for info in placements:
+            rect = pymupdf.Rect(info["bbox"])
+            img_area = rect.width * rect.height
+            total_image_area += img_area
+            # Large image = covers more than 50% of page
+            if img_area > page_area * 0.5:
+                large_images += 1
+        
+        image_coverage = total_image_area / page_area if page_area > 0 else 0
+        return image_coverage, large_images, len(image_list)
+    
+    def _page_scan_verdict(self, page_num: int) -> Tuple[bool, str]:
+        """_is_likely_scanned_page() of a source page, computed once per page."""
+        verdict = self._scan_verdicts.get(page_num)
+        if verdict is None:
+            with self.mupdf_lock:
+                analysis = self.page_analysis(page_num)
+                verdict = analysis.memo(
+                    "scan_verdict", lambda: self._is_likely_scanned_page(analysis.page, analysis)
+                )
+            self._scan_verdicts[page_num] = verdict
+        return verdict
+    
+    def _is_likely_scanned_page(
+        self,
+        page: pymupdf.Page,
+        analysis: Optional[PageAnalysis] = None,
+    ) -> Tuple[bool, str]:
         """
         Intelligent detection of scanned/image-based pages.
         
@@ -306,6 +598,10 @@ class PDFProcessor:
         2. Text layer presence and quality
         3. Font embedding analysis
         
+        Args:
+            page: Page to check
+            analysis: Shared PageAnalysis of the page (default: a new one)
+        
         Returns:
             Tuple of (is_scanned: bool, reason: str)
         """
@@ -314,30 +610,16 @@ class PDFProcessor:
         
         if page_area <= 0:
             return False, "invalid_page"
+        if analysis is None:
+            analysis = PageAnalysis(page)
         
         # Analyze images on page
-        image_list = page.get_images(full=True)
-        total_image_area = 0
-        large_images = 0
-        
-        for img in image_list:
-            try:
-                xref = img[0]
-                # Get image bbox by finding where it's used on the page
-                img_rects = page.get_image_rects(xref)
-                for rect in img_rects:
-                    img_area = rect.width * rect.height
-                    total_image_area += img_area
-                    # Large image = covers more than 50% of page
-                    if img_area > page_area * 0.5:
-                        large_images += 1
-            except Exception:
-                continue
-        
-        image_coverage = total_image_area / page_area if page_area > 0 else 0
+        image_coverage, large_images, image_count = analysis.memo(
+            "image_coverage", lambda: self._image_coverage(page)
+        )
         
         # Analyze text layer
-        text_dict = page.get_text("dict")
+        text_dict = analysis.dict()
         text_blocks = [b for b in text_dict.get("blocks", []) if "lines" in b]
         total_chars = 0
         total_words = 0
@@ -363,7 +645,7 @@ class PDFProcessor:
             return True, f"full_page_image ({image_coverage:.1%})"
         
         # Case 4: No text at all but has images
-        if total_chars < 5 and len(image_list) > 0:
+        if total_chars < 5 and image_count > 0:
             return True, f"no_text_with_images (chars={total_chars})"
         
         return False, f"native_pdf (coverage={image_coverage:.1%}, words={total_words})"
@@ -447,19 +729,19 @@ class PDFProcessor:
             Extracted text with best possible quality
         """
         page = self.get_page(page_num)
+        analysis = self.page_analysis(page_num)
         
         # Step 1: Analyze page structure
-        is_scanned, scan_reason = self._is_likely_scanned_page(page)
+        is_scanned, scan_reason = self._page_scan_verdict(page_num)
         
         if is_scanned:
             logging.info(f"Page {page_num + 1}: Detected as scanned ({scan_reason}), using OCR directly")
             # Prefer RapidDoc for structured text extraction
             if RAPIDDOC_AVAILABLE:
                 try:
-                    text = _rapiddoc_engine_instance.extract_page_text(
-                        open(self.pdf_path, 'rb').read(),
-                        page_num=page_num,
-                        parse_method='auto',
+                    # Same analysis translate_page() uses (shared through the caches)
+                    text = _rapiddoc_engine_instance._strip_markdown(
+                        self._rapiddoc_result(page_num)['markdown']
                     )
                     if text and len(text.strip()) > 10:
                         logging.info(f"Page {page_num + 1}: RapidDoc extracted {len(text)} chars")
@@ -468,7 +750,7 @@ class PDFProcessor:
                     logging.warning(f"Page {page_num + 1}: RapidDoc extraction failed: {e}")
             # Fallback to plain RapidOCR
             if OCR_AVAILABLE:
-                text = self._extract_via_ocr(page, ocr_language)
+                text = self._extract_via_ocr(page, ocr_language, page_num=page_num)
                 if text and len(text.strip()) > 10:
                     return text
             return "[Scanned page - OCR not available]"
@@ -478,12 +760,12 @@ class PDFProcessor:
         best_quality = 0.0
         
         extraction_methods = [
-            ("standard", lambda: page.get_text("text")),
-            ("whitespace", lambda: page.get_text("text", flags=pymupdf.TEXT_PRESERVE_WHITESPACE)),
-            ("dehyphenate", lambda: page.get_text("text", flags=pymupdf.TEXT_DEHYPHENATE | pymupdf.TEXT_PRESERVE_WHITESPACE)),
-            ("blocks", lambda: self._extract_from_blocks(page)),
-            ("dict", lambda: self._extract_from_dict(page)),
-            ("words", lambda: self._extract_from_words(page)),
+            ("standard", lambda: analysis.text()),
+            ("whitespace", lambda: analysis.text(flags=pymupdf.TEXT_PRESERVE_WHITESPACE)),
+            ("dehyphenate", lambda: analysis.text(flags=pymupdf.TEXT_DEHYPHENATE | pymupdf.TEXT_PRESERVE_WHITESPACE)),
+            ("blocks", lambda: self._extract_from_blocks(analysis)),
+            ("dict", lambda: self._extract_from_dict(analysis)),
+            ("words", lambda: self._extract_from_words(analysis)),
         ]
         
         for method_name, extractor in extraction_methods:
@@ -518,7 +800,7 @@ class PDFProcessor:
         # Step 4: Native extraction insufficient, try OCR
         if OCR_AVAILABLE:
             logging.info(f"Page {page_num + 1}: Native text quality too low (q={best_quality:.2f}, words={word_count}), trying OCR")
-            ocr_text = self._extract_via_ocr(page, ocr_language)
+            ocr_text = self._extract_via_ocr(page, ocr_language, page_num=page_num)
             
             if ocr_text:
                 ocr_quality, ocr_issues = self._assess_text_quality(ocr_text)
@@ -537,9 +819,9 @@ class PDFProcessor:
         logging.warning(f"Page {page_num + 1}: No text extracted")
         return "[No extractable text]"
     
-    def _extract_from_blocks(self, page: pymupdf.Page) -> str:
+    def _extract_from_blocks(self, analysis: PageAnalysis) -> str:
         """Extract text from blocks."""
-        blocks = page.get_text("blocks", flags=pymupdf.TEXT_DEHYPHENATE)
+        blocks = analysis.blocks(flags=pymupdf.TEXT_DEHYPHENATE)
         parts = []
         for block in blocks:
             if len(block) > 4:
@@ -548,9 +830,9 @@ class PDFProcessor:
                     parts.append(text_part)
         return " ".join(parts)
     
-    def _extract_from_dict(self, page: pymupdf.Page) -> str:
+    def _extract_from_dict(self, analysis: PageAnalysis) -> str:
         """Extract text from dictionary structure."""
-        text_dict = page.get_text("dict")
+        text_dict = analysis.dict()
         parts = []
         for block in text_dict.get("blocks", []):
             if "lines" in block:
@@ -561,19 +843,21 @@ class PDFProcessor:
                                 parts.append(span["text"])
         return " ".join(parts)
     
-    def _extract_from_words(self, page: pymupdf.Page) -> str:
+    def _extract_from_words(self, analysis: PageAnalysis) -> str:
         """Extract text from word list."""
-        words = page.get_text("words")
+        words = analysis.words()
         if words and len(words) > 10:
             return " ".join([word[4] for word in words if word[4].strip()])
         return ""
     
-    def _extract_via_ocr(self, page: pymupdf.Page, language: str) -> str:
+    def _extract_via_ocr(self, page: pymupdf.Page, language: str, page_num: Optional[int] = None) -> str:
         """
         Extract text using RapidOCR, con preprocessing robusto.
         
-        Lavora direttamente sulla pagina PyMuPDF senza scrivere PDF temporanei.
-        Logga le caratteristiche del PNG preprocessato.
+        Lavora direttamente sulla pagina PyMuPDF senza scrivere PDF temporanei
+        né codificare PNG. Logga le caratteristiche dell'immagine preprocessata.
+        Con page_num (pagina di questo documento) il risultato passa dalla
+        cache OCR.
         """
         global _ocr_engine_instance
         if _ocr_engine_instance is None:
@@ -581,23 +865,32 @@ class PDFProcessor:
             return ""
         try:
             logging.info(f"RapidOCR extraction (lang={language}) [preprocessing attivo]")
-            from .preprocess_for_ocr import preprocess_page_from_pymupdf, DEFAULT_DPI
-            
-            # Preprocessa direttamente dalla pagina (no file temporanei)
-            # DPI 300: coerente con max_side_len=3000 dell'engine RapidOCR
-            png_bytes, info = preprocess_page_from_pymupdf(page, dpi=DEFAULT_DPI)
+            from .preprocess_for_ocr import preprocess_page_array, DEFAULT_DPI
+            grayscale = DEFAULT_OCR_CONFIG.grayscale
+            embedded = DEFAULT_OCR_CONFIG.native_images
             
-            logging.info(
-                f"PNG per OCR: {info['width']}x{info['height']} px | "
-                f"DPI={info['dpi']} | Mode={info['mode']} | "
-                f"Size={info['file_size_kb']} KB"
-            )
+            def render() -> Tuple[np.ndarray, pymupdf.Matrix]:
+                # Preprocessa direttamente dalla pagina (no file temporanei,
+                # nessun PNG: l'array va direttamente a RapidOCR); per le
+                # scansioni usa l'immagine incorporata alla sua risoluzione
+                # DPI 300: coerente con max_side_len=3000 dell'engine RapidOCR
+                image, info = preprocess_page_array(
+                    page, dpi=DEFAULT_DPI, grayscale=grayscale, embedded=embedded,
+                )
+                logging.info(
+                    f"Immagine per OCR: {info['width']}x{info['height']} px | "
+                    f"DPI={info['dpi']} | Mode={info['mode']} | "
+                    f"Size={info['size_kb']} KB | Sorgente={info['source']}"
+                )
+                return image, info['to_page']
             
             # Usa RapidOCR per il riconoscimento
-            text = _ocr_engine_instance.recognize_document_page(
-                png_bytes,
-                detect_tables=True
+            variant = (
+                f"preprocessed:{DEFAULT_DPI}:page"
+                + (":native" if embedded else "")
+                + (":gray" if grayscale else "")
             )
+            text = self._rapidocr_text(page_num, variant, render)
             
             if text:
                 # post_process_ocr_text include già clean_ocr_text come primo passo
@@ -746,7 +1039,10 @@ class PDFProcessor:
         page_num: int,
         translator,
         text_color: Tuple[float, float, float] = (0, 0, 0),
-        ocr_language: str = "en"
+        ocr_language: str = "en",
+        decoding_profile: Optional[str] = None,
+        ocr_result: Optional[Dict[str, Any]] = None,
+        known: Optional[Dict[str, str]] = None,
     ) -> pymupdf.Document:
         """
         Translate a scanned page using RapidDoc (structured document parsing).
@@ -770,6 +1066,9 @@ class PDFProcessor:
             translator: Translation engine
             text_color: Color for translated text
             ocr_language: Language code (for logging)
+            decoding_profile: Decoding profile override ("fast", "balanced", "quality")
+            ocr_result: RapidDoc output computed ahead by ocr_page() (pipeline)
+            known: Segments translated ahead (see _scanned_page_segments())
             
         Returns:
             Document with translated structured content
@@ -779,37 +1078,33 @@ class PDFProcessor:
         if not RAPIDDOC_AVAILABLE or _rapiddoc_engine_instance is None:
             logging.warning(f"Page {page_num + 1}: RapidDoc not available, falling back to RapidOCR")
             return self._translate_scanned_page(
-                new_doc, page, page_num, translator, text_color, ocr_language
+                new_doc, page, page_num, translator, text_color, ocr_language,
+                decoding_profile=decoding_profile, ocr_result=ocr_result, known=known,
             )
         
         try:
             # ============================================
-            # STEP 1: Read original PDF bytes for RapidDoc
+            # STEP 1: Page geometry
             # ============================================
             page_rect = page.rect
             page_width = page_rect.width
             page_height = page_rect.height
             
-            # Read original PDF bytes
-            pdf_bytes = open(self.pdf_path, 'rb').read()
-            
             logging.info(f"Page {page_num + 1}: Using RapidDoc for structured extraction")
             
             # ============================================
             # STEP 2: Extract structured Markdown via RapidDoc
             # ============================================
-            md_content, metadata = _rapiddoc_engine_instance.extract_page_markdown(
-                pdf_bytes,
-                page_num=page_num,
-                parse_method='auto',
-                table_enable=True,
-                formula_enable=False,
-            )
+            # Computed ahead (pipeline / batched analysis) or analysed now
+            if not (ocr_result and ocr_result.get('engine') == 'rapiddoc'):
+                ocr_result = self._rapiddoc_result(page_num)
+            md_content, metadata = ocr_result['markdown'], ocr_result['metadata']
             
             if not md_content or len(md_content.strip()) < 5:
                 logging.warning(f"Page {page_num + 1}: RapidDoc returned no content, falling back to RapidOCR")
                 return self._translate_scanned_page(
-                    new_doc, page, page_num, translator, text_color, ocr_language
+                    new_doc, page, page_num, translator, text_color, ocr_language,
+                    decoding_profile=decoding_profile, known=known,
                 )
             
             logging.info(
@@ -825,7 +1120,7 @@ class PDFProcessor:
             layout_hints = {'centered': False, 'sparse': False, 'content_y_range': None}
             if COLUMN_BOXES_AVAILABLE:
                 try:
-                    cb_rects = column_boxes(page, no_image_text=True)
+                    cb_rects = self._column_rects(self.page_analysis(page_num))
                     if len(cb_rects) > 1:
                         detected_columns = len(cb_rects)
                         col_x_ranges = [(r.x0, r.x1) for r in cb_rects]
@@ -859,7 +1154,8 @@ class PDFProcessor:
             if not elements:
                 logging.warning(f"Page {page_num + 1}: No elements parsed from RapidDoc output")
                 return self._translate_scanned_page(
-                    new_doc, page, page_num, translator, text_color, ocr_language
+                    new_doc, page, page_num, translator, text_color, ocr_language,
+                    decoding_profile=decoding_profile, known=known,
                 )
             
             logging.info(
@@ -870,26 +1166,31 @@ class PDFProcessor:
             )
             
             # ============================================
-            # STEP 4: Translate each element
+            # STEP 4: Translate all elements in one batch
             # ============================================
+            # Collect every segment on the page (element texts and table
+            # cells) first, translate them together, then rebuild elements.
+            segments, segment_classes = self._rapiddoc_segments(elements)
+            translations = _translate_segments(
+                translator, segments, known=known, classes=segment_classes, profile=decoding_profile
+            )
+            
             translated_elements = []
             for elem in elements:
                 if elem['type'] == 'table':
-                    # For tables: translate cell-by-cell
-                    translated_table = self._translate_table_element(elem, translator)
+                    # For tables: rebuild cell-by-cell
+                    translated_table = self._translate_table_element(
+                        elem, translator, translations=translations
+                    )
                     translated_elements.append(translated_table)
                 elif elem['text'] and len(elem['text'].strip()) >= 2:
-                    try:
-                        translated = translator.translate(elem['text'])
-                        if translated and translated.strip():
-                            translated_elements.append({
-                                **elem,
-                                'text': translated.strip(),
-                            })
-                        else:
-                            translated_elements.append(elem)
-                    except Exception as e:
-                        logging.warning(f"Translation failed for element: {e}")
+                    translated = translations.get(elem['text'])
+                    if translated and translated.strip():
+                        translated_elements.append({
+                            **elem,
+                            'text': translated.strip(),
+                        })
+                    else:
                         translated_elements.append(elem)
                 else:
                     translated_elements.append(elem)
@@ -904,7 +1205,7 @@ class PDFProcessor:
             # as a single HTML document. PyMuPDF's insert_htmlbox() with
             # scale_low=0 will auto-scale the content to fit the page.
             
-            new_page = new_doc[0]
+            new_page = page
             
             # Clear everything — draw white rectangle over entire page
             new_page.draw_rect(page_rect, color=(1, 1, 1), fill=(1, 1, 1))
@@ -1239,18 +1540,95 @@ class PDFProcessor:
             )
             # Fallback to plain RapidOCR
             return self._translate_scanned_page(
-                new_doc, page, page_num, translator, text_color, ocr_language
+                new_doc, page, page_num, translator, text_color, ocr_language,
+                decoding_profile=decoding_profile, known=known,
+            )
+    
+    @staticmethod
+    def _split_table_row(line: str) -> List[str]:
+        """Split a Markdown table line (|col1|col2|...) into stripped cells."""
+        cells = [c.strip() for c in line.split('|')]
+        # Remove empty first/last from leading/trailing |
+        if cells and cells[0] == '':
+            cells = cells[1:]
+        if cells and cells[-1] == '':
+            cells = cells[:-1]
+        return cells
+    
+    def _collect_table_cells(self, elem: Dict[str, Any]) -> List[str]:
+        """Return the translatable cells of a Markdown table element."""
+        cells = []
+        for line in elem['text'].strip().split('\n'):
+            if not line.strip().startswith('|'):
+                continue
+            cells.extend(
+                cell.strip() for cell in self._split_table_row(line)
+                if cell and len(cell.strip()) >= 2
             )
+        return cells
+    
+    def _rapiddoc_segments(self, elements: List[Dict[str, Any]]) -> Tuple[List[str], Dict[str, str]]:
+        """Translatable segments of RapidDoc elements (texts and table cells) and their classes."""
+        segments = []
+        segment_classes: Dict[str, str] = {}
+        for elem in elements:
+            if elem['type'] == 'table':
+                cells = self._collect_table_cells(elem)
+                segments.extend(cells)
+                segment_classes.update(dict.fromkeys(cells, 'cell'))
+            elif elem['text'] and len(elem['text'].strip()) >= 2:
+                segments.append(elem['text'])
+                segment_classes.setdefault(
+                    elem['text'], 'heading' if elem['type'] == 'heading' else 'body'
+                )
+        return segments, segment_classes
+    
+    @staticmethod
+    def _ocr_paragraphs(ocr_text: str) -> List[str]:
+        """Paragraphs of RapidOCR text, post-processed (the segments of a scanned page)."""
+        # post_process_ocr_text include già clean_ocr_text come primo passo
+        ocr_text = post_process_ocr_text(ocr_text)
+        # OCR output uses double newlines for paragraphs
+        raw_paragraphs = re.split(r'\n\s*\n', ocr_text)
+        return [p.strip() for p in raw_paragraphs if len(p.strip()) >= 3]
+    
+    def _scanned_page_segments(self, ocr_result: Optional[Dict[str, Any]]) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Segments and classes the scanned-page layout will translate, from
+        an ocr_page() result (none for a missing or empty result).
+        
+        Lets MT of a scanned page run before its insertion, outside
+        mupdf_lock; the layout then finds them in known.
+        """
+        if not ocr_result:
+            return [], {}
+        if ocr_result.get('engine') == 'rapiddoc':
+            md_content = ocr_result.get('markdown') or ''
+            if len(md_content.strip()) < 5:
+                return [], {}
+            return self._rapiddoc_segments(self._parse_rapiddoc_markdown(md_content))
+        if ocr_result.get('engine') == 'rapidocr':
+            return self._ocr_paragraphs(ocr_result.get('text') or ''), {}
+        return [], {}
     
     def _translate_table_element(
-        self, elem: Dict[str, Any], translator
+        self,
+        elem: Dict[str, Any],
+        translator,
+        translations: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
         """
         Translate a table element cell-by-cell.
         
         Parses Markdown table lines (|col1|col2|...) and translates
-        each cell individually to preserve table structure.
+        each cell individually to preserve table structure. Cells are
+        looked up in translations (from a page-level batch); when not
+        given, all cells of the table are translated in one batch.
         """
+        if translations is None:
+            cells = self._collect_table_cells(elem)
+            translations = _translate_segments(translator, cells, classes=dict.fromkeys(cells, 'cell'))
+        
         lines = elem['text'].strip().split('\n')
         translated_lines = []
         
@@ -1259,21 +1637,13 @@ class PDFProcessor:
                 translated_lines.append(line)
                 continue
             
-            cells = [c.strip() for c in line.split('|')]
-            # Remove empty first/last from leading/trailing |
-            if cells and cells[0] == '':
-                cells = cells[1:]
-            if cells and cells[-1] == '':
-                cells = cells[:-1]
+            cells = self._split_table_row(line)
             
             translated_cells = []
             for cell in cells:
                 if cell and len(cell.strip()) >= 2:
-                    try:
-                        translated = translator.translate(cell.strip())
-                        translated_cells.append(translated or cell)
-                    except Exception:
-                        translated_cells.append(cell)
+                    translated = translations.get(cell.strip())
+                    translated_cells.append(translated or cell)
                 else:
                     translated_cells.append(cell)
             
@@ -1311,11 +1681,7 @@ class PDFProcessor:
             if not line.strip().startswith('|'):
                 continue
             
-            cells = [c.strip() for c in line.split('|')]
-            if cells and cells[0] == '':
-                cells = cells[1:]
-            if cells and cells[-1] == '':
-                cells = cells[:-1]
+            cells = PDFProcessor._split_table_row(line)
             
             if not cells:
                 continue
@@ -1329,6 +1695,290 @@ class PDFProcessor:
         html_parts.append('</table>')
         return '\n'.join(html_parts)
     
+    @staticmethod
+    def _render_for_ocr(page: pymupdf.Page, page_num: int) -> Tuple[np.ndarray, pymupdf.Matrix]:
+        """
+        Image of a page for RapidOCR, as an RGB array plus the matrix
+        mapping its pixels to page coordinates.
+        
+        A scan that is one embedded image (see find_scan_image) is decoded
+        from its xref at its own resolution when that is within the window
+        above the RapidOCR resolution (upsampled when below it). Other
+        pages, and scans above the window, are rendered at
+        OCR_RENDER_SCALE. Either way the array is built on the pixmap
+        samples, without a PNG encode/decode.
+        """
+        if DEFAULT_OCR_CONFIG.native_images:
+            scan = find_scan_image(page)
+            if scan is not None:
+                try:
+                    native = native_page_array(page, scan, OCR_RENDER_SCALE * 72)
+                except Exception as e:
+                    native = None
+                    logging.warning(f"Page {page_num + 1}: Embedded scan not decodable, rendering the page: {e}")
+                if native is not None:
+                    image, to_page, _ = native
+                    logging.info(
+                        f"Page {page_num + 1}: Embedded {scan.width}x{scan.height} scan "
+                        f"({scan.dpi:.0f} DPI) used at {image.shape[1]}x{image.shape[0]} for RapidOCR"
+                    )
+                    return image, to_page
+        
+        pix = page.get_pixmap(matrix=pymupdf.Matrix(OCR_RENDER_SCALE, OCR_RENDER_SCALE), alpha=False)
+        logging.info(f"Page {page_num + 1}: Rendered to {pix.width}x{pix.height} for RapidOCR")
+        origin = page.rect.tl
+        to_page = pymupdf.Matrix(1 / OCR_RENDER_SCALE, 0, 0, 1 / OCR_RENDER_SCALE, origin.x, origin.y)
+        return pixmap_to_array(pix), to_page
+    
+    def _page_hash(self, page_num: int) -> str:
+        """Content hash of a source page (see page_source_hash), computed once."""
+        page_hash = self._page_hashes.get(page_num)
+        if page_hash is None:
+            with self.mupdf_lock:
+                page_hash = page_source_hash(self.document, page_num)
+            self._page_hashes[page_num] = page_hash
+        return page_hash
+    
+    def _rapidocr_text(
+        self,
+        page_num: Optional[int],
+        variant: str,
+        render: Callable[[], Tuple[np.ndarray, pymupdf.Matrix]],
+    ) -> str:
+        """
+        RapidOCR text of a page, through the OCR result cache.
+        
+        The raw boxes are mapped to page coordinates and cached by page
+        content, engine configuration and variant (how render() produces
+        the image), so a page seen before is neither rendered nor
+        recognized again.
+        
+        Args:
+            page_num: Page of this document (None: not cached)
+            variant: Rendering of the image, part of the cache key
+            render: Produces the image (RGB array) and its pixel-to-page
+                matrix on a cache miss
+        """
+        boxes = self._cached_rapidocr_boxes(page_num, variant) if page_num is not None else None
+        if boxes is None:
+            image, to_page = render()
+            boxes = _ocr_engine_instance.recognize_boxes(image)
+            del image
+            if boxes is None:
+                return ""
+            boxes = boxes.transformed(to_page)
+            if page_num is not None:
+                self._store_rapidocr_boxes(page_num, variant, boxes)
+        return _ocr_engine_instance.text_from_boxes(boxes)
+    
+    def _rapidocr_cache_key(self, page_num: int, variant: str) -> str:
+        """OCR cache key of a page's RapidOCR boxes."""
+        return cache_key("rapidocr", _rapidocr_fingerprint(), self._page_hash(page_num), variant)
+    
+    def _cached_rapidocr_boxes(self, page_num: int, variant: str) -> Optional["OcrBoxes"]:
+        """RapidOCR boxes of this session or from the OCR cache, None if never recognized."""
+        boxes = self._rapidocr_boxes.get((page_num, variant))
+        if boxes is not None:
+            return boxes
+        cache = get_ocr_cache()
+        payload = cache.get(self._rapidocr_cache_key(page_num, variant)) if cache is not None else None
+        if payload is None:
+            return None
+        logging.info(f"Page {page_num + 1}: RapidOCR result from cache")
+        boxes = OcrBoxes.from_payload(payload)
+        self._rapidocr_boxes[(page_num, variant)] = boxes
+        return boxes
+    
+    def _store_rapidocr_boxes(self, page_num: int, variant: str, boxes: "OcrBoxes") -> None:
+        """Keep RapidOCR boxes for this session and in the OCR cache."""
+        self._rapidocr_boxes[(page_num, variant)] = boxes
+        cache = get_ocr_cache()
+        if cache is not None:
+            cache.put(self._rapidocr_cache_key(page_num, variant), "rapidocr", boxes.to_payload())
+    
+    def _rapiddoc_cache_key(self, page_num: int) -> str:
+        """OCR cache key of a page's RapidDoc analysis."""
+        return cache_key(
+            "rapiddoc",
+            _rapiddoc_fingerprint(parse_method='auto', table_enable=True, formula_enable=False),
+            self._page_hash(page_num),
+        )
+    
+    def _store_rapiddoc_result(self, page_num: int, md_content: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep a RapidDoc result for this session and in the OCR cache."""
+        result = {'engine': 'rapiddoc', 'markdown': md_content, 'metadata': metadata}
+        with self._rapiddoc_lock:
+            self._rapiddoc_results[page_num] = result
+        cache = get_ocr_cache()
+        if cache is not None:
+            cache.put(self._rapiddoc_cache_key(page_num), "rapiddoc", {
+                'markdown': md_content, 'metadata': metadata,
+            })
+        return result
+    
+    def _cached_rapiddoc_result(self, page_num: int) -> Optional[Dict[str, Any]]:
+        """RapidDoc result of this session or from the OCR cache, None if never analysed."""
+        with self._rapiddoc_lock:
+            result = self._rapiddoc_results.get(page_num)
+        if result is not None:
+            return result
+        cache = get_ocr_cache()
+        payload = cache.get(self._rapiddoc_cache_key(page_num)) if cache is not None else None
+        if payload is None:
+            return None
+        logging.info(f"Page {page_num + 1}: RapidDoc result from cache")
+        result = {'engine': 'rapiddoc', 'markdown': payload['markdown'], 'metadata': payload['metadata']}
+        with self._rapiddoc_lock:
+            self._rapiddoc_results[page_num] = result
+        return result
+    
+    def source_bytes(self) -> bytes:
+        """The PDF file as bytes (read once; RapidDoc parses it with pypdfium2)."""
+        if self._source_bytes is None:
+            with open(self.pdf_path, 'rb') as f:
+                self._source_bytes = f.read()
+        return self._source_bytes
+    
+    def analyze_scanned_pages(
+        self,
+        pages: Optional[List[int]] = None,
+        batch_size: int = RAPIDDOC_BATCH_PAGES,
+    ) -> int:
+        """
+        Run OCR over the scanned pages among pages, batch_size at a time.
+        
+        With RapidDoc each batch is one extract_pages_markdown() call, so
+        the layout, OCR and table models run batched instead of once per
+        page. With plain RapidOCR each batch is rendered and recognized
+        concurrently by the OCR engine pool (see ocr_pool.py). The
+        results are kept per page and consumed by ocr_page(),
+        translate_page() and extract_text(), and stored in the OCR result
+        cache. Pages already analysed (in this session or found in the
+        cache) are skipped; a failed batch is left to per-page analysis.
+        
+        Args:
+            pages: Candidate pages (default: all pages); native pages are skipped
+            batch_size: Pages per RapidDoc call / OCR pool batch
+            
+        Returns:
+            Number of pages analysed
+        """
+        use_rapiddoc = RAPIDDOC_AVAILABLE and _rapiddoc_engine_instance is not None
+        if not use_rapiddoc and not OCR_AVAILABLE:
+            return 0
+        pages = list(range(self.page_count)) if pages is None else list(pages)
+        with self.mupdf_lock:
+            scanned = [
+                page_num for page_num in pages
+                if page_num not in self._rapiddoc_results
+                and (page_num, self._OCR_PAGE_VARIANT) not in self._rapidocr_boxes
+                and self._page_scan_verdict(page_num)[0]
+            ]
+        batch_size = max(1, batch_size)
+        if not use_rapiddoc:
+            return self._ocr_pages_with_pool(scanned, batch_size)
+        scanned = [page_num for page_num in scanned if self._cached_rapiddoc_result(page_num) is None]
+        
+        analysed = 0
+        for start in range(0, len(scanned), batch_size):
+            batch = scanned[start:start + batch_size]
+            try:
+                results = _rapiddoc_engine_instance.extract_pages_markdown(
+                    self.source_bytes(),
+                    batch,
+                    parse_method='auto',
+                    table_enable=True,
+                    formula_enable=False,
+                )
+            except Exception as e:
+                capture_exception(e, context={
+                    "operation": "analyze_scanned_pages",
+                    "pages": batch,
+                }, tags={"component": "pdf_processor"})
+                logging.warning(f"RapidDoc batch of {len(batch)} page(s) failed, analysing per page: {e}")
+                continue
+            for page_num, (md_content, metadata) in results.items():
+                self._store_rapiddoc_result(page_num, md_content, metadata)
+            analysed += len(results)
+        return analysed
+    
+    def _ocr_pages_with_pool(self, scanned: List[int], batch_size: int) -> int:
+        """RapidOCR of scanned pages, batch_size renders at a time spread over the OCR engine pool."""
+        variant = self._OCR_PAGE_VARIANT
+        missing = [page_num for page_num in scanned if self._cached_rapidocr_boxes(page_num, variant) is None]
+        if len(missing) < 2:
+            return 0  # nothing to spread: ocr_page()/translate_page() OCR it themselves
+        
+        pool = get_ocr_pool()
+        analysed = 0
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            with self.mupdf_lock:
+                renders = [self._render_for_ocr(self.get_page(page_num), page_num) for page_num in batch]
+            results = pool.recognize_many([image for image, _ in renders])
+            transforms = [to_page for _, to_page in renders]
+            del renders
+            for page_num, boxes, to_page in zip(batch, results, transforms):
+                if boxes is not None:
+                    self._store_rapidocr_boxes(page_num, variant, boxes.transformed(to_page))
+                    analysed += 1
+        logging.info(f"OCR engine pool: {analysed}/{len(missing)} scanned page(s) recognized")
+        return analysed
+    
+    def _rapiddoc_result(self, page_num: int) -> Dict[str, Any]:
+        """RapidDoc output of a page: analysed before (batch, cache), or analysed now."""
+        cached = self._cached_rapiddoc_result(page_num)
+        if cached is not None:
+            return cached
+        md_content, metadata = _rapiddoc_engine_instance.extract_page_markdown(
+            self.source_bytes(),
+            page_num=page_num,
+            parse_method='auto',
+            table_enable=True,
+            formula_enable=False,
+        )
+        return self._store_rapiddoc_result(page_num, md_content, metadata)
+    
+    def ocr_page(self, page_num: int, batch: Optional[List[int]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Run layout analysis/OCR on a scanned page without translating it.
+        
+        Lets the page pipeline run OCR for one page while another is being
+        translated; pass the result to translate_page(ocr_result=...).
+        Only rendering touches PyMuPDF (under mupdf_lock): RapidDoc reads
+        the PDF through pypdfium2 and the ONNX/OpenVINO inference releases
+        the GIL.
+        
+        Args:
+            page_num: Scanned page to analyse
+            batch: Upcoming pages (page_num first) to analyse in the same
+                batch (RapidDoc call / OCR engine pool) when page_num has no
+                result yet
+        
+        Returns:
+            {'engine': 'rapiddoc', 'markdown', 'metadata'} or
+            {'engine': 'rapidocr', 'text'}, or None if no OCR engine is
+            available or it failed (translate_page then runs OCR itself)
+        """
+        try:
+            if RAPIDDOC_AVAILABLE and _rapiddoc_engine_instance is not None:
+                if batch and page_num not in self._rapiddoc_results:
+                    self.analyze_scanned_pages(batch, batch_size=len(batch))
+                return self._rapiddoc_result(page_num)
+            if OCR_AVAILABLE:
+                if batch and (page_num, self._OCR_PAGE_VARIANT) not in self._rapidocr_boxes:
+                    self.analyze_scanned_pages(batch, batch_size=len(batch))
+                def render() -> Tuple[np.ndarray, pymupdf.Matrix]:
+                    with self.mupdf_lock:
+                        return self._render_for_ocr(self.get_page(page_num), page_num)
+                text = self._rapidocr_text(page_num, self._OCR_PAGE_VARIANT, render)
+                return {'engine': 'rapidocr', 'text': text}
+        except Exception as e:
+            capture_exception(e, context={"operation": "ocr_page", "page_num": page_num},
+                              tags={"component": "pdf_processor"})
+            logging.warning(f"Page {page_num + 1}: OCR ahead of translation failed: {e}")
+        return None
+    
     def _translate_scanned_page(
         self,
         new_doc: pymupdf.Document,
@@ -1336,13 +1986,16 @@ class PDFProcessor:
         page_num: int,
         translator,
         text_color: Tuple[float, float, float] = (0, 0, 0),
-        ocr_language: str = "en"
+        ocr_language: str = "en",
+        decoding_profile: Optional[str] = None,
+        ocr_result: Optional[Dict[str, Any]] = None,
+        known: Optional[Dict[str, str]] = None,
     ) -> pymupdf.Document:
         """
         Translate a scanned (image-based) page using RapidOCR + CLEAN SLATE approach.
         
         Strategy:
-        1. Render page to high-resolution image
+        1. Render page to high-resolution image (or decode the embedded scan image)
         2. RapidOCR extracts all text (detection + classification + recognition)
         3. Post-process OCR text (fix errors, normalize)
         4. Split into paragraphs and translate each
@@ -1356,6 +2009,9 @@ class PDFProcessor:
             translator: Translation engine
             text_color: Color for translated text
             ocr_language: Language code (for logging)
+            decoding_profile: Decoding profile override ("fast", "balanced", "quality")
+            ocr_result: RapidOCR output computed ahead by ocr_page() (pipeline)
+            known: Segments translated ahead (see _scanned_page_segments())
             
         Returns:
             New document with translated content on clean page
@@ -1372,20 +2028,18 @@ class PDFProcessor:
             page_width = page_rect.width
             page_height = page_rect.height
             
-            # Convert page to high-resolution PNG for OCR
-            ocr_scale = 2.0  # 2x = 144 DPI — good balance of quality vs speed
-            pix = page.get_pixmap(matrix=pymupdf.Matrix(ocr_scale, ocr_scale))
-            img_data = pix.tobytes("png")
-            
-            logging.info(f"Page {page_num + 1}: Rendered to {pix.width}x{pix.height} for RapidOCR")
-            
-            # ============================================
-            # STEP 2: RapidOCR text extraction
-            # ============================================
-            ocr_text = _ocr_engine_instance.recognize_document_page(
-                img_data, 
-                detect_tables=True
-            )
+            if ocr_result and ocr_result.get('engine') == 'rapidocr':
+                ocr_text = ocr_result['text']
+            else:
+                # ============================================
+                # STEP 2: RapidOCR text extraction (embedded scan image
+                # or high-resolution render, skipped when the page is in
+                # the OCR cache)
+                # ============================================
+                ocr_text = self._rapidocr_text(
+                    page_num, self._OCR_PAGE_VARIANT,
+                    lambda: self._render_for_ocr(page, page_num),
+                )
             
             if not ocr_text or len(ocr_text.strip()) < 5:
                 logging.warning(f"Page {page_num + 1}: RapidOCR returned no usable text")
@@ -1394,25 +2048,15 @@ class PDFProcessor:
             logging.info(f"Page {page_num + 1}: RapidOCR extracted {len(ocr_text)} chars")
             
             # ============================================
-            # STEP 3: Post-process OCR text
+            # STEP 3-4: Post-process OCR text, split into paragraphs
+            # and translate
             # ============================================
-            # post_process_ocr_text include già clean_ocr_text come primo passo
-            ocr_text = post_process_ocr_text(ocr_text)
-            
-            # ============================================
-            # STEP 4: Split into paragraphs and translate
-            # ============================================
-            # OCR output uses double newlines for paragraphs
-            raw_paragraphs = re.split(r'\n\s*\n', ocr_text)
+            paragraphs = self._ocr_paragraphs(ocr_text)
+            translations = _translate_segments(translator, paragraphs, known=known, profile=decoding_profile)
             
             translated_paragraphs = []
-            for para in raw_paragraphs:
-                para = para.strip()
-                if not para or len(para) < 3:
-                    continue
-                
-                # Translate the paragraph
-                translated = translator.translate(para)
+            for para in paragraphs:
+                translated = translations.get(para)
                 if translated and translated.strip():
                     translated_paragraphs.append(translated.strip())
                 else:
@@ -1428,7 +2072,7 @@ class PDFProcessor:
             # ============================================
             # STEP 5: CREATE CLEAN PAGE and insert translated text
             # ============================================
-            new_page = new_doc[0]
+            new_page = page
             
             # Clear everything — draw white rectangle over entire page
             new_page.draw_rect(page_rect, color=(1, 1, 1), fill=(1, 1, 1))
@@ -1526,92 +2170,80 @@ class PDFProcessor:
             logging.error(f"Page {page_num + 1}: Scanned page translation failed: {e}", exc_info=True)
             return new_doc
 
-    def translate_page(
-        self, 
-        page_num: int, 
-        translator,
-        text_color: Tuple[float, float, float] = (0, 0, 0),
-        use_original_color: bool = True,
-        preserve_font_style: bool = True,
+    @staticmethod
+    def _column_rects(
+        analysis: PageAnalysis,
+        footer_margin: float = 50,
+        header_margin: float = 50,
+        avoid: Optional[List[pymupdf.Rect]] = None,
+    ) -> List[pymupdf.Rect]:
+        """
+        column_boxes() of the analysed page (no_image_text=True), memoized.
+
+        The page's vector graphics come from the analysis instead of a new
+        get_drawings() call, filtered the way column_boxes() filters its own.
+        """
+        key = ("columns", footer_margin, header_margin, tuple(tuple(rect) for rect in avoid or ()))
+
+        def compute() -> List[pymupdf.Rect]:
+            page = analysis.page
+            clip = +page.rect
+            clip.y1 -= footer_margin
+            clip.y0 += header_margin
+            paths = [
+                path for path in analysis.drawings()
+                if path["rect"].width < clip.width and path["rect"].height < clip.height
+            ]
+            return column_boxes(
+                page,
+                footer_margin=footer_margin,
+                header_margin=header_margin,
+                no_image_text=True,
+                paths=paths,
+                avoid=avoid,
+            )
+
+        return analysis.memo(key, compute)
+
+    def _collect_page_segments(
+        self,
+        page: pymupdf.Page,
+        page_num: int,
         preserve_line_breaks: bool = True,
-        ocr_language: str = "en"
-    ) -> pymupdf.Document:
+        analysis: Optional[PageAnalysis] = None,
+    ) -> Dict[str, Any]:
         """
-        World-class translation system with maximum fidelity to original.
-        
-        Architecture:
-        1. Phase 0: Detect if page is scanned and needs OCR
-        2. Phase 1: Extract all text structure with SPAN-LEVEL formatting
-        3. Phase 2: Translate LINE BY LINE to preserve structure
-        4. Phase 3: Apply SPAN-LEVEL formatting to translated text
-        5. Phase 4: Remove ALL original text via redaction (clean slate)
-        6. Phase 5: Insert translations with inline formatting preserved
-        
-        For scanned pages:
-        - Uses RapidOCR for text extraction
-        - Creates clean page with translated text
-        
-        LINE-BY-LINE TRANSLATION (preserve_line_breaks=True):
-        This mode translates each line independently, preserving the original
-        document structure. This is crucial for:
-        - Titles and headings on separate lines
-        - Lists and bullet points
-        - Tables and structured content
-        - Poetry and formatted text
+        Collect the translatable segments of a native (non-scanned) page.
         
-        SPAN-LEVEL FORMATTING:
-        Tracks formatting at the span level (individual text segments within a line).
-        This allows proper preservation of:
-        - Inline bold (e.g., "This is **important** text")
-        - Inline italic (e.g., "See the *definition* here")
-        - Mixed formatting within the same line
-        - Color changes for emphasis
+        Runs the read-only phases of translate_page (alignment detection,
+        table detection, paragraph grouping, span-level formatting) without
+        translating or modifying anything. Used by translate_page and by
+        the document-level plan_translation pre-pass.
         
         Args:
-            page_num: Page number to translate
-            translator: Translation engine instance
-            text_color: RGB color tuple for translated text (default black)
-            use_original_color: If True, use the original text color instead (default True)
-            preserve_font_style: If True, match original font family style
-            preserve_line_breaks: If True, translate line by line (default True)
-            ocr_language: Language code for OCR (default "en")
+            page: Page to analyze
+            page_num: Page number (for logging)
+            preserve_line_breaks: Paragraph-by-paragraph units (True) or
+                legacy whole-block units (False)
+            analysis: Shared PageAnalysis of the page (default: a new one);
+                the page dict, tables and column rects are read from it
             
         Returns:
-            New document containing translated page
+            Dict with 'segments' (source texts in page order),
+            'segment_classes' (segment -> "heading"/"cell"/"body"),
+            'text_units' (paragraph/line units), 'table_jobs',
+            'areas_to_redact' and 'total_blocks'
         """
-        WHITE = pymupdf.pdfcolor["white"]
-        
-        new_doc = pymupdf.open()
-        new_doc.insert_pdf(self.document, from_page=page_num, to_page=page_num)
-        page = new_doc[0]
+        if analysis is None:
+            analysis = PageAnalysis(page)
+        text_dict = analysis.dict(sort=True)
         
         # ============================================
-        # PHASE 0: Check if page is scanned (needs OCR)
+        # PHASE 0b: Detect page-level alignment, margins and header/footer zones
         # ============================================
-        is_scanned, scan_reason = self._is_likely_scanned_page(page)
-        
-        if is_scanned:
-            logging.info(f"Page {page_num + 1}: Detected as scanned ({scan_reason})")
-            # Prefer RapidDoc for structured output (headings, tables, reading order)
-            if RAPIDDOC_AVAILABLE:
-                logging.info(f"Page {page_num + 1}: Using RapidDoc for structured OCR translation")
-                return self._translate_scanned_page_rapiddoc(
-                    new_doc, page, page_num, translator,
-                    text_color, ocr_language
-                )
-            else:
-                logging.info(f"Page {page_num + 1}: Using RapidOCR translation mode (RapidDoc not available)")
-                return self._translate_scanned_page(
-                    new_doc, page, page_num, translator, 
-                    text_color, ocr_language
-                )
-        
-        text_dict = page.get_text("dict", sort=True)
-        
-        # ============================================
-        # PHASE 0b: Detect page-level alignment, margins and header/footer zones
-        # ============================================
-        page_alignment = _detect_page_alignment(text_dict, page.rect.width)
+        page_alignment = analysis.memo(
+            "alignment", lambda: _detect_page_alignment(text_dict, page.rect.width)
+        )
         
         # Detect header/footer zones (top/bottom 8% of page)
         page_height = page.rect.height
@@ -1623,20 +2255,22 @@ class PDFProcessor:
         
         # Collect ALL areas to redact (will be applied in bulk before insertions)
         areas_to_redact = []
-        # Collect all translations to insert (after redaction)
-        translations_to_insert = []
+        # Collect every segment on the page; translated in one batch before insertion
+        segments: List[str] = []
+        # Segment class drives the decoding effort (see DecodingProfile)
+        segment_classes: Dict[str, str] = {}
         
-        translated_count = 0
         total_blocks = len([b for b in text_dict.get("blocks", []) if "lines" in b])
         
         logging.info(f"Page {page_num + 1}: Found {total_blocks} text blocks to process (preserve_line_breaks={preserve_line_breaks})")
         
         # ============================================
-        # PHASE 0c: Detect and translate tables
+        # PHASE 0c: Detect tables and collect their cells
         # ============================================
         table_rects = []  # List of pymupdf.Rect for table areas to skip in block processing
+        table_jobs = []  # (tab_idx, tab, tab_rect, cells_data) resolved after translation
         try:
-            tables = page.find_tables()
+            tables = analysis.tables()
             if tables.tables:
                 logging.info(f"Page {page_num + 1}: Found {len(tables.tables)} tables")
                 for tab_idx, tab in enumerate(tables.tables):
@@ -1648,84 +2282,20 @@ class PDFProcessor:
                     if not cells_data:
                         continue
                     
-                    # Translate each cell
-                    translated_cells = []
+                    # Queue each cell for translation
                     for row in cells_data:
-                        translated_row = []
                         for cell in row:
                             if cell and cell.strip():
-                                try:
-                                    cell_trans = translator.translate(cell.strip())
-                                    translated_row.append(cell_trans if cell_trans else cell)
-                                except Exception:
-                                    translated_row.append(cell)
-                            else:
-                                translated_row.append(cell or "")
-                        translated_cells.append(translated_row)
+                                segments.append(cell.strip())
+                                segment_classes.setdefault(cell.strip(), 'cell')
                     
                     # Redact the table area
                     areas_to_redact.append(tuple(tab_rect))
-                    
-                    # We'll insert the translated table as text after redaction
-                    # Calculate cell positions from the table structure
-                    num_rows = tab.row_count
-                    num_cols = tab.col_count
-                    
-                    if num_rows > 0 and num_cols > 0:
-                        cell_height = (tab_rect.height) / num_rows
-                        cell_width = (tab_rect.width) / num_cols
-                        
-                        for r_idx, row in enumerate(translated_cells):
-                            for c_idx, cell_text in enumerate(row):
-                                if not cell_text or not cell_text.strip():
-                                    continue
-                                
-                                # Calculate cell bbox
-                                cell_x0 = tab_rect.x0 + c_idx * cell_width + 2  # 2pt padding
-                                cell_y0 = tab_rect.y0 + r_idx * cell_height + 2
-                                cell_x1 = tab_rect.x0 + (c_idx + 1) * cell_width - 2
-                                cell_y1 = tab_rect.y0 + (r_idx + 1) * cell_height - 2
-                                
-                                cell_bbox = (cell_x0, cell_y0, cell_x1, cell_y1)
-                                
-                                # Estimate font size from cell height
-                                cell_font_size = min(10, max(6, cell_height * 0.5))
-                                
-                                # Create a synthetic LineFormatInfo for cell
-                                cell_line_info = LineFormatInfo(
-                                    text=cell_text,
-                                    spans=[],
-                                    merged_bbox=cell_bbox,
-                                    text_align='left',
-                                )
-                                
-                                translations_to_insert.append({
-                                    'line_info': cell_line_info,
-                                    'line_data': {
-                                        'text': cell_text,
-                                        'bboxes': [cell_bbox],
-                                        'merged_bbox': cell_bbox,
-                                        'avg_size': cell_font_size,
-                                        'is_bold': False,
-                                        'is_italic': False,
-                                        'is_serif': False,
-                                        'is_monospace': False,
-                                        'dominant_color': (0, 0, 0),
-                                        'rotation': 0,
-                                        'text_align': 'left',
-                                        'indent': 0,
-                                    },
-                                    'text': cell_text,
-                                    'formatted_html': cell_text,
-                                    'use_html': False,
-                                    'is_table_cell': True,
-                                })
-                                translated_count += 1
-                    
-                    logging.info(f"  Table {tab_idx}: {num_rows}x{num_cols} translated")
+                    table_jobs.append((tab_idx, tab, tab_rect, cells_data))
         except Exception as e:
-            logging.warning(f"Table detection/translation failed: {e}")
+            logging.warning(f"Table detection failed: {e}")
             table_rects = []
+            table_jobs = []
         
         # ============================================
         # PHASE 0: Pre-merge single-line blocks into paragraph groups
@@ -1745,18 +2315,17 @@ class PDFProcessor:
             avoid_rects = [pymupdf.Rect(tr) for tr in table_rects] if table_rects else None
             
             try:
-                text_rects = column_boxes(
-                    page,
+                text_rects = self._column_rects(
+                    analysis,
                     footer_margin=page_height * 0.08,   # 8% footer zone
                     header_margin=page_height * 0.08,    # 8% header zone
-                    no_image_text=True,
                     avoid=avoid_rects,
                 )
                 
                 # For each column rect, extract text blocks and build paragraph groups
                 merged_block_groups = []
                 for rect in text_rects:
-                    clip_dict = page.get_text("dict", clip=rect, sort=True)
+                    clip_dict = analysis.clip_dict(rect)
                     groups = self._merge_text_blocks(clip_dict, page_height)
                     merged_block_groups.extend(groups)
                 
@@ -1782,6 +2351,7 @@ class PDFProcessor:
         # ============================================
         # PHASE 1: Extract structure with SPAN-LEVEL formatting
         # ============================================
+        text_units: List[Dict[str, Any]] = []  # Paragraph/line units, resolved in PHASE 2d
         for group_idx, block_group in enumerate(merged_block_groups):
             # Collect lines_info from ALL blocks in this group
             lines_info: List[LineFormatInfo] = []
@@ -1947,9 +2517,10 @@ class PDFProcessor:
                 logging.debug(f"Block has {len(mixed_lines)} lines with mixed inline formatting")
             
             # ============================================
-            # PHASE 2: Translate - PARAGRAPH BY PARAGRAPH
+            # PHASE 2a: Collect segments - PARAGRAPH BY PARAGRAPH
             # ============================================
-            # Group lines into logical paragraphs, then translate each paragraph.
+            # Group lines into logical paragraphs; each paragraph becomes one
+            # segment. Translation happens once for the whole page (PHASE 2b).
             # A paragraph break occurs when:
             # - The previous line ends with sentence-ending punctuation (. ! ? :)
             # - There's a significant font size change (likely a heading)
@@ -1966,193 +2537,672 @@ class PDFProcessor:
                     if not para_lines:
                         continue
                     
-                    # Single line paragraph - translate directly
                     if len(para_lines) == 1:
+                        # Single line paragraph - list items keep their prefix untranslated
                         line_info = para_lines[0]
-                        try:
-                            # Check for list item: preserve prefix, translate body only
-                            prefix, body = _extract_list_prefix(line_info.text)
-                            if prefix:
-                                body_trans = translator.translate(body.strip())
-                                if not body_trans or not body_trans.strip():
-                                    body_trans = body
-                                line_trans = prefix + body_trans
-                            else:
-                                line_trans = translator.translate(line_info.text)
-                                if not line_trans or not line_trans.strip():
-                                    line_trans = line_info.text
-                            
-                            formatted_text = self._apply_span_formatting(
-                                line_info, line_trans, use_original_color
-                            )
-                            translations_to_insert.append({
-                                'line_info': line_info,
-                                'line_data': line_info.to_legacy_dict(),
-                                'text': line_trans,
-                                'formatted_html': formatted_text,
-                                'use_html': line_info.has_mixed_formatting
-                            })
-                            translated_count += 1
-                        except Exception as e:
-                            capture_exception(e, context={"operation": "translate_line"}, tags={"component": "pdf_processor"})
-                            logging.error(f"Line translation error: {e}")
-                            translations_to_insert.append({
-                                'line_info': line_info,
-                                'line_data': line_info.to_legacy_dict(),
-                                'text': line_info.text,
-                                'formatted_html': line_info.text,
-                                'use_html': False
-                            })
-                            translated_count += 1
+                        prefix, body = _extract_list_prefix(line_info.text)
+                        source = body.strip() if prefix else line_info.text
+                        text_units.append({
+                            'kind': 'line',
+                            'lines': para_lines,
+                            'prefix': prefix,
+                            'source': source,
+                        })
                     else:
-                        # Multi-line paragraph - translate together and insert in UNIFIED bbox
-                        # This prevents overlapping text by using one merged bbox for the whole paragraph
-                        
+                        # Multi-line paragraph - translated together, inserted in UNIFIED bbox
                         # Check if first line has a list prefix — preserve it
                         first_text = para_lines[0].text.strip()
                         list_prefix, first_body = _extract_list_prefix(first_text)
                         
                         if list_prefix:
                             # Join body of first line + rest of lines for translation
-                            para_text = first_body.strip() + " " + " ".join(li.text for li in para_lines[1:])
+                            source = first_body.strip() + " " + " ".join(li.text for li in para_lines[1:])
                         else:
-                            para_text = " ".join(li.text for li in para_lines)
-                        
-                        try:
-                            translated_para = translator.translate(para_text)
-                            
-                            if not translated_para or not translated_para.strip():
-                                # Fallback: translate each line separately
-                                for line_info in para_lines:
-                                    line_trans = translator.translate(line_info.text) or line_info.text
-                                    formatted_text = self._apply_span_formatting(
-                                        line_info, line_trans, use_original_color
-                                    )
-                                    translations_to_insert.append({
-                                        'line_info': line_info,
-                                        'line_data': line_info.to_legacy_dict(),
-                                        'text': line_trans,
-                                        'formatted_html': formatted_text,
-                                        'use_html': line_info.has_mixed_formatting
-                                    })
-                                    translated_count += 1
-                                continue
-                            
-                            # Re-prepend list prefix if present
-                            if list_prefix:
-                                translated_para = list_prefix + translated_para
-                            
-                            # NEW APPROACH: Insert ALL translated text in ONE unified bbox
-                            # This prevents overlap caused by text wrapping into adjacent line bboxes
-                            
-                            # Create unified bbox covering all lines in this paragraph
-                            all_bboxes = [li.merged_bbox for li in para_lines]
-                            unified_bbox = self._merge_bboxes(all_bboxes)
-                            
-                            # If we're processing a single block, use the original block bbox
-                            # This ensures we have the full height including empty lines
-                            if len(block_group) == 1:
-                                original_block_bbox = block_group[0]['bbox']
-                                # Use original bbox if it's larger (includes empty lines)
-                                if original_block_bbox[3] - original_block_bbox[1] > unified_bbox[3] - unified_bbox[1]:
-                                    unified_bbox = (
-                                        unified_bbox[0],  # Keep calculated x0
-                                        original_block_bbox[1],  # Use original y0
-                                        unified_bbox[2],  # Keep calculated x1
-                                        original_block_bbox[3]   # Use original y1
-                                    )
-                            
-                            # IMPORTANT: Add ALL original line bboxes to redaction list
-                            # This ensures all original text is removed before inserting translation
-                            for li in para_lines:
-                                for span in li.spans:
-                                    areas_to_redact.append(span.bbox)
-                            
-                            # Use first line's formatting as the paragraph style
-                            first_line = para_lines[0]
-                            
-                            # Create a synthetic LineFormatInfo with unified bbox
-                            unified_line_info = LineFormatInfo(
-                                text=para_text,
-                                spans=first_line.spans,  # Use first line's formatting
-                                merged_bbox=unified_bbox,
-                                rotation=first_line.rotation,
-                                wmode=first_line.wmode
-                            )
-                            
-                            # Apply formatting to translated paragraph
-                            formatted_para = self._apply_span_formatting(
-                                first_line, translated_para, use_original_color
-                            )
-                            
-                            # Insert as single paragraph translation
-                            translations_to_insert.append({
-                                'line_info': unified_line_info,
-                                'line_data': unified_line_info.to_legacy_dict(),
-                                'text': translated_para,
-                                'formatted_html': formatted_para,
-                                'use_html': first_line.has_mixed_formatting,
-                                'is_paragraph': True  # Mark as unified paragraph
-                            })
-                            translated_count += 1  # Count as one translated unit
-                        
-                        except Exception as e:
-                            capture_exception(e, context={"operation": "translate_paragraph"}, tags={"component": "pdf_processor"})
-                            logging.error(f"Paragraph translation error: {e}")
-                            # Fallback: translate each line separately
-                            for line_info in para_lines:
-                                try:
-                                    line_trans = translator.translate(line_info.text) or line_info.text
-                                    formatted_text = self._apply_span_formatting(
-                                        line_info, line_trans, use_original_color
-                                    )
-                                    translations_to_insert.append({
-                                        'line_info': line_info,
-                                        'line_data': line_info.to_legacy_dict(),
-                                        'text': line_trans,
-                                        'formatted_html': formatted_text,
-                                        'use_html': line_info.has_mixed_formatting
-                                    })
-                                    translated_count += 1
-                                except Exception:
-                                    translations_to_insert.append({
-                                        'line_info': line_info,
-                                        'line_data': line_info.to_legacy_dict(),
-                                        'text': line_info.text,
-                                        'formatted_html': line_info.text,
-                                        'use_html': False
-                                    })
-                                    translated_count += 1
+                            source = " ".join(li.text for li in para_lines)
+                        text_units.append({
+                            'kind': 'paragraph',
+                            'lines': para_lines,
+                            'prefix': list_prefix,
+                            'source': source,
+                            'block_group': block_group,
+                        })
+                    source = text_units[-1]['source']
+                    segments.append(source)
+                    if len(para_lines) == 1 and self._is_heading_by_font_size(para_lines[0].avg_size):
+                        segment_classes.setdefault(source, 'heading')
+                    elif len(para_lines) > 1:
+                        segment_classes.setdefault(source, 'body')
             else:
                 # LEGACY MODE: Translate entire block, then redistribute
                 # (Kept for backward compatibility, but not recommended)
-                block_full_text = [li.text for li in lines_info]
-                block_text = " ".join(block_full_text)
+                block_text = " ".join(li.text for li in lines_info)
                 
                 logging.debug(f"Block has {len(lines_info)} lines, text: {block_text[:100]}...")
                 
+                text_units.append({
+                    'kind': 'block',
+                    'lines': lines_info,
+                    'prefix': None,
+                    'source': block_text,
+                })
+                segments.append(block_text)
+        
+        return {
+            'segments': segments,
+            'segment_classes': segment_classes,
+            'text_units': text_units,
+            'table_jobs': table_jobs,
+            'areas_to_redact': areas_to_redact,
+            'total_blocks': total_blocks,
+        }
+    
+    def triage(
+        self,
+        pages: Optional[List[int]] = None,
+        workers: Optional[int] = None,
+        config: TriageConfig = DEFAULT_TRIAGE_CONFIG,
+    ) -> TriageReport:
+        """
+        Fast pass classifying pages before a batch (see page_triage.py).
+        
+        For every page: scan verdict and reason, image coverage, word
+        count, table likelihood (from ruling lines, without find_tables()),
+        column count (column_boxes()), blank detection on a low-DPI
+        thumbnail and an estimated processing time from the measured
+        per-class throughput. No OCR and no translation run.
+        
+        With workers > 1 the pages are split over worker processes, each
+        opening its own copy of the document. The scan verdicts found are
+        kept, so translating the pages afterwards does not detect them
+        again, and the page classes feed the throughput measurements.
+        
+        Args:
+            pages: Pages to triage (default: all pages)
+            workers: Worker processes (default: one per CPU, at most one
+                per _TRIAGE_PAGES_PER_WORKER pages)
+            config: Thresholds of the classification
+        
+        Returns:
+            TriageReport with one PageTriage per page, in page order
+        """
+        t0 = time.time()
+        pages = list(range(self.page_count)) if pages is None else list(pages)
+        workers = min(workers or available_cpus(), max(1, len(pages) // _TRIAGE_PAGES_PER_WORKER))
+        
+        if workers <= 1:
+            entries = self._triage_pages(pages, config)
+        else:
+            entries = []
+            # Interleaved slices: scanned and native pages usually come in runs
+            slices = [pages[start::workers * 4] for start in range(min(len(pages), workers * 4))]
+            context = multiprocessing.get_context(default_start_method())
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+                futures = {
+                    executor.submit(_triage_pages_in_worker, self.pdf_path, page_slice, config): page_slice
+                    for page_slice in slices
+                }
+                for future in as_completed(futures):
+                    try:
+                        entries.extend(future.result())
+                    except Exception as e:
+                        capture_exception(e, context={
+                            "operation": "triage_worker",
+                            "pages": futures[future],
+                            "workers": workers,
+                        }, tags={"component": "pdf_processor"})
+                        logging.warning(f"Triage worker failed, triaging its {len(futures[future])} page(s) here: {e}")
+                        entries.extend(self._triage_pages(futures[future], config))
+            order = {page_num: index for index, page_num in enumerate(pages)}
+            entries.sort(key=lambda entry: order[entry.page_num])
+        
+        throughput = get_throughput_model()
+        for entry in entries:
+            entry.estimated_seconds = throughput.estimate(entry.page_class)
+            self._page_classes[entry.page_num] = entry.page_class
+            if not entry.reason.startswith("triage_failed"):
+                self._scan_verdicts.setdefault(entry.page_num, (entry.scanned, entry.reason))
+        
+        report = TriageReport(pages=entries, workers=workers, elapsed=time.time() - t0)
+        logging.info(f"Triage: {report.summary()}")
+        return report
+    
+    def _triage_pages(self, pages: List[int], config: TriageConfig = DEFAULT_TRIAGE_CONFIG) -> List[PageTriage]:
+        """_triage_page() of each page; a page that cannot be read is reported as native."""
+        entries = []
+        for page_num in pages:
+            try:
+                entries.append(self._triage_page(page_num, config))
+            except Exception as e:
+                logging.warning(f"Page {page_num + 1}: triage failed: {e}")
+                entries.append(PageTriage(page_num, "native", False, f"triage_failed ({e})"))
+        return entries
+    
+    def _triage_page(self, page_num: int, config: TriageConfig = DEFAULT_TRIAGE_CONFIG) -> PageTriage:
+        """Classification of one source page for triage()."""
+        with self.mupdf_lock:
+            analysis = self.page_analysis(page_num)
+            page = analysis.page
+            scanned, reason = self._page_scan_verdict(page_num)
+            image_coverage = analysis.memo("image_coverage", lambda: self._image_coverage(page))[0]
+            word_count = len(analysis.words())
+            ink_ratio = _thumbnail_ink_ratio(page, config)
+            
+            scan_dpi = None
+            tables = 0.0
+            columns = None
+            if scanned:
+                scan = find_scan_image(page)
+                scan_dpi = scan.dpi if scan else None
+            elif word_count:
+                tables = _table_likelihood(analysis.drawings(), config)
+                if COLUMN_BOXES_AVAILABLE:
+                    margin = page.rect.height * 0.08  # zones of _collect_page_segments
+                    try:
+                        columns = _column_count(
+                            self._column_rects(analysis, footer_margin=margin, header_margin=margin)
+                        )
+                    except Exception as e:
+                        logging.debug(f"Page {page_num + 1}: column_boxes failed during triage: {e}")
+        
+        page_class = _classify_page(scanned, word_count, ink_ratio, tables, columns, config)
+        return PageTriage(
+            page_num=page_num,
+            page_class=page_class,
+            scanned=scanned,
+            reason=reason,
+            image_coverage=image_coverage,
+            word_count=word_count,
+            table_likelihood=tables,
+            columns=columns,
+            ink_ratio=ink_ratio,
+            blank=page_class == "blank",
+            scan_dpi=scan_dpi,
+        )
+    
+    def _page_class(self, page_num: int) -> str:
+        """Triage class of a page, or "scanned"/"native" from its scan verdict."""
+        page_class = self._page_classes.get(page_num)
+        if page_class is None:
+            page_class = "scanned" if self._page_scan_verdict(page_num)[0] else "native"
+        return page_class
+    
+    def plan_translation(
+        self,
+        translator,
+        pages: Optional[List[int]] = None,
+        preserve_line_breaks: bool = True,
+        decoding_profile: Optional[str] = None,
+    ) -> TranslationPlan:
+        """
+        Document-level pre-pass: translate each unique segment only once.
+        
+        Collects the segments of every requested native page (headers,
+        footers, table headers and clause titles recur on nearly every
+        page), deduplicates them and translates the unique ones in one
+        batched call. Pass the returned plan to translate_page() so the
+        per-page insertion phase resolves from it. Scanned pages are left
+        to translate_page, since their text is only known after OCR.
+        
+        Args:
+            translator: Translation engine instance
+            pages: Pages to plan (default: all pages)
+            preserve_line_breaks: Must match the translate_page() setting
+            decoding_profile: Decoding profile override ("fast", "balanced", "quality")
+            
+        Returns:
+            TranslationPlan with translations and deduplication statistics
+        """
+        t0 = time.time()
+        pages = list(range(self.page_count)) if pages is None else list(pages)
+        plan = TranslationPlan(pages=pages, preserve_line_breaks=preserve_line_breaks)
+        
+        occurrences: List[str] = []
+        segment_classes: Dict[str, str] = {}
+        for page_num in pages:
+            is_scanned, scan_reason = self._page_scan_verdict(page_num)
+            if is_scanned:
+                plan.skipped_pages[page_num] = scan_reason
+                continue
+            try:
+                analysis = self.page_analysis(page_num)
+                collected = self._collect_page_segments(
+                    analysis.page, page_num, preserve_line_breaks, analysis=analysis
+                )
+            except Exception as e:
+                logging.warning(f"Page {page_num + 1}: segment collection failed during planning: {e}")
+                plan.skipped_pages[page_num] = f"collection_failed ({e})"
+                continue
+            plan.collected[page_num] = collected
+            occurrences.extend(t for t in collected['segments'] if t and t.strip())
+            for text, segment_class in collected['segment_classes'].items():
+                segment_classes.setdefault(text, segment_class)
+        
+        plan.total_segments = len(occurrences)
+        plan.translations = _translate_segments(
+            translator, occurrences, classes=segment_classes, profile=decoding_profile
+        )
+        plan.unique_segments = len(plan.translations)
+        plan.elapsed = time.time() - t0
+        
+        logging.info(f"Translation plan: {plan.summary()}")
+        return plan
+    
+    def prepare_page(
+        self,
+        page_num: int,
+        translator,
+        preserve_line_breaks: bool = True,
+        decoding_profile: Optional[str] = None,
+    ) -> Tuple[TranslationPlan, Optional[Dict[str, Any]]]:
+        """
+        Run the part of translate_page() that does not write any document.
+        
+        Scan detection and segment collection (or OCR of a scanned page)
+        hold mupdf_lock only while they read the source; MT of the page's
+        segments runs without it. Pass the results to translate_page()
+        (plan=..., ocr_result=...) under the lock: the lock is then held
+        for insertion only, and viewers rendering the output document are
+        not kept waiting for the translation model.
+        
+        Args:
+            page_num: Page to prepare
+            translator: Translation engine instance
+            preserve_line_breaks: Must match the translate_page() setting
+            decoding_profile: Decoding profile override ("fast", "balanced", "quality")
+            
+        Returns:
+            (one-page TranslationPlan, ocr_page() result or None)
+        """
+        collected = None
+        with self.mupdf_lock:
+            is_scanned, _ = self._page_scan_verdict(page_num)
+            if not is_scanned:
+                analysis = self.page_analysis(page_num)
+                collected = self._collect_page_segments(
+                    analysis.page, page_num, preserve_line_breaks, analysis=analysis
+                )
+        
+        ocr_result = None
+        if is_scanned:
+            # Rendering takes the lock inside ocr_page(); inference does not
+            ocr_result = self.ocr_page(page_num)
+            segments, segment_classes = self._scanned_page_segments(ocr_result)
+        else:
+            segments, segment_classes = collected['segments'], collected['segment_classes']
+        
+        plan = TranslationPlan(
+            pages=[page_num],
+            preserve_line_breaks=preserve_line_breaks,
+            collected={page_num: collected} if collected is not None else {},
+        )
+        plan.translations = _translate_segments(
+            translator, segments, classes=segment_classes, profile=decoding_profile
+        )
+        return plan, ocr_result
+    
+    def translate_page(
+        self, 
+        page_num: int, 
+        translator,
+        text_color: Tuple[float, float, float] = (0, 0, 0),
+        use_original_color: bool = True,
+        preserve_font_style: bool = True,
+        preserve_line_breaks: bool = True,
+        ocr_language: str = "en",
+        plan: Optional[TranslationPlan] = None,
+        decoding_profile: Optional[str] = None,
+        ocr_result: Optional[Dict[str, Any]] = None,
+        into: Optional[pymupdf.Document] = None,
+    ) -> pymupdf.Document:
+        """
+        World-class translation system with maximum fidelity to original.
+        
+        Architecture:
+        1. Phase 0: Detect if page is scanned and needs OCR
+        2. Phase 1: Extract all text structure with SPAN-LEVEL formatting
+        3. Phase 2: Collect every segment on the page, translate them in one batch
+        4. Phase 3: Apply SPAN-LEVEL formatting to translated text
+        5. Phase 4: Remove ALL original text via redaction (clean slate)
+        6. Phase 5: Insert translations with inline formatting preserved
+        
+        For scanned pages:
+        - Uses RapidOCR for text extraction
+        - Creates clean page with translated text
+        
+        LINE-BY-LINE TRANSLATION (preserve_line_breaks=True):
+        This mode translates each line independently, preserving the original
+        document structure. This is crucial for:
+        - Titles and headings on separate lines
+        - Lists and bullet points
+        - Tables and structured content
+        - Poetry and formatted text
+        
+        SPAN-LEVEL FORMATTING:
+        Tracks formatting at the span level (individual text segments within a line).
+        This allows proper preservation of:
+        - Inline bold (e.g., "This is **important** text")
+        - Inline italic (e.g., "See the *definition* here")
+        - Mixed formatting within the same line
+        - Color changes for emphasis
+        
+        Args:
+            page_num: Page number to translate
+            translator: Translation engine instance
+            text_color: RGB color tuple for translated text (default black)
+            use_original_color: If True, use the original text color instead (default True)
+            preserve_font_style: If True, match original font family style
+            preserve_line_breaks: If True, translate line by line (default True)
+            ocr_language: Language code for OCR (default "en")
+            decoding_profile: Decoding profile for this page ("fast",
+                "balanced", "quality"; default: the translator's profile)
+            plan: Document-level TranslationPlan from plan_translation()
+                or prepare_page(); segments found in it (scanned pages
+                included) are not translated again
+            ocr_result: OCR output from ocr_page() for scanned pages (the
+                page pipeline runs OCR ahead); None runs OCR here
+            into: Whole-document copy from copy_document() (or a
+                TranslatedPageStore); page page_num of it is translated in
+                place instead of a new document. A page the store already
+                holds a translation of is first restored from the source
+                (a plain Document must hold the untranslated page)
+            
+        Returns:
+            New document containing translated page (into, if given)
+        """
+        WHITE = pymupdf.pdfcolor["white"]
+        
+        if into is not None:
+            new_doc = _output_document(into)
+            if isinstance(into, TranslatedPageStore) and page_num in into:
+                # Translating again (e.g. another target language): start
+                # from the source page, not on top of the earlier translation
+                self._replace_page(new_doc, page_num, self._page_bytes(self.document, page_num))
+            page = new_doc[page_num]
+        else:
+            new_doc = pymupdf.open()
+            new_doc.insert_pdf(self.document, from_page=page_num, to_page=page_num)
+            page = new_doc[0]
+        
+        # ============================================
+        # PHASE 0: Check if page is scanned (needs OCR)
+        # ============================================
+        # The page is a copy of source page page_num: its analysis is shared
+        is_scanned, scan_reason = self._page_scan_verdict(page_num)
+        
+        if is_scanned:
+            logging.info(f"Page {page_num + 1}: Detected as scanned ({scan_reason})")
+            # Prefer RapidDoc for structured output (headings, tables, reading order)
+            if RAPIDDOC_AVAILABLE:
+                logging.info(f"Page {page_num + 1}: Using RapidDoc for structured OCR translation")
+                return self._translate_scanned_page_rapiddoc(
+                    new_doc, page, page_num, translator,
+                    text_color, ocr_language,
+                    decoding_profile=decoding_profile,
+                    ocr_result=ocr_result,
+                    known=plan.translations if plan else None,
+                )
+            else:
+                logging.info(f"Page {page_num + 1}: Using RapidOCR translation mode (RapidDoc not available)")
+                return self._translate_scanned_page(
+                    new_doc, page, page_num, translator, 
+                    text_color, ocr_language,
+                    decoding_profile=decoding_profile,
+                    ocr_result=ocr_result,
+                    known=plan.translations if plan else None,
+                )
+        
+        # ============================================
+        # PHASES 0b-2a: Collect structure and segments (read-only)
+        # ============================================
+        collected = plan.take_collected(page_num, preserve_line_breaks) if plan else None
+        if collected is None:
+            collected = self._collect_page_segments(
+                page, page_num, preserve_line_breaks, analysis=self.page_analysis(page_num)
+            )
+        areas_to_redact = collected['areas_to_redact']
+        table_jobs = collected['table_jobs']
+        text_units = collected['text_units']
+        segments = collected['segments']
+        segment_classes = collected['segment_classes']
+        total_blocks = collected['total_blocks']
+        
+        # Collect all translations to insert (after redaction)
+        translations_to_insert = []
+        translated_count = 0
+        
+        # ============================================
+        # PHASE 2b: Translate all page segments in one batched call
+        # ============================================
+        translations = _translate_segments(
+            translator, segments, known=plan.translations if plan else None,
+            classes=segment_classes, profile=decoding_profile,
+        )
+        logging.info(
+            f"Page {page_num + 1}: Resolved {len(translations)} unique segments "
+            f"({len(segments)} collected)"
+        )
+        
+        def queue_line(line_info: LineFormatInfo, line_trans: str) -> None:
+            """Queue a single translated line for insertion."""
+            formatted_text = self._apply_span_formatting(
+                line_info, line_trans, use_original_color
+            )
+            translations_to_insert.append({
+                'line_info': line_info,
+                'line_data': line_info.to_legacy_dict(),
+                'text': line_trans,
+                'formatted_html': formatted_text,
+                'use_html': line_info.has_mixed_formatting
+            })
+        
+        def queue_lines_separately(lines: List[LineFormatInfo]) -> int:
+            """Fallback: translate and queue each line on its own."""
+            line_translations = _translate_segments(
+                translator, [li.text for li in lines], profile=decoding_profile
+            )
+            for line_info in lines:
+                queue_line(line_info, line_translations.get(line_info.text) or line_info.text)
+            return len(lines)
+        
+        # ============================================
+        # PHASE 2c: Resolve tables from the batch
+        # ============================================
+        for tab_idx, tab, tab_rect, cells_data in table_jobs:
+            translated_cells = []
+            for row in cells_data:
+                translated_row = []
+                for cell in row:
+                    if cell and cell.strip():
+                        cell_trans = translations.get(cell.strip())
+                        translated_row.append(cell_trans if cell_trans else cell)
+                    else:
+                        translated_row.append(cell or "")
+                translated_cells.append(translated_row)
+            
+            # We'll insert the translated table as text after redaction
+            # Calculate cell positions from the table structure
+            num_rows = tab.row_count
+            num_cols = tab.col_count
+            
+            if num_rows > 0 and num_cols > 0:
+                cell_height = (tab_rect.height) / num_rows
+                cell_width = (tab_rect.width) / num_cols
+                
+                for r_idx, row in enumerate(translated_cells):
+                    for c_idx, cell_text in enumerate(row):
+                        if not cell_text or not cell_text.strip():
+                            continue
+                        
+                        # Calculate cell bbox
+                        cell_x0 = tab_rect.x0 + c_idx * cell_width + 2  # 2pt padding
+                        cell_y0 = tab_rect.y0 + r_idx * cell_height + 2
+                        cell_x1 = tab_rect.x0 + (c_idx + 1) * cell_width - 2
+                        cell_y1 = tab_rect.y0 + (r_idx + 1) * cell_height - 2
+                        
+                        cell_bbox = (cell_x0, cell_y0, cell_x1, cell_y1)
+                        
+                        # Estimate font size from cell height
+                        cell_font_size = min(10, max(6, cell_height * 0.5))
+                        
+                        # Create a synthetic LineFormatInfo for cell
+                        cell_line_info = LineFormatInfo(
+                            text=cell_text,
+                            spans=[],
+                            merged_bbox=cell_bbox,
+                            text_align='left',
+                        )
+                        
+                        translations_to_insert.append({
+                            'line_info': cell_line_info,
+                            'line_data': {
+                                'text': cell_text,
+                                'bboxes': [cell_bbox],
+                                'merged_bbox': cell_bbox,
+                                'avg_size': cell_font_size,
+                                'is_bold': False,
+                                'is_italic': False,
+                                'is_serif': False,
+                                'is_monospace': False,
+                                'dominant_color': (0, 0, 0),
+                                'rotation': 0,
+                                'text_align': 'left',
+                                'indent': 0,
+                            },
+                            'text': cell_text,
+                            'formatted_html': cell_text,
+                            'use_html': False,
+                            'is_table_cell': True,
+                        })
+                        translated_count += 1
+            
+            logging.info(f"  Table {tab_idx}: {num_rows}x{num_cols} translated")
+        
+        # ============================================
+        # PHASE 2d: Resolve paragraphs and lines from the batch
+        # ============================================
+        for unit in text_units:
+            kind = unit['kind']
+            unit_lines = unit['lines']
+            translated = translations.get(unit['source'])
+            
+            if kind == 'line':
+                line_info = unit_lines[0]
                 try:
-                    translated_block = translator.translate(block_text)
+                    if unit['prefix']:
+                        body_trans = translated
+                        if not body_trans or not body_trans.strip():
+                            body_trans = unit['source']
+                        line_trans = unit['prefix'] + body_trans
+                    else:
+                        line_trans = translated
+                        if not line_trans or not line_trans.strip():
+                            line_trans = line_info.text
+                    queue_line(line_info, line_trans)
+                    translated_count += 1
+                except Exception as e:
+                    capture_exception(e, context={"operation": "translate_line"}, tags={"component": "pdf_processor"})
+                    logging.error(f"Line translation error: {e}")
+                    translations_to_insert.append({
+                        'line_info': line_info,
+                        'line_data': line_info.to_legacy_dict(),
+                        'text': line_info.text,
+                        'formatted_html': line_info.text,
+                        'use_html': False
+                    })
+                    translated_count += 1
+            
+            elif kind == 'paragraph':
+                para_lines = unit_lines
+                block_group = unit['block_group']
+                try:
+                    if not translated or not translated.strip():
+                        # Fallback: translate each line separately
+                        translated_count += queue_lines_separately(para_lines)
+                        continue
                     
-                    if not translated_block or not translated_block.strip():
-                        # Fallback to line by line
-                        for line_info in lines_info:
-                            line_trans = translator.translate(line_info.text) or line_info.text
-                            formatted_text = self._apply_span_formatting(
-                                line_info, line_trans, use_original_color
+                    # Re-prepend list prefix if present
+                    translated_para = translated
+                    if unit['prefix']:
+                        translated_para = unit['prefix'] + translated_para
+                    
+                    # Insert ALL translated text in ONE unified bbox
+                    # This prevents overlap caused by text wrapping into adjacent line bboxes
+                    
+                    # Create unified bbox covering all lines in this paragraph
+                    all_bboxes = [li.merged_bbox for li in para_lines]
+                    unified_bbox = self._merge_bboxes(all_bboxes)
+                    
+                    # If we're processing a single block, use the original block bbox
+                    # This ensures we have the full height including empty lines
+                    if len(block_group) == 1:
+                        original_block_bbox = block_group[0]['bbox']
+                        # Use original bbox if it's larger (includes empty lines)
+                        if original_block_bbox[3] - original_block_bbox[1] > unified_bbox[3] - unified_bbox[1]:
+                            unified_bbox = (
+                                unified_bbox[0],  # Keep calculated x0
+                                original_block_bbox[1],  # Use original y0
+                                unified_bbox[2],  # Keep calculated x1
+                                original_block_bbox[3]   # Use original y1
                             )
-                            translations_to_insert.append({
-                                'line_info': line_info,
-                                'line_data': line_info.to_legacy_dict(),
-                                'text': line_trans,
-                                'formatted_html': formatted_text,
-                                'use_html': line_info.has_mixed_formatting
-                            })
-                            translated_count += 1
+                    
+                    # IMPORTANT: Add ALL original line bboxes to redaction list
+                    # This ensures all original text is removed before inserting translation
+                    for li in para_lines:
+                        for span in li.spans:
+                            areas_to_redact.append(span.bbox)
+                    
+                    # Use first line's formatting as the paragraph style
+                    first_line = para_lines[0]
+                    
+                    # Create a synthetic LineFormatInfo with unified bbox
+                    unified_line_info = LineFormatInfo(
+                        text=unit['source'],
+                        spans=first_line.spans,  # Use first line's formatting
+                        merged_bbox=unified_bbox,
+                        rotation=first_line.rotation,
+                        wmode=first_line.wmode
+                    )
+                    
+                    # Apply formatting to translated paragraph
+                    formatted_para = self._apply_span_formatting(
+                        first_line, translated_para, use_original_color
+                    )
+                    
+                    # Insert as single paragraph translation
+                    translations_to_insert.append({
+                        'line_info': unified_line_info,
+                        'line_data': unified_line_info.to_legacy_dict(),
+                        'text': translated_para,
+                        'formatted_html': formatted_para,
+                        'use_html': first_line.has_mixed_formatting,
+                        'is_paragraph': True  # Mark as unified paragraph
+                    })
+                    translated_count += 1  # Count as one translated unit
+                
+                except Exception as e:
+                    capture_exception(e, context={"operation": "translate_paragraph"}, tags={"component": "pdf_processor"})
+                    logging.error(f"Paragraph translation error: {e}")
+                    # Fallback: insert each line untranslated rather than lose it
+                    for line_info in para_lines:
+                        translations_to_insert.append({
+                            'line_info': line_info,
+                            'line_data': line_info.to_legacy_dict(),
+                            'text': line_info.text,
+                            'formatted_html': line_info.text,
+                            'use_html': False
+                        })
+                        translated_count += 1
+            
+            else:
+                lines_info = unit_lines
+                try:
+                    if not translated or not translated.strip():
+                        # Fallback to line by line
+                        translated_count += queue_lines_separately(lines_info)
                         continue
                     
                     # Sentence-aware distribution
-                    translated_sentences = split_into_sentences(translated_block)
+                    translated_sentences = split_into_sentences(translated)
                     original_line_lengths = [len(li.text) for li in lines_info]
                     line_texts = align_sentences_to_lines(
                         translated_sentences,
@@ -2162,38 +3212,17 @@ class PDFProcessor:
                     
                     for line_info, line_text in zip(lines_info, line_texts):
                         if line_text.strip():
-                            formatted_text = self._apply_span_formatting(
-                                line_info, line_text, use_original_color
-                            )
-                            translations_to_insert.append({
-                                'line_info': line_info,
-                                'line_data': line_info.to_legacy_dict(),
-                                'text': line_text,
-                                'formatted_html': formatted_text,
-                                'use_html': line_info.has_mixed_formatting
-                            })
+                            queue_line(line_info, line_text)
                             translated_count += 1
                     
                 except Exception as e:
                     capture_exception(e, context={"operation": "translate_block"}, tags={"component": "pdf_processor"})
                     logging.error(f"Block translation error: {e}, using line-by-line fallback")
-                    for line_info in lines_info:
-                        try:
-                            line_trans = translator.translate(line_info.text)
-                            formatted_text = self._apply_span_formatting(
-                                line_info, line_trans or line_info.text, use_original_color
-                            )
-                            translations_to_insert.append({
-                                'line_info': line_info,
-                                'line_data': line_info.to_legacy_dict(),
-                                'text': line_trans or line_info.text,
-                                'formatted_html': formatted_text,
-                                'use_html': line_info.has_mixed_formatting
-                            })
-                            translated_count += 1
-                        except Exception as line_error:
-                            capture_exception(line_error, context={"operation": "translate_line_fallback"}, tags={"component": "pdf_processor"})
-                            logging.error(f"Line translation failed: {line_error}")
+                    try:
+                        translated_count += queue_lines_separately(lines_info)
+                    except Exception as line_error:
+                        capture_exception(line_error, context={"operation": "translate_line_fallback"}, tags={"component": "pdf_processor"})
+                        logging.error(f"Line translation failed: {line_error}")
         
         # ============================================
         # PHASE 3: Apply redactions (remove ALL original text)
@@ -2277,6 +3306,234 @@ class PDFProcessor:
         
         return new_doc
     
+    def translate_document(
+        self,
+        translator,
+        pages: Optional[List[int]] = None,
+        workers: Optional[int] = None,
+        plan: Optional[TranslationPlan] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        page_callback: Optional[Callable[[int, Optional[bytes]], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        pipeline: Optional[PipelineConfig] = DEFAULT_PIPELINE_CONFIG,
+        journal: Optional[JobJournal] = None,
+        into: Optional[pymupdf.Document] = None,
+        **page_options,
+    ) -> pymupdf.Document:
+        """
+        Translate several pages, in parallel worker processes if requested.
+        
+        In a single process the pages go through a PagePipeline: analysis
+        and OCR of the next page overlap translation and insertion of the
+        previous ones, and segments are deduplicated as pages flow (no
+        upfront plan is needed). pipeline=None translates page by page.
+        
+        Otherwise a document-level plan is built first (see plan_translation()). With
+        workers > 1 the pages are distributed over a TranslationWorkerPool:
+        each worker opens its own PyMuPDF handle on pdf_path (documents
+        cannot be shared across processes), shares the parent's model
+        weights and runs translate_page(). Pages complete out of order and
+        are reassembled in page order.
+        
+        Parallel mode needs a TranslationEngine; other translators (remote,
+        test doubles) translate the pages sequentially in this process.
+        
+        With a JobJournal, pages whose source content and settings match a
+        checkpoint are taken from the journal (and reported through the
+        callbacks like translated pages); every newly translated page is
+        checkpointed as soon as it completes.
+        
+        With into (a copy_document() of this document, or a
+        TranslatedPageStore), pages are translated
+        in place inside that one document: no per-page documents, no PDF
+        serialization per page, and images/fonts shared between pages stay
+        shared. Pages that come back as bytes (worker processes, journal)
+        replace their page in into.
+        
+        Args:
+            translator: Translation engine instance
+            pages: Pages to translate (default: all pages)
+            workers: Worker processes (default: LAC_PAGE_WORKERS or 1)
+            plan: Existing TranslationPlan (default: built for pages)
+            progress_callback: Called as (pages done, pages total) when a page
+                starts (sequential) or completes (parallel)
+            page_callback: Called as (page_num, pdf_bytes) for each translated
+                page, in completion order (pdf_bytes is None with into: the
+                page is already in into)
+            should_cancel: Polled between pages; True stops the translation
+            pipeline: Stage workers and queue size of the single-process
+                pipeline; None for strictly sequential pages
+            journal: Checkpoint journal to resume from and record into
+            into: Whole-document copy to translate the pages in place
+            **page_options: Passed to translate_page() (use_original_color,
+                preserve_line_breaks, ocr_language, decoding_profile, ...)
+            
+        Returns:
+            New document with the translated pages in page order (pages that
+            failed are left out); with into, into itself (every page, those
+            not translated unchanged)
+            
+        Raises:
+            ValueError: into is not a copy of this document
+        """
+        pages = list(range(self.page_count)) if pages is None else list(pages)
+        requested = pages
+        total = len(pages)
+        translated: Dict[int, Optional[bytes]] = {}
+        t0 = time.time()
+        
+        if into is not None and into.page_count != self.page_count:
+            raise ValueError(
+                f"Output document has {into.page_count} pages, expected {self.page_count} (use copy_document())"
+            )
+        
+        def deliver(page_num: int, pdf_bytes: Optional[bytes]) -> None:
+            if into is not None:
+                if pdf_bytes is not None:
+                    with self.mupdf_lock:
+                        self._replace_page(_output_document(into), page_num, pdf_bytes)
+                if isinstance(into, TranslatedPageStore):
+                    into.mark_translated(page_num)
+                pdf_bytes = None
+            translated[page_num] = pdf_bytes
+            if page_callback:
+                page_callback(page_num, pdf_bytes)
+        
+        if journal is not None:
+            job_settings = settings_hash(translator, page_options)
+            with self.mupdf_lock:
+                source_hashes = {p: page_source_hash(self.document, p) for p in pages}
+            resumed = set()
+            for page_num, pdf_bytes in journal.completed(source_hashes, job_settings):
+                deliver(page_num, pdf_bytes)
+                resumed.add(page_num)
+            pages = [p for p in pages if p not in resumed]
+            if resumed and progress_callback:
+                user_progress = progress_callback
+                progress_callback = lambda done, _: user_progress(len(resumed) + done, total)
+                user_progress(len(resumed), total)
+        workers = min(workers or default_page_workers(), max(1, len(pages)))
+        last_finished = time.time()
+        # Per-class seconds per page, for triage() estimates. The first page
+        # of a run also carries planning, model warm-up and pipeline or
+        # pool start-up, so only the pages after it are measured.
+        throughput = get_throughput_model()
+        first_page_done = False
+        
+        if workers > 1 and not isinstance(translator, TranslationEngine):
+            logging.info("Parallel page translation needs a local TranslationEngine, translating sequentially")
+            workers = 1
+        pipelined = workers <= 1 and pipeline is not None
+        
+        if plan is None and pages and not pipelined:
+            plan = self.plan_translation(
+                translator,
+                pages=pages,
+                preserve_line_breaks=page_options.get('preserve_line_breaks', True),
+                decoding_profile=page_options.get('decoding_profile'),
+            )
+        
+        def finished(page_num: int, pdf_bytes: Optional[bytes], in_place: bool = False) -> None:
+            nonlocal last_finished, first_page_done
+            if pdf_bytes is None and not in_place:
+                logging.warning(f"Page {page_num + 1}: translation returned no document")
+                return
+            if journal is not None and pdf_bytes is None:
+                with self.mupdf_lock:
+                    pdf_bytes = self._page_bytes(_output_document(into), page_num)
+            # Wall time since the previous page: per-page cost once pages overlap
+            now = time.time()
+            elapsed, last_finished = now - last_finished, now
+            if first_page_done:
+                throughput.observe(self._page_class(page_num), elapsed)
+            first_page_done = True
+            if journal is not None:
+                journal.record(page_num, source_hashes[page_num], job_settings, pdf_bytes, elapsed)
+                if in_place:
+                    pdf_bytes = None
+            deliver(page_num, pdf_bytes)
+        
+        if pipelined:
+            page_pipeline = PagePipeline(self, translator, config=pipeline, into=into, **page_options)
+            page_pipeline.run(
+                pages,
+                plan=plan,
+                progress_callback=progress_callback,
+                page_callback=lambda page_num, pdf_bytes: finished(page_num, pdf_bytes, in_place=pdf_bytes is None),
+                should_cancel=should_cancel,
+            )
+            logging.info(f"Page pipeline stages: {page_pipeline.stats()['stages']}")
+        elif workers <= 1:
+            # Layout/OCR of all scanned pages in batched RapidDoc calls
+            self.analyze_scanned_pages(pages)
+            for done, page_num in enumerate(pages):
+                if should_cancel and should_cancel():
+                    logging.info("Document translation cancelled")
+                    break
+                if progress_callback:
+                    progress_callback(done + 1, total)
+                if into is not None:
+                    with self.mupdf_lock:
+                        self.translate_page(page_num, translator, plan=plan, into=into, **page_options)
+                    finished(page_num, None, in_place=True)
+                    continue
+                translated_doc = self.translate_page(page_num, translator, plan=plan, **page_options)
+                finished(page_num, translated_doc.tobytes() if translated_doc else None)
+                if translated_doc:
+                    translated_doc.close()
+        else:
+            # Each task gets only its page's translations (workers recollect
+            # the page structure); worker engines are set up like translator
+            pool = TranslationWorkerPool(
+                translator.source_lang, translator.target_lang, workers=workers,
+                engine_options=translator.engine_options(),
+            )
+            try:
+                futures = {
+                    pool.submit(
+                        _translate_page_in_worker, self.pdf_path, page_num,
+                        plan.page_plan(page_num) if plan else None, page_options,
+                    ): page_num
+                    for page_num in pages
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    page_num = futures[future]
+                    try:
+                        finished(*future.result())
+                    except Exception as e:
+                        capture_exception(e, context={
+                            "operation": "translate_document_page",
+                            "page_num": page_num,
+                            "workers": workers,
+                        }, tags={"component": "pdf_processor"})
+                        logging.error(f"Page {page_num + 1}: translation failed in worker: {e}")
+                    if progress_callback:
+                        progress_callback(done, total)
+                    if should_cancel and should_cancel():
+                        logging.info("Document translation cancelled")
+                        break
+            finally:
+                pool.close(wait=False)
+        
+        logging.info(
+            f"Document translated: {len(translated)}/{total} pages with {workers} worker(s) "
+            f"in {time.time() - t0:.1f}s{' (in place)' if into is not None else ''}"
+        )
+        if len(translated) > len(requested) - len(pages):
+            throughput.save()
+        if into is not None:
+            return into
+        
+        # Reassemble in page order
+        result = pymupdf.open()
+        for page_num in requested:
+            pdf_bytes = translated.get(page_num)
+            if pdf_bytes is None:
+                continue
+            with pymupdf.open("pdf", pdf_bytes) as page_doc:
+                result.insert_pdf(page_doc)
+        return result
+    
     def _apply_span_formatting(
         self,
         line_info: LineFormatInfo,
@@ -3018,6 +4275,13 @@ class PDFProcessor:
         """Close document and free resources."""
         if self.document:
             self.document.close()
+        self._source_bytes = None
+        self._rapiddoc_results.clear()
+        self._page_hashes.clear()
+        self._rapidocr_boxes.clear()
+        self._page_analyses.clear()
+        self._scan_verdicts.clear()
+        self._page_classes.clear()
     
     @classmethod
     def get_ocr_language(cls, language_name: str) -> str:
@@ -1,23 +1,33 @@
 """
 Preprocessing robusto per pagine PDF da passare all'OCR (RapidOCR).
 
-Due modalità:
-- preprocess_page_from_pymupdf(page, ...): lavora direttamente sulla pagina PyMuPDF
-  (usato dalla pipeline interna, evita riscrittura su disco)
+Tre modalità:
+- preprocess_page_array(page, ...): lavora direttamente sulla pagina PyMuPDF
+  e restituisce un array NumPy per RapidOCR (usato dalla pipeline interna:
+  nessuna codifica/decodifica PNG)
+- preprocess_page_from_pymupdf(page, ...): come sopra, ma restituisce un PNG
 - preprocess_pdf_page(pdf_path, page_num, ...): apre il PDF da disco
   (usato dagli script standalone)
 
 Operazioni:
-1. Renderizza pagina a DPI target (default 300)
-2. Ritaglia bordi bianchi
-3. Se troppo grande, riduce DPI e riprova
+1. Pianifica area e DPI con un rendering di prova a bassa risoluzione:
+   contenuto non bianco, DPI target (default 300) ridotto se il lato
+   maggiore supererebbe MAX_SIDE
+2. Renderizza una sola volta l'area del contenuto al DPI scelto
+   (RGB o, opzionale, un solo canale in scala di grigi); se la pagina è
+   una scansione (una sola immagine incorporata) può invece decodificare
+   l'immagine alla sua risoluzione nativa quando il suo DPI è nella
+   finestra accettata
+3. Ritaglia esattamente i bordi bianchi (proiezioni su righe/colonne)
 4. Se troppo piccola, aggiunge padding bianco
-5. Image enhancement (contrasto + sharpening)
-6. Converte in PNG RGB pulito
+5. Image enhancement (contrasto con lookup table + sharpening)
+6. Converte in array (o PNG pulito)
 """
 import io
 import logging
 import tempfile
+from dataclasses import dataclass
+from typing import Optional
 
 import numpy as np
 import pymupdf
@@ -38,21 +48,60 @@ CONTRAST_FACTOR = 1.3    # Aumenta contrasto per migliorare rilevamento testo
 SHARPNESS_FACTOR = 1.5   # Leggero sharpening per bordi testo più nitidi
 
 
+# Rendering di prova per pianificare ritaglio e DPI (1 px = 3 pt)
+PROBE_DPI = 24
+# Soglia del rendering di prova: più alta di WHITE_THRESHOLD perché a bassa
+# risoluzione il testo sottile si schiarisce (meglio ritagliare un po' meno)
+PROBE_WHITE_THRESHOLD = 250
+# Margine attorno al contenuto trovato dal rendering di prova, in pixel di prova
+PROBE_MARGIN = 2
+
+# Scansioni: l'immagine incorporata deve coprire almeno questa frazione della pagina
+SCAN_IMAGE_MIN_COVERAGE = 0.9
+# L'immagine nativa si usa così com'è se il suo DPI sta in
+# [target, target * NATIVE_DPI_WINDOW], come optimal_scale() di
+# benchmark_glmocr.py; sotto viene ingrandita, sopra si renderizza la pagina
+NATIVE_DPI_WINDOW = 2.0
+
+
 # ---------------------------------------------------------------------------
 # Utilità immagine
 # ---------------------------------------------------------------------------
 
+def content_bounds(arr: np.ndarray, threshold: int = WHITE_THRESHOLD):
+    """
+    Riquadro (x0, y0, x1, y1) del contenuto non bianco di un array, None se
+    tutto bianco.
+
+    Usa le proiezioni su righe e colonne della maschera dei pixel scuri,
+    senza costruire l'array delle coordinate (np.argwhere) di milioni di
+    pixel. Per le immagini a colori un pixel è scuro se almeno un canale è
+    sotto soglia (ritaglia al più un po' meno della luminanza).
+    """
+    if arr.ndim == 3:
+        channels = arr.shape[2]
+        if channels == 1:
+            arr = arr[..., 0]
+        else:
+            # np.minimum canale per canale: molto più veloce di min(axis=2)
+            darkest = np.minimum(arr[..., 0], arr[..., 1])
+            for c in range(2, channels):
+                np.minimum(darkest, arr[..., c], out=darkest)
+            arr = darkest
+    dark = arr < threshold
+    rows = np.flatnonzero(dark.any(axis=1))
+    if rows.size == 0:
+        return None
+    cols = np.flatnonzero(dark.any(axis=0))
+    return int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1
+
+
 def crop_white_borders(pil_img: Image.Image, threshold: int = WHITE_THRESHOLD) -> Image.Image:
     """Ritaglia bordi bianchi attorno al contenuto."""
-    gray = pil_img.convert("L")
-    arr = np.array(gray)
-    mask = arr < threshold
-    if not mask.any():
+    bounds = content_bounds(np.asarray(pil_img.convert("L")), threshold)
+    if bounds is None:
         return pil_img  # tutto bianco, non toccare
-    coords = np.argwhere(mask)
-    y0, x0 = coords.min(axis=0)
-    y1, x1 = coords.max(axis=0) + 1
-    return pil_img.crop((x0, y0, x1, y1))
+    return pil_img.crop(bounds)
 
 
 def pad_to_min_size(pil_img: Image.Image, min_w: int = MIN_SIDE, min_h: int = MIN_SIDE) -> Image.Image:
@@ -78,36 +127,313 @@ def resize_if_too_large(pil_img: Image.Image, max_w: int = MAX_SIDE, max_h: int
     return pil_img.resize((new_w, new_h), Image.LANCZOS)
 
 
+def contrast_lut(mean: float, factor: float = CONTRAST_FACTOR) -> list:
+    """
+    Tabella di 256 valori equivalente a ImageEnhance.Contrast(factor).
+
+    PIL miscela l'immagine con un grigio uniforme pari alla luminanza
+    media: out = mean + factor * (v - mean), troncato e limitato a 0-255.
+    Applicata con Image.point() è un solo passaggio sull'immagine, senza
+    l'immagine grigia di appoggio.
+    """
+    mean = int(mean + 0.5)
+    values = mean + factor * (np.arange(256, dtype=np.float32) - mean)
+    return np.clip(np.trunc(values), 0, 255).astype(np.uint8).tolist()
+
+
+def _luma_mean(arr: np.ndarray) -> float:
+    """Luminanza media (come la media di PIL convert("L")) senza convertire l'immagine."""
+    pixels = arr.shape[0] * arr.shape[1]
+    if pixels == 0:
+        return 0.0
+    if arr.ndim == 2:
+        return float(arr.sum(dtype=np.uint64)) / pixels
+    r, g, b = (float(arr[..., c].sum(dtype=np.uint64)) / pixels for c in range(3))
+    return 0.299 * r + 0.587 * g + 0.114 * b
+
+
+def _enhance_array(arr: np.ndarray) -> np.ndarray:
+    """Contrasto (lookup table) + sharpening di un array RGB o a un canale."""
+    img = Image.fromarray(arr)
+    img = img.point(contrast_lut(_luma_mean(arr)) * len(img.getbands()))
+    img = ImageEnhance.Sharpness(img).enhance(SHARPNESS_FACTOR)
+    return np.asarray(img)
+
+
 # ---------------------------------------------------------------------------
-# Rendering pagina -> PIL Image
+# Rendering pagina -> array / PIL Image
 # ---------------------------------------------------------------------------
 
+def pixmap_to_array(pix: pymupdf.Pixmap) -> np.ndarray:
+    """
+    Array (H, W, n) uint8 sui campioni di un pixmap PyMuPDF.
+
+    np.frombuffer su pix.samples: nessuna codifica PNG e nessuna copia
+    oltre a quella dei campioni. L'array è in sola lettura.
+    """
+    rows = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)
+    return rows[:, :pix.width * pix.n].reshape(pix.height, pix.width, pix.n)
+
+
 def _render_page_to_pil(page: pymupdf.Page, dpi: int = DEFAULT_DPI) -> Image.Image:
     """Renderizza una pagina PyMuPDF come PIL Image RGB."""
     scale = dpi / 72.0
     mat = pymupdf.Matrix(scale, scale)
     pix = page.get_pixmap(matrix=mat, alpha=False)
-    return Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+    return Image.fromarray(pixmap_to_array(pix), "RGB")
 
 
-# ---------------------------------------------------------------------------
-# Pipeline preprocessing completa
-# ---------------------------------------------------------------------------
+def plan_render(
+    page: pymupdf.Page,
+    dpi: int = DEFAULT_DPI,
+    crop_borders: bool = True,
+    max_size: int = MAX_SIDE,
+) -> tuple:
+    """
+    Sceglie area e DPI del rendering prima di renderizzare la pagina.
+
+    Un rendering di prova a PROBE_DPI in scala di grigi (pochi KB) trova
+    il contenuto non bianco; il DPI viene ridotto quanto basta perché il
+    lato maggiore di quell'area stia in max_size. Così la pagina viene
+    renderizzata una sola volta, già ritagliata e alla dimensione finale,
+    invece di renderizzarla intera e ridurla (o ri-renderizzarla) dopo.
+
+    Returns:
+        Tuple (clip, dpi): clip è un pymupdf.Rect in coordinate pagina
+        (None = pagina intera), dpi un float <= dpi richiesto
+    """
+    clip = None
+    area = page.rect
+    # Con pagine ruotate il clip andrebbe convertito: si renderizza tutto
+    if crop_borders and page.rotation == 0:
+        probe_scale = PROBE_DPI / 72.0
+        probe = page.get_pixmap(
+            matrix=pymupdf.Matrix(probe_scale, probe_scale),
+            colorspace=pymupdf.csGRAY,
+            alpha=False,
+        )
+        bounds = content_bounds(pixmap_to_array(probe), PROBE_WHITE_THRESHOLD)
+        if bounds is not None:
+            x0, y0, x1, y1 = bounds
+            clip = pymupdf.Rect(
+                (x0 - PROBE_MARGIN) / probe_scale, (y0 - PROBE_MARGIN) / probe_scale,
+                (x1 + PROBE_MARGIN) / probe_scale, (y1 + PROBE_MARGIN) / probe_scale,
+            ) + (area.x0, area.y0, area.x0, area.y0)
+            clip &= area
+            if clip.is_empty:
+                clip = None
+            else:
+                area = clip
+
+    longest = max(area.width, area.height)
+    if longest > 0:
+        # -1: il rendering arrotonda i bordi del riquadro verso l'esterno
+        dpi = min(float(dpi), (max_size - 1) * 72.0 / longest)
+    return clip, dpi
+
+
+@dataclass(frozen=True)
+class ScanImage:
+    """Immagine incorporata che da sola costituisce una pagina scansionata."""
+    xref: int
+    rect: pymupdf.Rect  # posizione sulla pagina
+    width: int          # pixel nativi
+    height: int
+    dpi: float          # risoluzione nativa sulla pagina
+
+
+def find_scan_image(page: pymupdf.Page, min_coverage: float = SCAN_IMAGE_MIN_COVERAGE) -> Optional[ScanImage]:
+    """
+    L'immagine incorporata di una pagina scansionata, None se la pagina non
+    è "una sola grande immagine".
+
+    Accetta solo il caso semplice: un'immagine, posizionata una volta,
+    dritta (né ruotata né ribaltata), senza soft mask, su una pagina non
+    ruotata, che copre almeno min_coverage della pagina. Così i pixel
+    nativi sono esattamente ciò che il rendering mostrerebbe.
+    """
+    if page.rotation != 0:
+        return None
+    images = page.get_images(full=True)
+    if len(images) != 1:
+        return None
+    xref, smask, width, height, _bpc, colorspace = images[0][:6]
+    # Senza colorspace è una maschera (ImageMask), non una scansione
+    if smask or not colorspace or width <= 0 or height <= 0:
+        return None
+    # Posizionamenti letti dal contenuto della pagina (immagini inline
+    # comprese): get_image_rects() decodificherebbe l'immagine per
+    # calcolarne l'hash
+    placements = page.get_image_info()
+    if len(placements) != 1:
+        return None
+    rect = pymupdf.Rect(placements[0]["bbox"])
+    matrix = pymupdf.Matrix(placements[0]["transform"])
+    if matrix.b != 0 or matrix.c != 0 or matrix.a <= 0 or matrix.d <= 0:
+        return None
+    page_rect = page.rect
+    covered = pymupdf.Rect(rect) & page_rect
+    if covered.is_empty or covered.get_area() < min_coverage * page_rect.get_area():
+        return None
+    dpi = min(width * 72.0 / rect.width, height * 72.0 / rect.height)
+    return ScanImage(xref, pymupdf.Rect(rect), width, height, dpi)
+
+
+def native_page_array(
+    page: pymupdf.Page,
+    scan: ScanImage,
+    target_dpi: float,
+    max_dpi: Optional[float] = None,
+    grayscale: bool = False,
+) -> Optional[tuple]:
+    """
+    Decodifica l'immagine di una pagina scansionata alla sua risoluzione.
+
+    Nessun rendering della pagina: i pixel vengono decodificati una volta
+    dall'xref (JPEG, JBIG2, CCITT, ...) e usati così come sono se il DPI
+    nativo sta in [target_dpi, max_dpi], ingranditi al DPI target se sono
+    meno. Sopra max_dpi restituisce None: il rendering di MuPDF decodifica
+    i JPEG già ridotti (scala DCT), molto più veloce che decodificarli a
+    piena risoluzione e poi ricampionarli.
+
+    Args:
+        page: Pagina che contiene l'immagine
+        scan: Risultato di find_scan_image(page)
+        target_dpi: DPI minimo; sotto, l'immagine viene ingrandita
+        max_dpi: DPI massimo usato senza rendering
+            (default: target_dpi * NATIVE_DPI_WINDOW)
+        grayscale: Un solo canale (H, W) invece di RGB
+
+    Returns:
+        Tuple (array uint8, matrice pixel -> coordinate pagina, DPI usato),
+        None se conviene renderizzare la pagina
+    """
+    if max_dpi is None:
+        max_dpi = target_dpi * NATIVE_DPI_WINDOW
+    # Tolleranza: rect dell'immagine e DPI nominale differiscono per arrotondamenti
+    if scan.dpi > max_dpi + 0.5:
+        return None
+
+    pix = pymupdf.Pixmap(page.parent, scan.xref)
+    if pix.alpha:
+        pix = pymupdf.Pixmap(pix, 0)
+    colorspace = pymupdf.csGRAY if grayscale else pymupdf.csRGB
+    if pix.n != colorspace.n:
+        pix = pymupdf.Pixmap(colorspace, pix)
+
+    dpi = scan.dpi
+    if dpi < target_dpi - 0.5:
+        ratio = target_dpi / dpi
+        pix = pymupdf.Pixmap(pix, int(pix.width * ratio + 0.5), int(pix.height * ratio + 0.5), None)
+        dpi = float(target_dpi)
+
+    rect = scan.rect
+    to_page = pymupdf.Matrix(rect.width / pix.width, 0, 0, rect.height / pix.height, rect.x0, rect.y0)
+    arr = pixmap_to_array(pix)
+    if grayscale:
+        arr = arr[..., 0]
+    return arr, to_page, dpi
+
+
+def _preprocess_page(
+    page: pymupdf.Page,
+    dpi: float,
+    crop_borders: bool,
+    min_size: int,
+    max_size: int,
+    grayscale: bool = False,
+    apply_enhancement: bool = True,
+    embedded: bool = False,
+) -> tuple:
+    """
+    Kernel di preprocessing: un rendering e pochi passaggi vettoriali.
+
+    1. plan_render(): area del contenuto e DPI finale (con embedded, se la
+       pagina è una sola immagine e il suo DPI è nella finestra, si usa
+       invece l'immagine nativa: vedi native_page_array())
+    2. un solo get_pixmap (RGB o un canale) su quell'area
+    3. ritaglio esatto dei bordi con le proiezioni (vista, nessuna copia)
+    4. padding se troppo piccola, riduzione solo se ancora troppo grande
+    5. contrasto con una lookup table, sharpening (PIL, un passaggio)
+
+    Returns:
+        Tuple (array uint8 (H, W, 3) o (H, W), DPI usato, dimensioni originali,
+        matrice pixel -> coordinate pagina, sorgente "embedded" o "render")
+    """
+    clip, planned_dpi = plan_render(page, dpi, crop_borders, max_size)
+    scan = find_scan_image(page) if embedded else None
+    native = None
+    if scan is not None:
+        # Oltre a stare nella finestra, il contenuto deve stare in max_size
+        area = clip or page.rect
+        max_dpi = min(dpi * NATIVE_DPI_WINDOW, (max_size - 1) * 72.0 / max(area.width, area.height))
+        try:
+            native = native_page_array(page, scan, planned_dpi, max_dpi, grayscale)
+        except Exception as e:
+            logger.warning(f"Immagine incorporata non decodificabile, renderizzo la pagina: {e}")
+    if native is not None:
+        arr, to_page, dpi = native
+        source = "embedded"
+    else:
+        dpi = planned_dpi
+        scale = dpi / 72.0
+        pix = page.get_pixmap(
+            matrix=pymupdf.Matrix(scale, scale),
+            clip=clip,
+            colorspace=pymupdf.csGRAY if grayscale else pymupdf.csRGB,
+            alpha=False,
+        )
+        arr = pixmap_to_array(pix)
+        if grayscale:
+            arr = arr[..., 0]
+        del pix
+        origin = (clip or page.rect).tl
+        to_page = pymupdf.Matrix(1 / scale, 0, 0, 1 / scale, origin.x, origin.y)
+        source = "render"
+    original_size = (arr.shape[1], arr.shape[0])
+
+    # Ritaglio esatto alla risoluzione finale
+    if crop_borders:
+        bounds = content_bounds(arr)
+        if bounds is not None:
+            x0, y0, x1, y1 = bounds
+            arr = arr[y0:y1, x0:x1]
+            to_page = pymupdf.Matrix(1, 0, 0, 1, x0, y0) * to_page
+
+    # Raramente necessario: il DPI è già stato scelto per stare in max_size
+    h, w = arr.shape[:2]
+    if w > max_size or h > max_size:
+        arr = np.asarray(resize_if_too_large(Image.fromarray(arr), max_size, max_size))
+        to_page = pymupdf.Matrix(w / arr.shape[1], 0, 0, h / arr.shape[0], 0, 0) * to_page
+        h, w = arr.shape[:2]
+
+    # Padding bianco se troppo piccola
+    if w < min_size or h < min_size:
+        padded = np.full((max(h, min_size), max(w, min_size)) + arr.shape[2:], 255, dtype=np.uint8)
+        padded[:h, :w] = arr
+        arr = padded
+
+    if apply_enhancement:
+        arr = _enhance_array(arr)
+
+    return arr, dpi, original_size, to_page, source
+
 
 def enhance_for_ocr(pil_img: Image.Image) -> Image.Image:
     """
     Applica enhancement dell'immagine ottimizzato per OCR.
 
     Operazioni:
-    1. Leggero aumento di contrasto (rende il testo più scuro e il background più chiaro)
+    1. Leggero aumento di contrasto (rende il testo più scuro e il background più chiaro),
+       con una lookup table (stesso risultato di ImageEnhance.Contrast)
     2. Sharpening controllato (bordi del testo più definiti)
 
     Nota: non applichiamo binarizzazione (bianco/nero) perché
     RapidOCR lavora meglio con immagini a colori/grayscale.
     """
     # Aumento contrasto
-    enhancer = ImageEnhance.Contrast(pil_img)
-    pil_img = enhancer.enhance(CONTRAST_FACTOR)
+    mean = _luma_mean(np.asarray(pil_img))
+    pil_img = pil_img.point(contrast_lut(mean) * len(pil_img.getbands()))
 
     # Sharpening controllato — migliora la leggibilità del testo
     enhancer = ImageEnhance.Sharpness(pil_img)
@@ -145,12 +471,78 @@ def _preprocess_image(
     return img
 
 
+# ---------------------------------------------------------------------------
+# Pipeline preprocessing completa
+# ---------------------------------------------------------------------------
+
+def preprocess_page_array(
+    page: pymupdf.Page,
+    dpi: int = DEFAULT_DPI,
+    crop_borders: bool = True,
+    min_size: int = MIN_SIDE,
+    max_size: int = MAX_SIDE,
+    grayscale: bool = False,
+    embedded: bool = False,
+) -> tuple:
+    """
+    Preprocessa una pagina PyMuPDF per OCR e la restituisce come array.
+
+    Stesso preprocessing di preprocess_page_from_pymupdf(), ma l'immagine
+    arriva a RapidOCR (recognize_array) senza passare da un PNG: nessuna
+    compressione/decompressione e un picco di memoria più basso sulle
+    scansioni a 300 DPI.
+
+    Args:
+        page: Oggetto pymupdf.Page
+        dpi, crop_borders, min_size, max_size: come preprocess_page_from_pymupdf()
+        grayscale: Renderizza un solo canale (un terzo della memoria;
+            RapidOCR accetta immagini (H, W))
+        embedded: Se la pagina è una sola immagine incorporata (scansione),
+            usa i suoi pixel nativi invece di renderizzare la pagina
+
+    Returns:
+        Tuple (array uint8 (H, W, 3), o (H, W) con grayscale, info_dict)
+        dove info_dict contiene:
+        - width, height: dimensioni in pixel
+        - dpi: DPI usato (ridotto se la pagina non sta in max_size)
+        - mode: modalità colore ("RGB" o "L")
+        - original_size: dimensioni del rendering prima del ritaglio esatto
+        - size_kb: dimensione dell'array in KB
+        - source: "embedded" (immagine nativa) o "render"
+        - to_page: pymupdf.Matrix pixel -> coordinate pagina (per le box OCR)
+    """
+    array, dpi, original_size, to_page, source = _preprocess_page(
+        page, dpi, crop_borders, min_size, max_size, grayscale, embedded=embedded,
+    )
+
+    info = {
+        "width": array.shape[1],
+        "height": array.shape[0],
+        "dpi": round(dpi, 1),
+        "mode": "L" if array.ndim == 2 else "RGB",
+        "original_size": original_size,
+        "size_kb": round(array.nbytes / 1024, 1),
+        "source": source,
+        "to_page": to_page,
+    }
+
+    logger.info(
+        f"Preprocessing OK: {info['width']}x{info['height']} px, "
+        f"DPI={info['dpi']}, mode={info['mode']}, "
+        f"array={info['size_kb']} KB "
+        f"(originale: {original_size[0]}x{original_size[1]})"
+    )
+
+    return array, info
+
+
 def preprocess_page_from_pymupdf(
     page: pymupdf.Page,
     dpi: int = DEFAULT_DPI,
     crop_borders: bool = True,
     min_size: int = MIN_SIDE,
     max_size: int = MAX_SIDE,
+    grayscale: bool = False,
 ) -> tuple:
     """
     Preprocessa una pagina PyMuPDF per OCR.
@@ -158,32 +550,23 @@ def preprocess_page_from_pymupdf(
 
     Args:
         page: Oggetto pymupdf.Page
-        dpi: DPI per il rendering (default 300)
+        dpi: DPI per il rendering (default 300, ridotto se la pagina non
+            sta in max_size)
         crop_borders: Se ritagliare bordi bianchi
         min_size: Dimensione minima lato (pixel)
         max_size: Dimensione massima lato (pixel)
+        grayscale: PNG in scala di grigi invece che RGB
 
     Returns:
         Tuple (png_bytes, info_dict) dove info_dict contiene:
         - width, height: dimensioni in pixel
         - dpi: DPI usato
         - mode: modalità colore
-        - original_size: dimensioni originali prima del preprocessing
+        - original_size: dimensioni del rendering prima del ritaglio esatto
         - file_size_kb: dimensione PNG in KB
     """
-    # Renderizza
-    img = _render_page_to_pil(page, dpi)
-    original_size = img.size
-
-    # Preprocessing
-    img = _preprocess_image(img, crop_borders, min_size, max_size)
-
-    # Se dopo il preprocessing l'immagine è ancora troppo grande, riduci DPI
-    w, h = img.size
-    if (w > max_size or h > max_size) and dpi > 72:
-        lower_dpi = max(72, int(dpi * 0.75))
-        logger.info(f"Immagine troppo grande ({w}x{h}), riprovo con DPI {lower_dpi}")
-        return preprocess_page_from_pymupdf(page, lower_dpi, crop_borders, min_size, max_size)
+    array, dpi, original_size, _, source = _preprocess_page(page, dpi, crop_borders, min_size, max_size, grayscale)
+    img = Image.fromarray(array)
 
     # Converti in PNG bytes
     buf = io.BytesIO()
@@ -193,10 +576,11 @@ def preprocess_page_from_pymupdf(
     info = {
         "width": img.size[0],
         "height": img.size[1],
-        "dpi": dpi,
+        "dpi": round(dpi, 1),
         "mode": img.mode,
         "original_size": original_size,
         "file_size_kb": round(len(png_bytes) / 1024, 1),
+        "source": source,
     }
 
     logger.info(
@@ -216,6 +600,7 @@ def preprocess_pdf_page(
     crop_borders: bool = True,
     min_size: int = MIN_SIDE,
     max_size: int = MAX_SIDE,
+    grayscale: bool = False,
 ) -> tuple:
     """
     Preprocessa una pagina PDF da file per OCR (per uso standalone).
@@ -223,7 +608,7 @@ def preprocess_pdf_page(
     Args:
         pdf_path: Percorso al file PDF
         page_num: Numero pagina (0-based)
-        dpi, crop_borders, min_size, max_size: parametri preprocessing
+        dpi, crop_borders, min_size, max_size, grayscale: parametri preprocessing
 
     Returns:
         Tuple (png_path, info_dict)
@@ -234,7 +619,7 @@ def preprocess_pdf_page(
         if page_num < 0 or page_num >= len(doc):
             raise IndexError(f"Pagina {page_num} fuori range (0-{len(doc)-1})")
         page = doc[page_num]
-        png_bytes, info = preprocess_page_from_pymupdf(page, dpi, crop_borders, min_size, max_size)
+        png_bytes, info = preprocess_page_from_pymupdf(page, dpi, crop_borders, min_size, max_size, grayscale)
 
         # Salva PNG temporaneo
         tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
@@ -21,11 +21,15 @@ Usage:
     engine = RapidDocEngine()
     if engine.is_available():
         markdown = engine.extract_page_markdown(pdf_bytes, page_num=0)
+        # Several pages in one batched pipeline call
+        results = engine.extract_pages_markdown(pdf_bytes, [0, 3, 4])
 """
 import os
 import logging
 import time
-from typing import Optional, Tuple, List, Dict, Any
+from typing import Optional, Tuple, List, Dict, Any, Sequence
+
+from .resources import get_governor
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +55,6 @@ try:
     from rapid_doc.backend.pipeline.model_json_to_middle_json import (
         result_to_middle_json as pipeline_result_to_middle_json,
     )
-    from rapid_doc.data.data_reader_writer import FileBasedDataWriter
     from rapid_doc.utils.enum_class import MakeMode
     from rapidocr import LangRec, OCRVersion, ModelType as OCRModelType
     RAPIDDOC_AVAILABLE = True
@@ -63,10 +66,22 @@ except Exception as e:
     logger.warning(f"RapidDoc import error: {e}")
 
 
+# Largest batch the layout and OCR detection models get in one inference
+# call (pages beyond it are run in further batches by RapidDoc)
+MAX_MODEL_BATCH = 8
+
 # ---------------------------------------------------------------------------
 # OCR configuration for RapidDoc
 # ---------------------------------------------------------------------------
 
+def _build_rapiddoc_model_config() -> dict:
+    """
+    Layout/table model config for RapidDoc: thread counts from the
+    resource governor ("layout" share).
+    """
+    return {"engine_cfg": get_governor().rapiddoc_engine_cfg()}
+
+
 def _build_rapiddoc_ocr_config() -> dict:
     """
     Build optimized OCR config for RapidDoc.
@@ -77,11 +92,13 @@ def _build_rapiddoc_ocr_config() -> dict:
     - CH v5 detection (best general-purpose text detection)
 
     Note: RapidDoc uses OpenVINO internally for OCR when available,
-    which is faster than ONNX Runtime for CPU inference.
+    which is faster than ONNX Runtime for CPU inference. Thread counts
+    come from the resource governor ("ocr" share).
     """
     if not RAPIDDOC_AVAILABLE:
         return {}
     return {
+        **get_governor().rapidocr_params(),
         # LATIN recognition for English/Italian documents
         "Rec.lang_type": LangRec.LATIN,
         "Rec.ocr_version": OCRVersion.PPOCRV4,
@@ -91,10 +108,54 @@ def _build_rapiddoc_ocr_config() -> dict:
     }
 
 
+def engine_fingerprint(parse_method: str = 'auto', table_enable: bool = True,
+                       formula_enable: bool = False) -> str:
+    """
+    Fingerprint of the RapidDoc configuration for the OCR result cache:
+    OCR settings and the extraction options (thread counts excluded).
+    """
+    from .ocr_cache import config_fingerprint
+
+    if not RAPIDDOC_AVAILABLE:
+        return "unavailable"
+    try:
+        from importlib.metadata import version
+        rapiddoc_version = version("rapid-doc")
+    except Exception:
+        rapiddoc_version = "unknown"
+    return config_fingerprint({
+        **_build_rapiddoc_ocr_config(),
+        "version": rapiddoc_version,
+        "parse_method": parse_method,
+        "table_enable": table_enable,
+        "formula_enable": formula_enable,
+    })
+
+
 # ---------------------------------------------------------------------------
-# Temporary image output directory
+# Image output
 # ---------------------------------------------------------------------------
-_IMAGE_OUTPUT_DIR = "/tmp/rapiddoc_images"
+
+class _DiscardingImageWriter:
+    """
+    Image writer for pipeline_result_to_middle_json that keeps nothing.
+
+    The middle JSON step crops every figure/table region to a JPEG and
+    hands it to the writer; only the Markdown text is used for translation
+    (image references are dropped by _parse_rapiddoc_markdown), so the
+    crops are counted and discarded instead of written to disk.
+    """
+
+    def __init__(self):
+        self.images = 0
+        self.bytes = 0
+
+    def write(self, path: str, data: bytes) -> None:
+        self.images += 1
+        self.bytes += len(data or b"")
+
+    def write_string(self, path: str, data: str) -> None:
+        self.write(path, data.encode("utf-8"))
 
 
 class RapidDocEngine:
@@ -125,10 +186,17 @@ class RapidDocEngine:
             return
         self._initialized = True
         self._ocr_config = _build_rapiddoc_ocr_config()
-        # Ensure temp directory exists
-        os.makedirs(_IMAGE_OUTPUT_DIR, exist_ok=True)
+        self._model_config = _build_rapiddoc_model_config()
+        # Rebuild thread settings when the governor rebalances cores
+        get_governor().add_listener(self._on_threads_changed)
         logger.info("RapidDocEngine initialized")
 
+    def _on_threads_changed(self, allocation) -> None:
+        """Pick up new thread counts (models are re-created by RapidDoc on next use)."""
+        self._ocr_config = _build_rapiddoc_ocr_config()
+        self._model_config = _build_rapiddoc_model_config()
+        logger.info(f"RapidDoc threads: ocr={allocation.ocr}, layout={allocation.layout}")
+
     def is_available(self) -> bool:
         """Check if RapidDoc is available and functional."""
         if self._available is not None:
@@ -178,70 +246,119 @@ class RapidDocEngine:
                 - 'elapsed': processing time in seconds
                 - 'num_elements': number of content elements detected
         """
+        return self.extract_pages_markdown(
+            pdf_bytes, [page_num],
+            parse_method=parse_method,
+            table_enable=table_enable,
+            formula_enable=formula_enable,
+        )[page_num]
+
+    def extract_pages_markdown(
+        self,
+        pdf_bytes: bytes,
+        page_nums: Sequence[int],
+        parse_method: str = 'auto',
+        table_enable: bool = True,
+        formula_enable: bool = False,
+    ) -> Dict[int, Tuple[str, Dict[str, Any]]]:
+        """
+        Extract structured Markdown from several PDF pages in one pass.
+
+        The pages are split out of pdf_bytes and analysed by a single
+        pipeline_doc_analyze call. The layout model and OCR detection
+        get up to MAX_MODEL_BATCH pages per inference (RapidDoc's
+        "batch_num" / "Det.rec_batch_num", 1 by default); table and
+        recognition models still run per crop.
+
+        Args:
+            pdf_bytes: Full PDF file as bytes (read once by the caller)
+            page_nums: 0-based page numbers to extract
+            parse_method: 'auto', 'txt', or 'ocr' (see extract_page_markdown)
+            table_enable: Whether to recognize tables
+            formula_enable: Whether to recognize formulas (slower)
+
+        Returns:
+            page_num -> (markdown_string, metadata_dict), metadata as in
+            extract_page_markdown ('elapsed' is the batch time shared
+            equally by its pages; 'batch_size' is the number of pages)
+        """
         if not self.is_available():
             raise RuntimeError("RapidDoc is not available")
 
+        page_nums = list(dict.fromkeys(page_nums))
+        if not page_nums:
+            return {}
+
         t0 = time.time()
 
         try:
-            # Extract single page as a new PDF
-            single_page_pdf = convert_pdf_bytes_to_bytes_by_pypdfium2(
-                pdf_bytes, page_num, page_num
-            )
+            # Extract each page as its own PDF; one analyze call for all
+            single_page_pdfs = [
+                convert_pdf_bytes_to_bytes_by_pypdfium2(pdf_bytes, page_num, page_num)
+                for page_num in page_nums
+            ]
+
+            # Batch sizes only change how many pages share an inference
+            # call, so they stay out of the config the cache fingerprints
+            batch_num = min(len(page_nums), MAX_MODEL_BATCH)
+            layout_config = {**self._model_config, "batch_num": batch_num}
+            ocr_config = {**self._ocr_config, "Det.rec_batch_num": batch_num}
 
-            # Run the full pipeline
             infer_results, all_image_lists, all_page_dicts, lang_list, ocr_enabled_list = (
                 pipeline_doc_analyze(
-                    [single_page_pdf],
+                    single_page_pdfs,
                     parse_method=parse_method,
                     formula_enable=formula_enable,
                     table_enable=table_enable,
-                    ocr_config=self._ocr_config,
+                    layout_config=layout_config,
+                    ocr_config=ocr_config,
+                    table_config=self._model_config,
                 )
             )
 
-            # Convert to middle JSON
-            model_list = infer_results[0]
-            images_list = all_image_lists[0]
-            pdf_dict = all_page_dicts[0]
-            _lang = lang_list[0]
-            _ocr_enable = ocr_enabled_list[0]
-
-            image_writer = FileBasedDataWriter(_IMAGE_OUTPUT_DIR)
+            image_writer = _DiscardingImageWriter()
+            pages: Dict[int, Tuple[str, Dict[str, Any]]] = {}
+            for index, page_num in enumerate(page_nums):
+                _lang = lang_list[index]
+                _ocr_enable = ocr_enabled_list[index]
 
-            middle_json = pipeline_result_to_middle_json(
-                model_list, images_list, pdf_dict, image_writer,
-                _lang, _ocr_enable, formula_enable,
-                ocr_config=self._ocr_config,
-            )
+                middle_json = pipeline_result_to_middle_json(
+                    infer_results[index], all_image_lists[index], all_page_dicts[index],
+                    image_writer, _lang, _ocr_enable, formula_enable,
+                    ocr_config=self._ocr_config,
+                )
+                pdf_info = middle_json["pdf_info"]
 
-            pdf_info = middle_json["pdf_info"]
+                # Generate Markdown
+                md_content = pipeline_union_make(pdf_info, MakeMode.MM_MD, "images")
 
-            # Generate Markdown
-            md_content = pipeline_union_make(pdf_info, MakeMode.MM_MD, "images")
+                pages[page_num] = (md_content, {
+                    'language': _lang,
+                    'ocr_enabled': _ocr_enable,
+                    'num_elements': self._count_elements(pdf_info),
+                    'block_bboxes': self._extract_block_bboxes(pdf_info),
+                    'page_size': self._extract_page_size(pdf_info),
+                })
 
             elapsed = time.time() - t0
-
-            metadata = {
-                'language': _lang,
-                'ocr_enabled': _ocr_enable,
-                'elapsed': elapsed,
-                'num_elements': self._count_elements(pdf_info),
-                'block_bboxes': self._extract_block_bboxes(pdf_info),
-                'page_size': self._extract_page_size(pdf_info),
-            }
-
+            for page_num, (md_content, metadata) in pages.items():
+                metadata['elapsed'] = elapsed / len(pages)
+                metadata['batch_size'] = len(pages)
+                logger.info(
+                    f"RapidDoc page {page_num + 1}: {len(md_content)} chars, "
+                    f"{metadata['num_elements']} elements, "
+                    f"lang={metadata['language']}, ocr={metadata['ocr_enabled']}"
+                )
             logger.info(
-                f"RapidDoc page {page_num + 1}: {len(md_content)} chars, "
-                f"{metadata['num_elements']} elements, "
-                f"lang={_lang}, ocr={_ocr_enable}, {elapsed:.1f}s"
+                f"RapidDoc: {len(pages)} page(s) in {elapsed:.1f}s "
+                f"({image_writer.images} image crops discarded)"
             )
 
-            return md_content, metadata
+            return pages
 
         except Exception as e:
-            elapsed = time.time() - t0
-            logger.error(f"RapidDoc extraction failed for page {page_num + 1}: {e}")
+            pages_label = ", ".join(str(p + 1) for p in page_nums)
+            logger.error(f"RapidDoc extraction failed for page(s) {pages_label}: {e}")
             raise
 
     def extract_page_text(
@@ -21,6 +21,7 @@ Compatibilità interfaccia:
     - RapidOcrEngine  (singleton, come GlmOcrEngine)
     - .is_available()
     - .recognize_text(image_data, mode) -> (text, confidence)
+    - .recognize_array(ndarray, mode) -> (text, confidence)  (senza PNG)
     - .recognize_document_page(image_data, detect_tables) -> text
     - check_ocr_status() -> (bool, str)
     - ocr_image(image_data, mode) -> str
@@ -34,11 +35,14 @@ Usage:
 """
 import logging
 import io
-from typing import Optional, Tuple, List
+import os
+from dataclasses import dataclass
+from typing import Optional, Tuple, List, Union
 
 import numpy as np
 from PIL import Image
 
+from .resources import get_governor
 from .sentry_integration import capture_exception
 
 logger = logging.getLogger(__name__)
@@ -69,10 +73,15 @@ TEXT_SCORE_THRESHOLD = 0.3
 RAPIDOCR_LOG_LEVEL = "warning"
 
 
-def _build_engine_params() -> dict:
+def _build_engine_params(threads: Optional[int] = None) -> dict:
     """
     Costruisce i parametri ottimali per l'engine RapidOCR.
 
+    Args:
+        threads: thread ONNX dell'istanza (default: quota "ocr" del
+            ResourceGovernor). Usato dal pool di engine (ocr_pool.py),
+            dove ogni istanza ha una quota fissa.
+
     Scelte progettuali:
     - Detection: PP-OCRv5 MOBILE (veloce, buona qualità su layout complessi)
     - Classification: PP-OCRv4 mobile (unica opzione disponibile)
@@ -91,8 +100,22 @@ def _build_engine_params() -> dict:
 
     Nota: PP-OCRv5 detection disponibile solo con lang_type CH (non EN/MULTI).
     Testato: CH v5 è superiore a EN v4 e MULTI v4 per keyword recall su documenti legali.
+
+    Thread: assegnati dal ResourceGovernor (quota "ocr"), per non competere
+    con torch e RapidDoc quando le pagine sono elaborate in parallelo.
     """
+    if threads is None:
+        thread_params = get_governor().rapidocr_params()
+    else:
+        thread_params = {
+            "EngineConfig.onnxruntime.intra_op_num_threads": max(1, threads),
+            "EngineConfig.onnxruntime.inter_op_num_threads": 1,
+            "EngineConfig.openvino.inference_num_threads": max(1, threads),
+        }
     return {
+        # --- Thread (budget condiviso, vedi app/core/resources.py) ---
+        **thread_params,
+
         # --- Global ---
         "Global.text_score": TEXT_SCORE_THRESHOLD,
         "Global.use_det": True,
@@ -127,6 +150,80 @@ def _build_engine_params() -> dict:
     }
 
 
+def engine_fingerprint() -> str:
+    """
+    Impronta della configurazione dell'engine (modelli, soglie, versione),
+    usata come parte della chiave della cache OCR. I thread sono esclusi:
+    non cambiano il risultato.
+    """
+    from .ocr_cache import config_fingerprint
+
+    if not RAPIDOCR_AVAILABLE:
+        return "unavailable"
+    return config_fingerprint({**_build_engine_params(), "engine": OCR_ENGINE_NAME})
+
+
+@dataclass
+class OcrBoxes:
+    """
+    Output grezzo di RapidOCR per un'immagine: una riga di testo per box.
+
+    Stessi attributi del risultato di RapidOCR (boxes, txts, scores), quindi
+    _reconstruct_text() accetta entrambi. Serializzabile per la cache OCR.
+    """
+    boxes: np.ndarray  # shape (N, 4, 2), in pixel o in coordinate pagina (transformed())
+    txts: Tuple[str, ...]
+    scores: Tuple[float, ...]
+
+    def to_payload(self) -> dict:
+        """Dizionario JSON-serializzabile (vedi OcrResultCache)."""
+        return {
+            "boxes": np.asarray(self.boxes).tolist(),
+            "txts": list(self.txts),
+            "scores": [float(score) for score in self.scores],
+        }
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "OcrBoxes":
+        """Ricostruisce l'output da to_payload()."""
+        boxes = np.asarray(payload.get("boxes") or [], dtype=np.float32).reshape(-1, 4, 2)
+        return cls(boxes, tuple(payload.get("txts") or ()), tuple(payload.get("scores") or ()))
+
+    def transformed(self, matrix) -> "OcrBoxes":
+        """
+        Box trasformate con una matrice affine (a, b, c, d, e, f), come
+        pymupdf.Matrix: x' = a*x + c*y + e, y' = b*x + d*y + f.
+
+        Riporta le box dai pixel dell'immagine riconosciuta alle coordinate
+        della pagina (vedi preprocess_for_ocr.native_page_array()).
+        """
+        a, b, c, d, e, f = (float(value) for value in matrix)
+        boxes = np.asarray(self.boxes, dtype=np.float32).reshape(-1, 4, 2)
+        x, y = boxes[..., 0], boxes[..., 1]
+        mapped = np.stack((a * x + c * y + e, b * x + d * y + f), axis=-1)
+        return OcrBoxes(mapped.astype(np.float32), self.txts, self.scores)
+
+    @classmethod
+    def from_result(cls, result) -> "OcrBoxes":
+        """Converte il risultato di un oggetto RapidOCR (vuoto se nessun testo)."""
+        if result is None or result.txts is None or len(result.txts) == 0:
+            return cls(np.zeros((0, 4, 2), dtype=np.float32), (), ())
+        return cls(np.asarray(result.boxes), tuple(result.txts), tuple(result.scores))
+
+
+def decode_image(image_data: bytes) -> np.ndarray:
+    """Decodifica un'immagine (PNG, JPEG, ...) in array RGB uint8 (H, W, 3)."""
+    img = Image.open(io.BytesIO(image_data))
+    return np.array(img.convert("RGB"))
+
+
+def create_engine(threads: Optional[int] = None) -> "RapidOCR":
+    """Nuova istanza RapidOCR con i parametri dell'applicazione (vedi _build_engine_params)."""
+    if not RAPIDOCR_AVAILABLE:
+        raise RuntimeError("RapidOCR non disponibile (libreria non installata)")
+    return RapidOCR(params=_build_engine_params(threads))
+
+
 class RapidOcrEngine:
     """
     Motore OCR basato su RapidOCR (ONNX Runtime + PP-OCR models).
@@ -143,6 +240,8 @@ class RapidOcrEngine:
     _instance: Optional["RapidOcrEngine"] = None
     _engine: Optional["RapidOCR"] = None
     _available: Optional[bool] = None  # cache del check
+    _threads: Optional[int] = None  # thread OCR con cui è stato creato l'engine
+    _pid: Optional[int] = None  # processo che ha creato le sessioni
 
     @classmethod
     def reset(cls) -> None:
@@ -167,6 +266,8 @@ class RapidOcrEngine:
         try:
             params = _build_engine_params()
             self._engine = RapidOCR(params=params)
+            self._threads = get_governor().threads_for("ocr")
+            self._pid = os.getpid()
             logger.info(f"RapidOCR engine inizializzato: {OCR_ENGINE_NAME}")
             self._available = True
         except Exception as e:
@@ -174,6 +275,28 @@ class RapidOcrEngine:
             logger.error(f"Errore inizializzazione RapidOCR: {e}")
             self._engine = None
             self._available = False
+            return
+        # Ricostruisce le sessioni quando cambia la quota di thread OCR
+        get_governor().add_listener(self._on_threads_changed)
+
+    def _on_threads_changed(self, allocation) -> None:
+        """
+        Ricrea l'engine con il nuovo numero di thread (le sessioni ONNX lo
+        fissano alla creazione) o in un processo figlio creato con fork, dove
+        le sessioni ereditate non hanno più i loro thread pool.
+        """
+        if self._engine is None:
+            return
+        if allocation.ocr == self._threads and os.getpid() == self._pid:
+            return
+        try:
+            self._engine = RapidOCR(params=_build_engine_params())
+            self._threads = allocation.ocr
+            self._pid = os.getpid()
+            logger.info(f"RapidOCR ricreato con {allocation.ocr} thread")
+        except Exception as e:
+            capture_exception(e, context={"operation": "rapidocr_reconfigure"})
+            logger.warning(f"Riconfigurazione thread RapidOCR fallita: {e}")
 
     # ------------------------------------------------------------------
     # Interfaccia pubblica
@@ -210,10 +333,42 @@ class RapidOcrEngine:
 
         try:
             # Converti bytes -> numpy array (formato accettato da RapidOCR)
-            img = Image.open(io.BytesIO(image_data))
-            img_np = np.array(img.convert("RGB"))
+            img_np = decode_image(image_data)
+        except Exception as e:
+            capture_exception(
+                e,
+                context={"operation": "rapidocr_decode", "mode": mode},
+                tags={"component": "ocr"},
+            )
+            logger.error(f"RapidOCR errore: {e}")
+            return "", 0.0
+        return self.recognize_array(img_np, mode)
+
+    def recognize_array(
+        self,
+        image: np.ndarray,
+        mode: str = "text",
+    ) -> Tuple[str, float]:
+        """
+        Riconosce il testo da un'immagine già in memoria come array.
+
+        Evita la codifica/decodifica PNG: l'array (ad es. da
+        preprocess_page_array() o pixmap_to_array()) arriva direttamente
+        al detector ONNX.
+
+        Args:
+            image: array uint8 RGB (H, W, 3), come quelli di decode_image(),
+                oppure in scala di grigi (H, W)
+            mode: come recognize_text()
+
+        Returns:
+            (testo_riconosciuto, confidence_media)
+        """
+        if not self.is_available():
+            return "", 0.0
 
-            result = self._engine(img_np)
+        try:
+            result = self._engine(image)
 
             if result is None or result.txts is None or len(result.txts) == 0:
                 logger.debug("RapidOCR: nessun testo rilevato")
@@ -239,6 +394,48 @@ class RapidOcrEngine:
             logger.error(f"RapidOCR errore: {e}")
             return "", 0.0
 
+    def recognize_boxes(self, image_data: Union[bytes, np.ndarray]) -> Optional[OcrBoxes]:
+        """
+        Esegue detection + recognition e restituisce l'output grezzo.
+
+        A differenza di recognize_text() non ricostruisce il testo: le box
+        possono essere salvate nella cache OCR e trasformate in testo con
+        text_from_boxes().
+
+        Args:
+            image_data: bytes dell'immagine (PNG, JPEG, ecc.) oppure array
+                come in recognize_array() (nessuna decodifica)
+
+        Returns:
+            OcrBoxes (vuoto se nessun testo rilevato), None in caso di errore
+        """
+        if not self.is_available():
+            return None
+
+        try:
+            if not isinstance(image_data, np.ndarray):
+                image_data = decode_image(image_data)
+            result = self._engine(image_data)
+            boxes = OcrBoxes.from_result(result)
+            if not boxes.txts:
+                logger.debug("RapidOCR: nessun testo rilevato")
+            return boxes
+
+        except Exception as e:
+            capture_exception(
+                e,
+                context={"operation": "rapidocr_recognize_boxes"},
+                tags={"component": "ocr"},
+            )
+            logger.error(f"RapidOCR errore: {e}")
+            return None
+
+    def text_from_boxes(self, boxes: OcrBoxes) -> str:
+        """Testo della pagina dalle box (stesso ordinamento di recognize_document_page)."""
+        if boxes is None or len(boxes.txts) == 0:
+            return ""
+        return self._reconstruct_text(boxes)
+
     def recognize_document_page(
         self,
         image_data: bytes,
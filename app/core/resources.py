@@ -0,0 +1,256 @@
+"""
+CPU resource governor - one thread budget for OCR, layout analysis and MT.
+
+RapidOCR (ONNX Runtime), RapidDoc (OpenVINO) and torch each default to
+one thread per core. Run back to back that is fine, but as soon as pages
+are processed in parallel (or stages overlap) they oversubscribe the CPU
+and everything slows down. The governor owns the thread budget and hands
+each stage its share:
+
+- "ocr":    RapidOCR sessions (ONNX Runtime / OpenVINO)
+- "layout": RapidDoc layout and table models (OpenVINO / ONNX Runtime)
+- "mt":     torch intra-op threads and the ONNX Runtime MarianMT sessions
+
+Stages within a worker run sequentially by default, so each one may use the
+worker's whole budget. When OCR and MT overlap (pipelining), rebalance()
+splits the budget between them. Engines read their thread counts from the
+governor when they build sessions and are notified when the split changes.
+
+Budget: LAC_CPU_THREADS (default: CPUs available to this process).
+
+Usage:
+    from app.core.resources import get_governor
+
+    governor = get_governor()
+    governor.configure(workers=2)      # two pages in parallel
+    governor.rebalance(ocr_share=0.6)  # OCR and MT overlap, OCR-heavy document
+    governor.threads_for("mt")
+"""
+import logging
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Override the thread budget (e.g. on shared machines)
+CPU_THREADS_ENV = "LAC_CPU_THREADS"
+
+STAGES = ("ocr", "layout", "mt")
+
+# OCR share of the budget when stages overlap (scanned documents are OCR-bound)
+DEFAULT_OCR_SHARE = 0.5
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on (honours affinity masks and containers)."""
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        return max(1, os.cpu_count() or 1)
+
+
+@dataclass(frozen=True)
+class ThreadAllocation:
+    """Threads per stage for one worker."""
+    ocr: int
+    layout: int
+    mt: int
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"ocr": self.ocr, "layout": self.layout, "mt": self.mt}
+
+
+class ResourceGovernor:
+    """
+    Splits one CPU thread budget between workers and pipeline stages.
+
+    Singleton: engines and the UI share the same instance (see get_governor()).
+    Listeners registered with add_listener() are called with the new
+    ThreadAllocation whenever it changes.
+    """
+
+    _instance: Optional["ResourceGovernor"] = None
+
+    def __new__(cls) -> "ResourceGovernor":
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if getattr(self, "_initialized", False):
+            return
+        self._initialized = True
+        self._lock = threading.RLock()
+        self._listeners: List[Callable[[ThreadAllocation], None]] = []
+        self._torch_interop_set = False
+
+        self.total_threads = self._budget_from_environment()
+        self.workers = 1
+        self.overlap = False
+        self.ocr_share = DEFAULT_OCR_SHARE
+        self._allocation = self._compute()
+        logger.info(f"Resource governor: {self.total_threads} threads, {self._allocation.as_dict()}")
+
+    @staticmethod
+    def _budget_from_environment() -> int:
+        value = os.environ.get(CPU_THREADS_ENV, "").strip()
+        if value:
+            try:
+                return max(1, int(value))
+            except ValueError:
+                logger.warning(f"Ignoring invalid {CPU_THREADS_ENV}: '{value}'")
+        return available_cpus()
+
+    # ------------------------------------------------------------------
+    # Budget
+    # ------------------------------------------------------------------
+
+    def configure(
+        self,
+        total_threads: Optional[int] = None,
+        workers: Optional[int] = None,
+        overlap: Optional[bool] = None,
+        ocr_share: Optional[float] = None,
+    ) -> ThreadAllocation:
+        """
+        Change the budget and notify engines if the allocation changes.
+
+        Args:
+            total_threads: Threads for the whole process
+            workers: Pages processed in parallel (each gets total/workers)
+            overlap: True if OCR and MT run at the same time within a worker
+            ocr_share: Fraction of a worker's threads for OCR/layout when overlapping
+
+        Returns:
+            The new per-worker allocation
+        """
+        with self._lock:
+            if total_threads is not None:
+                self.total_threads = max(1, int(total_threads))
+            if workers is not None:
+                self.workers = max(1, int(workers))
+            if overlap is not None:
+                self.overlap = bool(overlap)
+            if ocr_share is not None:
+                self.ocr_share = min(0.9, max(0.1, float(ocr_share)))
+
+            allocation = self._compute()
+            changed = allocation != self._allocation
+            self._allocation = allocation
+            listeners = list(self._listeners) if changed else []
+
+        if changed:
+            logger.info(
+                f"Resource governor: {self.total_threads} threads / {self.workers} worker(s), "
+                f"overlap={self.overlap} -> {allocation.as_dict()}"
+            )
+        for listener in listeners:
+            try:
+                listener(allocation)
+            except Exception as e:
+                logger.warning(f"Thread allocation listener failed: {e}")
+        return allocation
+
+    def refresh(self) -> None:
+        """
+        Notify listeners of the current allocation.
+
+        Used in forked workers: ONNX Runtime/OpenVINO sessions inherited from
+        the parent lost their thread pools and must be rebuilt.
+        """
+        with self._lock:
+            allocation = self._allocation
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(allocation)
+            except Exception as e:
+                logger.warning(f"Thread allocation listener failed: {e}")
+
+    def rebalance(self, ocr_share: float) -> ThreadAllocation:
+        """Split each worker's threads between overlapping OCR and MT stages."""
+        return self.configure(overlap=True, ocr_share=ocr_share)
+
+    def _compute(self) -> ThreadAllocation:
+        per_worker = max(1, self.total_threads // self.workers)
+        if not self.overlap:
+            return ThreadAllocation(ocr=per_worker, layout=per_worker, mt=per_worker)
+        ocr = max(1, round(per_worker * self.ocr_share))
+        mt = max(1, per_worker - ocr)
+        # Layout analysis runs inside the OCR stage (RapidDoc)
+        return ThreadAllocation(ocr=ocr, layout=ocr, mt=mt)
+
+    @property
+    def allocation(self) -> ThreadAllocation:
+        return self._allocation
+
+    def threads_for(self, stage: str) -> int:
+        """Threads for one stage ("ocr", "layout" or "mt")."""
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}' (expected one of {STAGES})")
+        return getattr(self._allocation, stage)
+
+    def add_listener(self, callback: Callable[[ThreadAllocation], None]) -> None:
+        """Call callback(allocation) whenever the allocation changes."""
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def snapshot(self) -> dict:
+        """Current budget and allocation, for logs and diagnostics."""
+        return {
+            "total_threads": self.total_threads,
+            "workers": self.workers,
+            "overlap": self.overlap,
+            "ocr_share": self.ocr_share,
+            **self._allocation.as_dict(),
+        }
+
+    # ------------------------------------------------------------------
+    # Engine settings
+    # ------------------------------------------------------------------
+
+    def apply_torch(self) -> None:
+        """
+        Set torch intra-op threads (and inter-op threads, once) for the MT stage.
+
+        No-op until torch is imported: the ONNX backend never loads it, and
+        the translator applies the budget when it imports torch.
+        """
+        torch = sys.modules.get("torch")
+        if torch is None:
+            return
+        torch.set_num_threads(self._allocation.mt)
+        if not self._torch_interop_set:
+            self._torch_interop_set = True
+            try:
+                # Only allowed before the first parallel torch operation
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                pass
+
+    def rapidocr_params(self) -> dict:
+        """RapidOCR params for the OCR stage (both ONNX Runtime and OpenVINO engines)."""
+        threads = self._allocation.ocr
+        return {
+            "EngineConfig.onnxruntime.intra_op_num_threads": threads,
+            "EngineConfig.onnxruntime.inter_op_num_threads": 1,
+            "EngineConfig.openvino.inference_num_threads": threads,
+        }
+
+    def rapiddoc_engine_cfg(self) -> dict:
+        """engine_cfg for RapidDoc layout and table models."""
+        threads = self._allocation.layout
+        return {
+            "intra_op_num_threads": threads,
+            "inter_op_num_threads": 1,
+            "inference_num_threads": threads,
+        }
+
+
+def get_governor() -> ResourceGovernor:
+    """The process-wide resource governor."""
+    return ResourceGovernor()
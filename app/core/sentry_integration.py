@@ -25,6 +25,7 @@ Usage:
     except Exception as e:
         capture_exception(e, context={"operation": "pdf_load"})
 """
+import importlib.util
 import os
 import sys
 import logging
@@ -225,13 +226,15 @@ def _set_initial_context():
     except ImportError:
         pass
     
-    # Check for GPU availability (useful for OCR/ML debugging)
-    try:
-        import torch
+    # Check for GPU availability (useful for OCR/ML debugging). Only if
+    # torch is already loaded: importing it here would load it in
+    # ONNX-only sessions too.
+    torch = sys.modules.get("torch")
+    if torch is not None:
         sentry_sdk.set_tag("cuda.available", str(torch.cuda.is_available()))
         if torch.cuda.is_available():
             sentry_sdk.set_tag("cuda.device_count", str(torch.cuda.device_count()))
-    except ImportError:
+    elif importlib.util.find_spec("torch") is None:
         sentry_sdk.set_tag("cuda.available", "torch_not_installed")
 
 
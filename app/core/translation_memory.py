@@ -0,0 +1,218 @@
+"""
+Persistent translation memory - SQLite Edition
+Disk-backed cache of OPUS-MT translations shared across runs and processes.
+
+OPUS-MT output is deterministic for a given model and input, so contract
+boilerplate, running headers/footers and table labels only need to be
+translated once. Entries are keyed by (model name, normalized source text),
+where the source is the exact string handed to the model (after URL
+protection and Unicode normalization).
+
+Features:
+- Survives restarts (single SQLite file, WAL journal)
+- Safe across processes and threads (SQLite locking + connection lock)
+- Size-bounded with least-recently-used eviction
+- Hit/miss statistics
+
+Usage:
+    from app.core.translation_memory import TranslationMemory
+
+    memory = TranslationMemory()
+    cached = memory.get_many("Helsinki-NLP/opus-mt-en-it", ["Hello world"])
+    memory.put_many("Helsinki-NLP/opus-mt-en-it", {"Hello world": "Ciao mondo"})
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Default location: next to the user config (~/.lac-translate/.env)
+DEFAULT_MEMORY_PATH = Path.home() / ".lac-translate" / "translation_memory.sqlite3"
+
+# Override location with LAC_TRANSLATION_MEMORY (set to "off" to disable)
+MEMORY_PATH_ENV = "LAC_TRANSLATION_MEMORY"
+
+# ~200k segments ≈ 50-100 MB on disk for typical contract text
+DEFAULT_MAX_ENTRIES = 200_000
+
+# Evict down to this fraction of max_entries, so eviction runs rarely
+_EVICT_TARGET_RATIO = 0.9
+
+# SQLite limits host parameters per statement (999 on older builds)
+_SQL_CHUNK = 500
+
+
+class TranslationMemory:
+    """
+    SQLite-backed translation memory with LRU eviction.
+
+    One instance can be shared by all TranslationEngine objects in a
+    process; several processes may open the same file concurrently.
+    """
+
+    def __init__(
+        self,
+        path: Optional[os.PathLike] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Open (or create) the translation memory.
+
+        Args:
+            path: SQLite file path (default: DEFAULT_MEMORY_PATH)
+            max_entries: Maximum number of stored segments before eviction
+        """
+        self.path = Path(path) if path else DEFAULT_MEMORY_PATH
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                " model TEXT NOT NULL,"
+                " source TEXT NOT NULL,"
+                " translation TEXT NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (model, source))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_segments_last_used ON segments (last_used)"
+            )
+            # Upper bound of the row count, so writes need not count the table
+            self._count = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        logger.info(f"Translation memory opened: {self.path}")
+
+    @classmethod
+    def from_environment(cls) -> Optional["TranslationMemory"]:
+        """
+        Open the default translation memory, honouring LAC_TRANSLATION_MEMORY.
+
+        Returns None when disabled ("off") or when the file cannot be opened,
+        so translation keeps working without a cache.
+        """
+        location = os.environ.get(MEMORY_PATH_ENV, "").strip()
+        if location.lower() in ("off", "0", "false", "none"):
+            logger.info("Translation memory disabled by environment")
+            return None
+        try:
+            return cls(location or None)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Translation memory unavailable: {e}")
+            return None
+
+    def get_many(self, model: str, sources: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up translations for several sources of the same model.
+
+        Hits are marked as recently used. Returns a dict containing only
+        the sources that were found.
+        """
+        unique = list(dict.fromkeys(sources))
+        if not unique:
+            return {}
+
+        found: Dict[str, str] = {}
+        try:
+            with self._lock, self._conn:
+                for start in range(0, len(unique), _SQL_CHUNK):
+                    chunk = unique[start:start + _SQL_CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT source, translation FROM segments "
+                        f"WHERE model = ? AND source IN ({marks})",
+                        [model, *chunk],
+                    ).fetchall()
+                    found.update(rows)
+                if found:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE segments SET last_used = ? WHERE model = ? AND source = ?",
+                        [(now, model, source) for source in found],
+                    )
+        except sqlite3.Error as e:
+            logger.warning(f"Translation memory lookup failed: {e}")
+            found = {}
+
+        self.hits += len(found)
+        self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(self, model: str, translations: Dict[str, str]) -> None:
+        """Store translations for one model, evicting old entries if needed."""
+        if not translations:
+            return
+        now = time.time()
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO segments (model, source, translation, last_used) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(model, source, target, now) for source, target in translations.items()],
+                )
+                self._count += len(translations)
+                self._evict_locked()
+        except sqlite3.Error as e:
+            logger.warning(f"Translation memory write failed: {e}")
+
+    def _evict_locked(self) -> None:
+        """
+        Drop least-recently-used entries above max_entries (lock held).
+
+        The table is only counted once the running count passes
+        max_entries: the running count also adds replaced sources and
+        misses rows written by other processes, so it is resynced here.
+        """
+        if self._count <= self.max_entries:
+            return
+        self._count = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        if self._count <= self.max_entries:
+            return
+        excess = self._count - int(self.max_entries * _EVICT_TARGET_RATIO)
+        self._conn.execute(
+            "DELETE FROM segments WHERE rowid IN "
+            "(SELECT rowid FROM segments ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        self._count -= excess
+        logger.info(f"Translation memory: evicted {excess} least-recently-used entries")
+
+    def clear(self) -> None:
+        """Remove all stored translations and reset statistics."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM segments")
+            self._count = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """Get hit/miss statistics and current size."""
+        try:
+            with self._lock:
+                entries = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        except sqlite3.Error:
+            entries = -1
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._conn.close()
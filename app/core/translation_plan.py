@@ -0,0 +1,87 @@
+"""
+Document-level translation plan.
+
+Running headers/footers, page numbers, repeated table column headers and
+clause titles recur on nearly every page of a contract. The plan is built
+by PDFProcessor.plan_translation() before any page is rendered: it collects
+the segments of all requested pages, deduplicates them and translates each
+unique segment once. translate_page() then resolves its segments from the
+plan instead of translating them again.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass
+class TranslationPlan:
+    """
+    Translations for every unique segment of a set of pages.
+
+    Attributes:
+        pages: Pages covered by the plan (0-based)
+        translations: Source segment -> translation
+        total_segments: Segment occurrences found across all pages
+        unique_segments: Distinct segments actually translated
+        skipped_pages: Pages not planned (e.g. scanned) -> reason
+        preserve_line_breaks: Segmentation mode the plan was built with
+        elapsed: Planning time in seconds
+        collected: Per-page collected structure, consumed by translate_page
+    """
+    pages: List[int] = field(default_factory=list)
+    translations: Dict[str, str] = field(default_factory=dict)
+    total_segments: int = 0
+    unique_segments: int = 0
+    skipped_pages: Dict[int, str] = field(default_factory=dict)
+    preserve_line_breaks: bool = True
+    elapsed: float = 0.0
+    collected: Dict[int, Dict[str, Any]] = field(default_factory=dict, repr=False)
+
+    @property
+    def model_calls_saved(self) -> int:
+        """Segment translations avoided by deduplication."""
+        return self.total_segments - self.unique_segments
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Fraction of segment occurrences answered by another occurrence."""
+        if self.total_segments == 0:
+            return 0.0
+        return self.model_calls_saved / self.total_segments
+
+    def take_collected(self, page_num: int, preserve_line_breaks: bool):
+        """
+        Hand over the collected structure of a page (once), or None.
+
+        The structure is released after use to keep memory bounded on
+        long documents.
+        """
+        if preserve_line_breaks != self.preserve_line_breaks:
+            return None
+        return self.collected.pop(page_num, None)
+
+    def page_plan(self, page_num: int) -> "TranslationPlan":
+        """
+        One-page plan with only the translations of that page's segments.
+
+        What a worker process needs: sending the whole plan with every page
+        would cost O(pages^2) in pickled bytes. The page's collected
+        structure is released here (workers collect it again); pages the
+        plan did not collect get no translations and are translated by
+        the worker.
+        """
+        collected = self.collected.pop(page_num, None)
+        segments = collected["segments"] if collected else ()
+        return TranslationPlan(
+            pages=[page_num],
+            translations={text: self.translations[text] for text in segments if text in self.translations},
+            preserve_line_breaks=self.preserve_line_breaks,
+        )
+
+    def summary(self) -> str:
+        """One-line description for logs and status bars."""
+        return (
+            f"{len(self.pages)} pages, {self.total_segments} segments, "
+            f"{self.unique_segments} unique ({self.model_calls_saved} model calls saved, "
+            f"{self.dedup_ratio:.0%}), {len(self.skipped_pages)} pages skipped, "
+            f"{self.elapsed:.1f}s"
+        )
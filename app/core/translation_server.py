@@ -0,0 +1,693 @@
+"""
+Local translation server - one set of OPUS-MT weights per host.
+
+Every MainWindow and every script otherwise loads its own copy of the
+models (~300 MB per language pair). The server hosts TranslationEngine in
+a single process; clients connect over a Unix socket (localhost TCP on
+Windows) and use RemoteTranslationEngine, which has the same
+translate()/translate_batch()/set_languages() interface.
+
+Concurrent requests are coalesced into micro-batches: the batcher waits up
+to max_wait_ms after the first request for others to arrive, then hands
+them to translate_batch() together, so several documents translated at
+once share padded generate() calls instead of queueing one by one.
+
+Protocol: each message is a 4-byte big-endian length followed by a UTF-8
+JSON object. Requests carry an "op" ("translate", "load", "stats",
+"ping"); responses carry "ok" and either the result or "error".
+
+Address: LAC_MT_SERVER, "unix:/path/to.sock" or "tcp:127.0.0.1:47613".
+
+Usage:
+    python -m app.core.translation_server --preload en-it
+
+    from app.core.translation_server import RemoteTranslationEngine
+
+    translator = RemoteTranslationEngine("en", "it")
+    translator.translate("Hello world")
+    translator.stats()  # queue depth, batch sizes, latency
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .sentry_integration import capture_exception
+
+logger = logging.getLogger(__name__)
+
+# Server address shared by server and clients
+SERVER_ADDRESS_ENV = "LAC_MT_SERVER"
+DEFAULT_TCP_PORT = 47613
+
+# Micro-batching: wait this long after the first request for more, and
+# stop collecting once a batch holds this many segments
+DEFAULT_MAX_WAIT_MS = 10.0
+DEFAULT_MAX_BATCH = 64
+
+# Refuse frames larger than this (a corrupt length prefix would otherwise
+# make the reader allocate gigabytes)
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+_HEADER = struct.Struct(">I")
+
+
+def default_address() -> str:
+    """Per-user Unix socket in the temp directory, or localhost TCP on Windows."""
+    if os.name != "nt" and hasattr(socket, "AF_UNIX"):
+        user = os.getuid() if hasattr(os, "getuid") else "user"
+        return f"unix:{Path(tempfile.gettempdir()) / f'lac-translate-{user}.sock'}"
+    return f"tcp:127.0.0.1:{DEFAULT_TCP_PORT}"
+
+
+def parse_address(address: str) -> Tuple[int, object]:
+    """
+    Parse "unix:/path" or "tcp:host:port" into (socket family, address).
+
+    Raises:
+        ValueError: Malformed address
+    """
+    scheme, _, target = address.partition(":")
+    if scheme == "unix" and target:
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError(f"Unix sockets are not available on this platform: {address}")
+        return socket.AF_UNIX, target
+    if scheme == "tcp":
+        host, _, port = target.rpartition(":")
+        if host and port.isdigit():
+            return socket.AF_INET, (host, int(port))
+    raise ValueError(f"Invalid translation server address '{address}' (expected unix:PATH or tcp:HOST:PORT)")
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Read exactly size bytes; None if the peer closed before the first byte."""
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            if not buffer:
+                return None
+            raise ConnectionError("Connection closed mid-frame")
+        buffer += chunk
+    return bytes(buffer)
+
+
+def send_frame(sock: socket.socket, message: dict) -> None:
+    """Send one length-prefixed JSON message."""
+    payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> Optional[dict]:
+    """Receive one length-prefixed JSON message; None on clean disconnect."""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Frame too large ({size} bytes)")
+    payload = _recv_exact(sock, size) if size else b""
+    if payload is None:
+        raise ConnectionError("Connection closed mid-frame")
+    return json.loads(payload.decode("utf-8"))
+
+
+@dataclass
+class _PendingRequest:
+    """One client translate request waiting for the batcher."""
+    lang_pair: Tuple[str, str]
+    texts: List[str]
+    segment_classes: Optional[List[Optional[str]]]
+    profile: Optional[str]
+    max_length: int
+    received: float = field(default_factory=time.monotonic)
+    done: threading.Event = field(default_factory=threading.Event)
+    translations: Optional[List[str]] = None
+    error: Optional[str] = None
+    error_kind: str = "error"
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    """Serves the requests of one client connection, in order."""
+
+    def handle(self):
+        app: "TranslationServer" = self.server.app
+        while True:
+            try:
+                request = recv_frame(self.request)
+            except (ConnectionError, OSError, ValueError) as e:
+                logger.debug(f"Dropping translation client: {e}")
+                return
+            if request is None:
+                return
+            try:
+                send_frame(self.request, app.handle(request))
+            except OSError as e:
+                logger.debug(f"Translation client went away: {e}")
+                return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class TranslationServer:
+    """
+    Hosts TranslationEngine for local clients with dynamic micro-batching.
+
+    Connection threads enqueue requests; a single batcher thread owns the
+    models, so generation never runs concurrently and each generate() call
+    sees as many segments as arrived within the wait window.
+    """
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ):
+        """
+        Args:
+            address: "unix:PATH" or "tcp:HOST:PORT" (default: LAC_MT_SERVER or default_address())
+            max_wait_ms: How long the batcher waits for more requests after the first
+            max_batch: Segments after which a micro-batch is dispatched without waiting
+        """
+        self.address = address or os.environ.get(SERVER_ADDRESS_ENV) or default_address()
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+
+        self._queue: "queue.Queue[_PendingRequest]" = queue.Queue()
+        self._engines: Dict[Tuple[str, str], object] = {}
+        self._engines_lock = threading.Lock()
+        self._stopping = threading.Event()
+        # Held while enqueueing and by close() while stopping, so no
+        # request is queued after close() drained the queue
+        self._enqueue_lock = threading.Lock()
+        self._server: Optional[socketserver.BaseServer] = None
+        self._batcher: Optional[threading.Thread] = None
+        self._serve_thread: Optional[threading.Thread] = None
+
+        # Statistics
+        self._stats_lock = threading.Lock()
+        self._started = time.monotonic()
+        self._requests = 0
+        self._segments = 0
+        self._batches = 0
+        self._batched_requests = 0
+        self._in_flight = 0
+        self._latencies = deque(maxlen=1024)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def _bind(self) -> None:
+        family, target = parse_address(self.address)
+        if family == socket.AF_INET:
+            if target[0] not in ("127.0.0.1", "localhost", "::1"):
+                logger.warning(f"Translation server listening on non-loopback address {target[0]}")
+            self._server = _TCPServer(target, _ConnectionHandler)
+        else:
+            path = Path(target)
+            if path.exists():
+                # Stale socket from a crashed server (a live one would answer)
+                probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    probe.connect(str(path))
+                except OSError:
+                    path.unlink()
+                else:
+                    raise OSError(f"A translation server is already running at {self.address}")
+                finally:
+                    probe.close()
+            self._server = _UnixServer(str(path), _ConnectionHandler)
+            os.chmod(path, 0o600)
+        self._server.app = self
+
+    def start(self) -> "TranslationServer":
+        """Bind and serve on background threads; returns self."""
+        self._bind()
+        self._stopping.clear()
+        self._batcher = threading.Thread(target=self._batch_loop, name="mt-server-batcher", daemon=True)
+        self._batcher.start()
+        self._serve_thread = threading.Thread(
+            target=self._server.serve_forever, name="mt-server-accept", daemon=True
+        )
+        self._serve_thread.start()
+        logger.info(
+            f"Translation server listening on {self.address} "
+            f"(max wait {self.max_wait * 1000:.0f} ms, max batch {self.max_batch})"
+        )
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve until interrupted (Ctrl+C)."""
+        self.start()
+        try:
+            while not self._stopping.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            logger.info("Translation server interrupted")
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stop accepting connections and the batcher; fail queued requests."""
+        with self._enqueue_lock:
+            self._stopping.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            family, target = parse_address(self.address)
+            if family != socket.AF_INET:
+                Path(target).unlink(missing_ok=True)
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.join(timeout=5.0)
+            self._batcher = None
+        while True:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.error, pending.error_kind = "Translation server shutting down", "unavailable"
+            pending.done.set()
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def handle(self, request: dict) -> dict:
+        """Answer one protocol message (called on connection threads)."""
+        op = request.get("op")
+        try:
+            if op == "translate":
+                return self._handle_translate(request)
+            if op == "load":
+                self.load(request["source_lang"], request["target_lang"])
+                return {"ok": True}
+            if op == "stats":
+                return {"ok": True, "stats": self.stats()}
+            if op == "ping":
+                return {"ok": True}
+            return {"ok": False, "error": f"Unknown op '{op}'", "kind": "value"}
+        except (KeyError, TypeError, ValueError) as e:
+            return {"ok": False, "error": str(e), "kind": "value"}
+
+    def _handle_translate(self, request: dict) -> dict:
+        texts = [str(text) for text in request["texts"]]
+        segment_classes = request.get("segment_classes")
+        if segment_classes is not None and len(segment_classes) != len(texts):
+            raise ValueError("segment_classes must match texts")
+        pending = _PendingRequest(
+            lang_pair=(request["source_lang"], request["target_lang"]),
+            texts=texts,
+            segment_classes=segment_classes,
+            profile=request.get("profile"),
+            max_length=int(request.get("max_length", 512)),
+        )
+        if not texts:
+            return {"ok": True, "translations": []}
+        with self._enqueue_lock:
+            if self._stopping.is_set():
+                return {"ok": False, "error": "Translation server shutting down", "kind": "unavailable"}
+            with self._stats_lock:
+                self._requests += 1
+                self._segments += len(texts)
+            self._queue.put(pending)
+
+        # The batcher answers every queued request; if it died, nobody will
+        while not pending.done.wait(1.0):
+            batcher = self._batcher
+            if batcher is None or not batcher.is_alive():
+                return {"ok": False, "error": "Translation server batcher stopped", "kind": "unavailable"}
+
+        if pending.error is not None:
+            return {"ok": False, "error": pending.error, "kind": pending.error_kind}
+        return {"ok": True, "translations": pending.translations}
+
+    def load(self, source_lang: str, target_lang: str) -> None:
+        """Start loading a language pair (ValueError if unsupported)."""
+        self._engine_for((source_lang, target_lang))
+
+    def _engine_for(self, lang_pair: Tuple[str, str]):
+        """Engine for a language pair (created once; starts the model preload)."""
+        from .translator import TranslationEngine
+
+        with self._engines_lock:
+            engine = self._engines.get(lang_pair)
+            if engine is None:
+                engine = TranslationEngine(*lang_pair)
+                self._engines[lang_pair] = engine
+            return engine
+
+    # ------------------------------------------------------------------
+    # Micro-batching
+    # ------------------------------------------------------------------
+
+    def _batch_loop(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            # Collect whatever arrives within the wait window
+            batch = [first]
+            segments = len(first.texts)
+            deadline = time.monotonic() + self.max_wait
+            while segments < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(pending)
+                segments += len(pending.texts)
+
+            with self._stats_lock:
+                self._in_flight = len(batch)
+                self._batches += 1
+                self._batched_requests += len(batch)
+            try:
+                self._run_batch(batch)
+            finally:
+                now = time.monotonic()
+                with self._stats_lock:
+                    self._in_flight = 0
+                    self._latencies.extend(now - pending.received for pending in batch)
+                for pending in batch:
+                    pending.done.set()
+
+    def _run_batch(self, batch: List[_PendingRequest]) -> None:
+        """Translate a micro-batch: one translate_batch() per pair/profile/max_length."""
+        groups: Dict[tuple, List[_PendingRequest]] = {}
+        for pending in batch:
+            groups.setdefault((pending.lang_pair, pending.profile, pending.max_length), []).append(pending)
+
+        for (lang_pair, profile, max_length), requests in groups.items():
+            texts = [text for pending in requests for text in pending.texts]
+            segment_classes = None
+            if any(pending.segment_classes for pending in requests):
+                segment_classes = [
+                    segment_class
+                    for pending in requests
+                    for segment_class in (pending.segment_classes or [None] * len(pending.texts))
+                ]
+            logger.debug(
+                f"Micro-batch {lang_pair[0]}->{lang_pair[1]}: "
+                f"{len(requests)} requests, {len(texts)} segments"
+            )
+            try:
+                engine = self._engine_for(lang_pair)
+                translations = engine.translate_batch(
+                    texts, max_length=max_length, profile=profile, segment_classes=segment_classes
+                )
+            except ValueError as e:
+                for pending in requests:
+                    pending.error, pending.error_kind = str(e), "value"
+                continue
+            except Exception as e:
+                capture_exception(e, context={
+                    "operation": "translation_server_batch",
+                    "requests": len(requests),
+                    "segments": len(texts),
+                    "source_lang": lang_pair[0],
+                    "target_lang": lang_pair[1],
+                }, tags={"component": "translation_server"})
+                logger.error(f"Translation server batch failed: {e}")
+                for pending in requests:
+                    pending.error = str(e)
+                continue
+
+            start = 0
+            for pending in requests:
+                pending.translations = translations[start:start + len(pending.texts)]
+                start += len(pending.texts)
+
+    # ------------------------------------------------------------------
+    # Diagnostics
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        """Queue depth, batching and latency figures."""
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            batches = self._batches
+
+            def percentile(fraction: float) -> Optional[float]:
+                if not latencies:
+                    return None
+                return round(latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000, 1)
+
+            return {
+                "address": self.address,
+                "uptime_s": round(time.monotonic() - self._started, 1),
+                "queue_depth": self._queue.qsize(),
+                "in_flight": self._in_flight,
+                "requests": self._requests,
+                "segments": self._segments,
+                "batches": batches,
+                "requests_per_batch": round(self._batched_requests / batches, 2) if batches else 0.0,
+                "latency_p50_ms": percentile(0.5),
+                "latency_p95_ms": percentile(0.95),
+                "languages": [f"{src}-{tgt}" for src, tgt in self._engines],
+            }
+
+
+class RemoteTranslationEngine:
+    """
+    TranslationEngine stand-in that translates through a TranslationServer.
+
+    Exposes the interface PDFProcessor and MainWindow use (translate(),
+    translate_batch(), set_languages(), source_lang/target_lang). One
+    connection per instance, guarded by a lock; a dropped connection is
+    re-established once per call.
+    """
+
+    def __init__(
+        self,
+        source_lang: str = "en",
+        target_lang: str = "it",
+        address: Optional[str] = None,
+        profile: Optional[str] = None,
+        timeout: Optional[float] = 600.0,
+    ):
+        """
+        Args:
+            source_lang: Source language code (ISO 639-1)
+            target_lang: Target language code (ISO 639-1)
+            address: Server address (default: LAC_MT_SERVER or default_address())
+            profile: Decoding profile sent with every request (default: server's)
+            timeout: Socket timeout in seconds (None = wait forever)
+
+        Raises:
+            ConnectionError: Server not reachable
+            ValueError: Language pair not supported
+        """
+        self.address = address or os.environ.get(SERVER_ADDRESS_ENV) or default_address()
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.profile = profile
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+
+        # Validate the pair and let the server start loading it
+        self._call({"op": "load", "source_lang": source_lang, "target_lang": target_lang})
+
+    @classmethod
+    def from_environment(cls, source_lang: str, target_lang: str) -> Optional["RemoteTranslationEngine"]:
+        """Client for the server named by LAC_MT_SERVER, or None if unset or unreachable."""
+        address = os.environ.get(SERVER_ADDRESS_ENV)
+        if not address:
+            return None
+        try:
+            engine = cls(source_lang, target_lang, address=address)
+        except (ConnectionError, OSError) as e:
+            logger.warning(f"Translation server {address} not reachable, using local models: {e}")
+            return None
+        logger.info(f"Using translation server at {address}")
+        return engine
+
+    @staticmethod
+    def server_available(address: Optional[str] = None, timeout: float = 1.0) -> bool:
+        """True if a translation server answers at address."""
+        address = address or os.environ.get(SERVER_ADDRESS_ENV) or default_address()
+        try:
+            family, target = parse_address(address)
+            with socket.socket(family, socket.SOCK_STREAM) as sock:
+                sock.settimeout(timeout)
+                sock.connect(target)
+                send_frame(sock, {"op": "ping"})
+                response = recv_frame(sock)
+        except (OSError, ValueError):
+            return False
+        return bool(response and response.get("ok"))
+
+    def _connect(self) -> socket.socket:
+        family, target = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(target)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _call(self, request: dict) -> dict:
+        """
+        Send one request and return the successful response.
+
+        Retried once on a new connection if it could not be sent, or if
+        the server closed the connection before answering (a stale
+        connection). Never after a timeout or a partial answer: the
+        server may still be working on it.
+        """
+        with self._lock:
+            for attempt in range(2):
+                sent = False
+                try:
+                    if self._sock is None:
+                        self._sock = self._connect()
+                    send_frame(self._sock, request)
+                    sent = True
+                    response = recv_frame(self._sock)
+                except OSError as e:
+                    self.close()
+                    if sent:
+                        raise ConnectionError(f"Translation server {self.address} did not answer: {e}") from e
+                    if attempt:
+                        raise ConnectionError(f"Translation server {self.address} not reachable: {e}") from e
+                    continue
+                if response is None:
+                    self.close()
+                    if attempt:
+                        raise ConnectionError("Translation server closed the connection")
+                    continue
+                break
+
+        if not response.get("ok"):
+            error = response.get("error", "Translation server error")
+            if response.get("kind") == "value":
+                raise ValueError(error)
+            if response.get("kind") == "unavailable":
+                raise ConnectionError(error)
+            raise RuntimeError(error)
+        return response
+
+    def close(self) -> None:
+        """Close the connection (reopened on the next call)."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    def translate(
+        self,
+        text: str,
+        max_length: int = 512,
+        profile: Optional[str] = None,
+        segment_class: Optional[str] = None,
+    ) -> str:
+        """Translate one text (see TranslationEngine.translate())."""
+        if not text or len(text.strip()) < 2:
+            return text
+        return self.translate_batch(
+            [text],
+            max_length=max_length,
+            profile=profile,
+            segment_classes=[segment_class] if segment_class else None,
+        )[0]
+
+    def translate_batch(
+        self,
+        texts: List[str],
+        max_length: int = 512,
+        batch_size: Optional[int] = None,
+        profile: Optional[str] = None,
+        segment_classes: Optional[List[Optional[str]]] = None,
+    ) -> List[str]:
+        """
+        Translate many segments (see TranslationEngine.translate_batch()).
+
+        batch_size is accepted for compatibility; the server decides how
+        segments are batched.
+        """
+        if not texts:
+            return []
+        response = self._call({
+            "op": "translate",
+            "source_lang": self.source_lang,
+            "target_lang": self.target_lang,
+            "texts": list(texts),
+            "segment_classes": list(segment_classes) if segment_classes else None,
+            "profile": profile or self.profile,
+            "max_length": max_length,
+        })
+        return response["translations"]
+
+    def set_languages(self, source_lang: str, target_lang: str) -> None:
+        """Switch language pair (the server starts loading it in the background)."""
+        if (source_lang, target_lang) != (self.source_lang, self.target_lang):
+            self._call({"op": "load", "source_lang": source_lang, "target_lang": target_lang})
+            self.source_lang = source_lang
+            self.target_lang = target_lang
+            logger.info(f"Languages updated: {source_lang} -> {target_lang}")
+
+    def stats(self) -> dict:
+        """Server statistics (queue depth, batching, latency)."""
+        return self._call({"op": "stats"})["stats"]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.core.translation_server",
+        description="Serve OPUS-MT translation to local LAC Translate clients.",
+    )
+    parser.add_argument("--address", help=f"unix:PATH or tcp:HOST:PORT (default: ${SERVER_ADDRESS_ENV} or {default_address()})")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                        help="Wait for more requests after the first one (default: %(default)s)")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH,
+                        help="Segments that dispatch a micro-batch immediately (default: %(default)s)")
+    parser.add_argument("--preload", action="append", default=[], metavar="SRC-TGT",
+                        help="Language pair to load at startup (repeatable), e.g. en-it")
+    parser.add_argument("--log-level", default=os.environ.get("LOG_LEVEL", "INFO"))
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper(), logging.INFO),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+    server = TranslationServer(args.address, max_wait_ms=args.max_wait_ms, max_batch=args.max_batch)
+    for pair in args.preload:
+        source_lang, _, target_lang = pair.partition("-")
+        server.load(source_lang, target_lang)
+    server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
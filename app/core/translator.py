@@ -4,14 +4,162 @@ World-class translation using Helsinki-NLP OPUS-MT models.
 Lightweight (~300MB per language pair), fast, and superior quality to Argos.
 Completely offline for privacy and security.
 """
+import gc
+import importlib.util
+import itertools
 import logging
+import os
 import re
+import sys
+import threading
+import time
 import unicodedata
-from typing import Optional, Dict, List, Tuple
-from transformers import MarianMTModel, MarianTokenizer
-import torch
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Dict, List, Tuple
 
+from .config import DECODING_PROFILES, DEFAULT_DECODING_PROFILE, DecodingProfile
+from .onnx_marian import OnnxMarianModel, export_marian, onnx_export_dir
+from .resources import get_governor
 from .sentry_integration import capture_exception
+from .translation_memory import TranslationMemory
+
+
+# Inference precision, e.g. "int8" or "en-it:int8,it-en:bf16" (bare value = default)
+PRECISION_ENV = "LAC_MT_PRECISION"
+
+PRECISION_MODES = ("fp32", "int8", "bf16")
+
+# Inference backend: "auto" (ONNX when an export exists, else torch),
+# "onnx" (export on first use if needed) or "torch"
+BACKEND_ENV = "LAC_MT_BACKEND"
+
+BACKENDS = ("auto", "onnx", "torch")
+
+# Model cache budget in MB of weights, and idle time (seconds) before a
+# model is unloaded (0 = never)
+MODEL_CACHE_ENV = "LAC_MT_CACHE_MB"
+MODEL_IDLE_TTL_ENV = "LAC_MT_IDLE_TTL"
+
+
+# torch, once imported by _import_torch(). torch and the transformers model
+# classes are imported only when a model runs on torch: with the ONNX
+# backend (or in builds without torch) they are never loaded.
+torch = None
+
+
+def _import_torch():
+    """Import torch on first use; None if it is not installed (ONNX Runtime-only builds)."""
+    global torch
+    if torch is None:
+        try:
+            import torch as torch_module
+        except ImportError:
+            return None
+        torch = torch_module
+        # Thread budget of the MT stage, now that there is a torch to apply it to
+        get_governor().apply_torch()
+    return torch
+
+
+def _torch_installed() -> bool:
+    return torch is not None or importlib.util.find_spec("torch") is not None
+
+
+def _load_tokenizer(model_name: str):
+    """
+    MarianTokenizer of a model.
+
+    transformers imports torch with its first import when torch is
+    installed. When the ONNX backend is selected (LAC_MT_BACKEND=onnx) and
+    transformers is not imported yet, USE_TORCH=0 keeps it from doing so:
+    the tokenizer only needs sentencepiece. Models without an ONNX export
+    then cannot fall back to torch in this process; export them ahead
+    (TranslationEngine.export_onnx()).
+    """
+    if "transformers" not in sys.modules and TranslationEngine.get_backend() == "onnx":
+        os.environ.setdefault("USE_TORCH", "0")
+    from transformers import MarianTokenizer
+    return MarianTokenizer.from_pretrained(model_name)
+
+
+def _env_number(name: str, default: float) -> float:
+    """Read a non-negative number from the environment."""
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        logging.warning(f"Ignoring invalid {name}: '{value}'")
+        return default
+
+
+def _model_nbytes(model) -> int:
+    """
+    Memory held by a model's weights.
+    
+    Counts parameters and buffers through the state dict (so dynamically
+    quantized Linear layers are measured at int8), with tied tensors such as
+    Marian's shared embeddings counted once. ONNX models report their own size.
+    """
+    nbytes = getattr(model, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    torch_module = _import_torch()
+    
+    seen = set()
+    total = 0
+    
+    def add(value):
+        nonlocal total
+        if isinstance(value, (tuple, list)):
+            for item in value:
+                add(item)
+        elif torch_module is not None and isinstance(value, torch_module.Tensor):
+            key = value.data_ptr() or id(value)
+            if key not in seen:
+                seen.add(key)
+                total += value.numel() * value.element_size()
+    
+    for value in model.state_dict().values():
+        add(value)
+    return total
+
+
+def _cpu_supports_bf16() -> bool:
+    """True if the CPU has native bfloat16 arithmetic (AVX512-BF16 or AMX)."""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8", errors="ignore") as f:
+            flags = f.read()
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def _hub_cache_dir() -> Path:
+    """Hugging Face hub cache directory (honours HF_HOME / HF_HUB_CACHE)."""
+    try:
+        from huggingface_hub import constants
+        return Path(constants.HF_HUB_CACHE)
+    except Exception:
+        return Path.home() / ".cache" / "huggingface" / "hub"
+
+
+def _quantized_model_path(model_name: str) -> Path:
+    """
+    On-disk location of a dynamically quantized model, next to the HF cache.
+    
+    The file is a pickled module, so it is tied to the torch and transformers
+    versions that produced it.
+    """
+    hub_cache = _hub_cache_dir()
+    import transformers
+    filename = (
+        f"{model_name.replace('/', '--')}"
+        f"-torch{torch.__version__}-transformers{transformers.__version__}.pt"
+    )
+    return hub_cache / "lac-translate-int8" / filename
 
 
 def split_into_sentences(text: str) -> List[str]:
@@ -92,6 +240,55 @@ def split_into_sentences(text: str) -> List[str]:
     return sentences if sentences else [text.strip()]
 
 
+def chunk_by_token_budget(
+    text: str,
+    count_tokens: Callable[[List[str]], List[int]],
+    budget: int,
+) -> List[str]:
+    """
+    Split text into pieces of at most `budget` tokens at sentence boundaries.
+    
+    Consecutive sentences are packed greedily into the same piece. A single
+    sentence longer than the budget is cut between words, using its average
+    number of tokens per word.
+    
+    Args:
+        text: Text to split
+        count_tokens: Returns the token count of each given string
+        budget: Maximum tokens per piece
+        
+    Returns:
+        Pieces in reading order (joined with spaces they restore the text,
+        whitespace normalized)
+    """
+    sentences = split_into_sentences(text)
+    if not sentences:
+        return []
+    
+    pieces = []
+    current = []
+    current_tokens = 0
+    for sentence, count in zip(sentences, count_tokens(sentences)):
+        if current and current_tokens + count > budget:
+            pieces.append(' '.join(current))
+            current = []
+            current_tokens = 0
+        
+        if count > budget:
+            # Run-on sentence (lists, bibliographies): cut between words
+            words = sentence.split()
+            step = max(1, int(budget * len(words) / count))
+            pieces.extend(' '.join(words[start:start + step]) for start in range(0, len(words), step))
+            continue
+        
+        current.append(sentence)
+        current_tokens += count
+    
+    if current:
+        pieces.append(' '.join(current))
+    return pieces
+
+
 def align_sentences_to_lines(
     translated_sentences: List[str],
     num_lines: int,
@@ -261,73 +458,224 @@ class TranslationEngine:
         "Nederlands": "nl",
     }
     
-    # Cache for loaded models (singleton per language pair)
-    # Max 4 models to limit memory usage (~1.2GB for 4 models)
+    # Cache for loaded models (singleton per language pair), bounded by the
+    # memory of their weights rather than by count: en-roa alone weighs as
+    # much as several bilingual models
     _model_cache: Dict[tuple, tuple] = {}
-    _model_cache_order: list = []  # Track insertion order for LRU eviction
-    _MAX_CACHED_MODELS = 4
+    _model_cache_order: list = []  # LRU order, least recently used first
+    _model_bytes: Dict[tuple, int] = {}
+    _last_used: Dict[tuple, float] = {}
+    MODEL_CACHE_BUDGET_BYTES = int(_env_number(MODEL_CACHE_ENV, 1200) * 1024 * 1024)
+    MODEL_IDLE_TTL = _env_number(MODEL_IDLE_TTL_ENV, 900)
+    _IDLE_CHECK_INTERVAL = 60.0
     _device = None
     
-    def __init__(self, source_lang: str = "en", target_lang: str = "it"):
+    # Background loading: one loader thread, one future per language pair
+    _preload_executor: Optional[ThreadPoolExecutor] = None
+    _preload_futures: Dict[tuple, Future] = {}
+    _janitor: Optional[threading.Thread] = None
+    _janitor_wake = threading.Event()
+    
+    # Guards the class-level caches: engines may be shared across worker threads
+    _cache_lock = threading.RLock()
+    _governor_hooked = False
+    
+    # Inference precision: requested per language pair, effective per loaded model
+    _default_precision = "fp32"
+    _pair_precision: Dict[tuple, str] = {}
+    _loaded_precision: Dict[tuple, str] = {}
+    _precision_env_checked = False
+    
+    # Inference backend (lazy from LAC_MT_BACKEND) and backend per loaded model
+    _backend: Optional[str] = None
+    _loaded_backend: Dict[tuple, str] = {}
+    ONNX_INTRA_OP_THREADS = 0  # 0 = MT share of the resource governor
+    
+    # Segments per generate() call in translate_batch()
+    DEFAULT_BATCH_SIZE = 16
+    
+    # Longer segments are split at sentence boundaries and translated in
+    # pieces: OPUS-MT truncates at 512 tokens, was trained on sentences and
+    # pays quadratic attention cost on long inputs
+    DEFAULT_CHUNK_TOKENS = 200
+    
+    # Segment classes used to pick the beam width (see DecodingProfile)
+    SEGMENT_CLASSES = ("heading", "cell", "body")
+    
+    # Persistent translation memory shared by all engines (lazy, None = unavailable)
+    _memory: Optional[TranslationMemory] = None
+    _memory_checked = False
+    
+    def __init__(
+        self,
+        source_lang: str = "en",
+        target_lang: str = "it",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        use_memory: bool = True,
+        precision: Optional[str] = None,
+        profile: str = DEFAULT_DECODING_PROFILE.name,
+        chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+    ):
         """
         Initialize translation engine with OPUS-MT.
         
+        The model is loaded on a background thread; the first translation
+        waits for it (see wait_until_ready()).
+        
         Args:
             source_lang: Source language code (ISO 639-1)
             target_lang: Target language code (ISO 639-1)
+            batch_size: Segments per generate() call in translate_batch()
+            use_memory: Consult the on-disk translation memory before generating
+            precision: "fp32", "int8" or "bf16" for this language pair
+                (default: LAC_MT_PRECISION or fp32)
+            profile: Decoding profile, "fast", "balanced" or "quality"
+            chunk_tokens: Token budget per piece for long segments
         """
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self.batch_size = batch_size
+        self.chunk_tokens = max(16, chunk_tokens)
+        self.use_memory = use_memory
+        self.profile = self._resolve_profile(profile)
         
-        # Setup device once
-        if TranslationEngine._device is None:
-            TranslationEngine._device = "cuda" if torch.cuda.is_available() else "cpu"
+        # Thread budget shared with OCR/layout (see app/core/resources.py)
+        if not TranslationEngine._governor_hooked:
+            TranslationEngine._governor_hooked = True
+            governor = get_governor()
+            governor.apply_torch()
+            governor.add_listener(TranslationEngine._on_threads_changed)
         
-        self._load_model(source_lang, target_lang)
+        if precision is not None:
+            self.set_precision(precision, source_lang, target_lang)
         
+        self._check_pair(source_lang, target_lang)
+        self.preload(source_lang, target_lang)
+    
+    def engine_options(self) -> dict:
+        """Constructor arguments that recreate this engine's settings (e.g. in worker processes)."""
+        return {
+            "batch_size": self.batch_size,
+            "use_memory": self.use_memory,
+            "profile": self.profile.name,
+            "chunk_tokens": self.chunk_tokens,
+        }
+    
     @classmethod
-    def _load_model(cls, source_lang: str, target_lang: str):
-        """Load OPUS-MT model for specific language pair (lazy initialization with LRU caching)."""
+    def _get_device(cls) -> str:
+        """
+        "cuda" if torch sees a GPU, else "cpu" (resolved once).
+        
+        The ONNX backend runs on the CPU, so it does not import torch to ask.
+        """
+        if cls._device is None:
+            torch_module = _import_torch() if cls.get_backend() != "onnx" else None
+            cls._device = "cuda" if torch_module is not None and torch_module.cuda.is_available() else "cpu"
+        return cls._device
+    
+    @classmethod
+    def _check_pair(cls, source_lang: str, target_lang: str) -> str:
+        """Model name for a language pair; ValueError if unsupported."""
+        model_name = cls.OPUS_MODEL_MAP.get((source_lang, target_lang))
+        if not model_name:
+            logging.warning(f"No OPUS-MT model for {source_lang} -> {target_lang}")
+            raise ValueError(f"Language pair not supported: {source_lang} -> {target_lang}")
+        return model_name
+    
+    @classmethod
+    def preload(cls, source_lang: str, target_lang: str) -> Future:
+        """
+        Load a language pair on the background loader thread.
+        
+        Returns a future that completes when the model is in the cache, or
+        carries the load error. Concurrent requests for the same pair share
+        one future; a failed load is retried by the next request.
+        """
         lang_pair = (source_lang, target_lang)
+        with cls._cache_lock:
+            future = cls._preload_futures.get(lang_pair)
+            if future is not None and not future.done():
+                return future
+            if lang_pair in cls._model_cache:
+                future = Future()
+                future.set_result(None)
+                return future
+            if cls._preload_executor is None:
+                cls._preload_executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="opus-mt-preload"
+                )
+            future = cls._preload_executor.submit(cls._load_model, source_lang, target_lang)
+            cls._preload_futures[lang_pair] = future
+            return future
+    
+    def wait_until_ready(self, timeout: Optional[float] = None) -> None:
+        """Block until the current language pair is loaded (raises the load error)."""
+        self.preload(self.source_lang, self.target_lang).result(timeout)
         
-        # Return cached model if available (and move to end for LRU)
-        if lang_pair in cls._model_cache:
-            logging.debug(f"Using cached OPUS-MT model: {source_lang} -> {target_lang}")
-            # Move to end of order (most recently used)
-            if lang_pair in cls._model_cache_order:
-                cls._model_cache_order.remove(lang_pair)
-            cls._model_cache_order.append(lang_pair)
-            return
+    @classmethod
+    def _load_model(cls, source_lang: str, target_lang: str):
+        """
+        Load OPUS-MT model for specific language pair into the cache.
         
-        # Evict oldest model if cache is full
-        while len(cls._model_cache) >= cls._MAX_CACHED_MODELS:
-            if cls._model_cache_order:
-                oldest = cls._model_cache_order.pop(0)
-                if oldest in cls._model_cache:
-                    del cls._model_cache[oldest]
-                    logging.info(f"Evicted cached model: {oldest[0]} -> {oldest[1]}")
+        Weights are loaded without holding the cache lock, so translations
+        with already-cached models keep running meanwhile. Least recently
+        used models are then evicted until the cache fits its byte budget.
+        """
+        lang_pair = (source_lang, target_lang)
+        with cls._cache_lock:
+            precision = cls._effective_precision(cls.get_precision(source_lang, target_lang))
+            
+            # Return cached model if available (and mark as recently used)
+            if lang_pair in cls._model_cache:
+                if cls._loaded_precision.get(lang_pair) == precision:
+                    logging.debug(f"Using cached OPUS-MT model: {source_lang} -> {target_lang}")
+                    cls._touch(lang_pair)
+                    return
+                # Cached with another precision: reload
+                cls._evict_model(lang_pair)
         
         # Get model name for this language pair
-        model_name = cls.OPUS_MODEL_MAP.get(lang_pair)
+        model_name = cls._check_pair(source_lang, target_lang)
         
-        if not model_name:
-            logging.warning(f"No OPUS-MT model for {source_lang} -> {target_lang}")
-            raise ValueError(f"Language pair not supported: {source_lang} -> {target_lang}")
-        
-        logging.info(f"Loading OPUS-MT model: {model_name}...")
+        logging.info(f"Loading OPUS-MT model: {model_name} ({precision})...")
         
         try:
-            # Load model and tokenizer
-            tokenizer = MarianTokenizer.from_pretrained(model_name)
-            model = MarianMTModel.from_pretrained(model_name)
-            model.to(cls._device)
-            model.eval()
+            # ONNX Runtime runs the fp32 export; reduced precision stays on torch
+            # unless the ONNX backend is forced
+            model = None
+            if precision == "fp32" or cls.get_backend() == "onnx":
+                model = cls._load_onnx(model_name)
+            if model is not None:
+                backend, precision = "onnx", "fp32"
+            else:
+                if _import_torch() is None:
+                    raise RuntimeError(f"PyTorch not installed and no ONNX export for {model_name}")
+                model = cls._load_weights(model_name, precision)
+                model.to(cls._get_device())
+                model.eval()
+                backend = "torch"
             
-            # Cache the model and track order
-            cls._model_cache[lang_pair] = (model, tokenizer)
-            cls._model_cache_order.append(lang_pair)
+            # After the model: an ONNX model lets the tokenizer load without torch
+            tokenizer = _load_tokenizer(model_name)
+            
+            nbytes = _model_nbytes(model)
             
-            logging.info(f"[OK] OPUS-MT model loaded: {source_lang} -> {target_lang} (cache: {len(cls._model_cache)}/{cls._MAX_CACHED_MODELS})")
+            # Cache the model, then evict least recently used ones over budget
+            with cls._cache_lock:
+                cls._model_cache[lang_pair] = (model, tokenizer)
+                cls._model_bytes[lang_pair] = nbytes
+                cls._loaded_precision[lang_pair] = precision
+                cls._loaded_backend[lang_pair] = backend
+                cls._touch(lang_pair)
+                cls._evict_over_budget(keep=lang_pair)
+                cached_bytes = sum(cls._model_bytes.values())
+            
+            logging.info(
+                f"[OK] OPUS-MT model loaded: {source_lang} -> {target_lang} [{backend}, {precision}] "
+                f"({nbytes / 2**20:.0f} MB, cache: {cached_bytes / 2**20:.0f}/"
+                f"{cls.MODEL_CACHE_BUDGET_BYTES / 2**20:.0f} MB)"
+            )
+            cls._start_janitor()
             
         except Exception as e:
             capture_exception(e, context={
@@ -335,34 +683,538 @@ class TranslationEngine:
                 "model_name": model_name,
                 "source_lang": source_lang,
                 "target_lang": target_lang,
+                "precision": precision,
             }, tags={"component": "translator"})
             logging.error(f"Failed to load OPUS-MT model: {e}")
             raise
     
+    @classmethod
+    def _load_weights(cls, model_name: str, precision: str):
+        """
+        Load MarianMT weights in the requested precision.
+        
+        int8 applies dynamic quantization to every Linear layer (weights
+        stored as int8, activations quantized on the fly). The quantized
+        model is saved once next to the HF cache, so later runs skip both
+        the fp32 load and the quantization pass.
+        """
+        from transformers import MarianMTModel
+        
+        if precision == "int8":
+            path = _quantized_model_path(model_name)
+            if path.exists():
+                try:
+                    model = torch.load(path, map_location="cpu", weights_only=False)
+                    logging.info(f"Loaded quantized model from {path}")
+                    return model
+                except Exception as e:
+                    logging.warning(f"Quantized model cache unreadable ({e}), rebuilding")
+            
+            model = MarianMTModel.from_pretrained(model_name)
+            model.eval()
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_suffix(".tmp")
+                torch.save(model, tmp_path)
+                os.replace(tmp_path, path)
+                logging.info(f"Quantized model cached: {path}")
+            except Exception as e:
+                logging.warning(f"Could not cache quantized model: {e}")
+            return model
+        
+        model = MarianMTModel.from_pretrained(model_name)
+        if precision == "bf16":
+            model = model.to(dtype=torch.bfloat16)
+        return model
+    
+    @classmethod
+    def _load_onnx(cls, model_name: str) -> Optional[OnnxMarianModel]:
+        """
+        Open the ONNX export of a model, or None to use torch.
+        
+        "auto" only uses an existing export; "onnx" exports on first use
+        (needs torch + optimum) and falls back to torch if that fails.
+        """
+        backend = cls.get_backend()
+        if backend == "torch" or cls._get_device() != "cpu":
+            return None
+        
+        export_dir = onnx_export_dir(model_name, _hub_cache_dir())
+        if not OnnxMarianModel.is_exported(export_dir):
+            if backend == "auto":
+                return None
+            try:
+                export_marian(model_name, export_dir)
+            except Exception as e:
+                logging.warning(f"ONNX export of {model_name} failed ({e}), using torch")
+                return None
+        
+        try:
+            threads = cls.ONNX_INTRA_OP_THREADS or get_governor().threads_for("mt")
+            return OnnxMarianModel(export_dir, intra_op_threads=threads)
+        except Exception as e:
+            capture_exception(e, context={
+                "operation": "load_onnx_model",
+                "model_name": model_name,
+                "export_dir": str(export_dir),
+            }, tags={"component": "translator"})
+            logging.warning(f"ONNX model unusable ({e}), using torch")
+            return None
+    
+    @classmethod
+    def export_onnx(cls, source_lang: str, target_lang: str) -> Path:
+        """Export a language pair to ONNX ahead of time (build scripts, installers)."""
+        model_name = cls.OPUS_MODEL_MAP.get((source_lang, target_lang))
+        if not model_name:
+            raise ValueError(f"Language pair not supported: {source_lang} -> {target_lang}")
+        return export_marian(model_name, onnx_export_dir(model_name, _hub_cache_dir()))
+    
+    @classmethod
+    def set_backend(cls, backend: str, intra_op_threads: Optional[int] = None) -> None:
+        """
+        Select the inference backend; loaded models are reloaded on next use.
+        
+        Args:
+            backend: "auto", "onnx" or "torch"
+            intra_op_threads: ONNX Runtime threads per operator (None = unchanged)
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}' (expected one of {BACKENDS})")
+        if intra_op_threads is not None:
+            cls.ONNX_INTRA_OP_THREADS = intra_op_threads
+        if backend != cls._backend:
+            cls._backend = backend
+            cls.clear_cache()
+        logging.info(f"OPUS-MT backend set to {backend}")
+    
+    @classmethod
+    def get_backend(cls) -> str:
+        """Requested inference backend (LAC_MT_BACKEND, default "auto")."""
+        if cls._backend is None:
+            backend = os.environ.get(BACKEND_ENV, "auto").strip().lower() or "auto"
+            if backend not in BACKENDS:
+                logging.warning(f"Ignoring invalid {BACKEND_ENV}: '{backend}'")
+                backend = "auto"
+            cls._backend = backend
+        return cls._backend
+    
+    @classmethod
+    def _evict_model(cls, lang_pair: tuple) -> None:
+        """Drop one model from the cache."""
+        with cls._cache_lock:
+            cls._model_cache.pop(lang_pair, None)
+            cls._model_bytes.pop(lang_pair, None)
+            cls._last_used.pop(lang_pair, None)
+            cls._loaded_precision.pop(lang_pair, None)
+            cls._loaded_backend.pop(lang_pair, None)
+            if lang_pair in cls._model_cache_order:
+                cls._model_cache_order.remove(lang_pair)
+    
+    @classmethod
+    def _touch(cls, lang_pair: tuple) -> None:
+        """Mark a cached model as most recently used (caller holds _cache_lock)."""
+        if lang_pair in cls._model_cache_order:
+            cls._model_cache_order.remove(lang_pair)
+        cls._model_cache_order.append(lang_pair)
+        cls._last_used[lang_pair] = time.time()
+    
+    @classmethod
+    def _evict_over_budget(cls, keep: tuple) -> None:
+        """Evict least recently used models until the cache fits its budget (lock held)."""
+        while sum(cls._model_bytes.values()) > cls.MODEL_CACHE_BUDGET_BYTES:
+            victim = next((pair for pair in cls._model_cache_order if pair != keep), None)
+            if victim is None:
+                break
+            freed = cls._model_bytes.get(victim, 0)
+            cls._evict_model(victim)
+            logging.info(f"Evicted cached model: {victim[0]} -> {victim[1]} ({freed / 2**20:.0f} MB, over budget)")
+    
+    @classmethod
+    def configure_cache(
+        cls,
+        budget_mb: Optional[float] = None,
+        idle_ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Change the model cache limits.
+        
+        Args:
+            budget_mb: Memory budget for cached weights in MB
+            idle_ttl: Seconds a model may stay unused before it is unloaded (0 = never)
+        """
+        with cls._cache_lock:
+            if budget_mb is not None:
+                cls.MODEL_CACHE_BUDGET_BYTES = int(budget_mb * 1024 * 1024)
+                most_recent = cls._model_cache_order[-1] if cls._model_cache_order else None
+                cls._evict_over_budget(keep=most_recent)
+            if idle_ttl is not None:
+                cls.MODEL_IDLE_TTL = max(0.0, idle_ttl)
+                cls._janitor_wake.set()
+        cls._start_janitor()
+    
+    @classmethod
+    def unload_idle(cls, ttl: Optional[float] = None) -> List[tuple]:
+        """
+        Unload models not used for ttl seconds (default: MODEL_IDLE_TTL).
+        
+        Returns:
+            The language pairs that were unloaded
+        """
+        ttl = cls.MODEL_IDLE_TTL if ttl is None else ttl
+        if ttl <= 0:
+            return []
+        cutoff = time.time() - ttl
+        with cls._cache_lock:
+            idle = [pair for pair in cls._model_cache if cls._last_used.get(pair, 0) < cutoff]
+            for pair in idle:
+                freed = cls._model_bytes.get(pair, 0)
+                cls._evict_model(pair)
+                logging.info(f"Unloaded idle model: {pair[0]} -> {pair[1]} ({freed / 2**20:.0f} MB)")
+        if idle:
+            gc.collect()
+        return idle
+    
+    @classmethod
+    def _start_janitor(cls) -> None:
+        """Start the idle-unload thread if models are cached and a TTL is set."""
+        with cls._cache_lock:
+            if cls.MODEL_IDLE_TTL <= 0 or not cls._model_cache:
+                return
+            if cls._janitor is not None and cls._janitor.is_alive():
+                return
+            cls._janitor = threading.Thread(
+                target=cls._janitor_loop, name="opus-mt-idle-unload", daemon=True
+            )
+            cls._janitor.start()
+    
+    @classmethod
+    def _janitor_loop(cls) -> None:
+        """Periodically unload idle models; exits when the cache is empty."""
+        while True:
+            # Woken early when the TTL changes
+            cls._janitor_wake.wait(min(cls._IDLE_CHECK_INTERVAL, max(1.0, cls.MODEL_IDLE_TTL / 2)))
+            cls._janitor_wake.clear()
+            cls.unload_idle()
+            with cls._cache_lock:
+                if not cls._model_cache or cls.MODEL_IDLE_TTL <= 0:
+                    cls._janitor = None
+                    return
+    
+    @classmethod
+    def _on_threads_changed(cls, allocation) -> None:
+        """Follow the governor's MT share (torch now, ONNX sessions on reload)."""
+        get_governor().apply_torch()
+        if cls.ONNX_INTRA_OP_THREADS:
+            return
+        with cls._cache_lock:
+            for lang_pair, (model, _) in list(cls._model_cache.items()):
+                if isinstance(model, OnnxMarianModel) and model.intra_op_threads != allocation.mt:
+                    # ONNX Runtime fixes threads per session: reopen on next use
+                    cls._evict_model(lang_pair)
+    
+    @classmethod
+    def set_precision(
+        cls,
+        precision: str,
+        source_lang: Optional[str] = None,
+        target_lang: Optional[str] = None,
+    ) -> None:
+        """
+        Select the inference precision, for one language pair or as default.
+        
+        Loaded models with a different precision are dropped and reloaded
+        on next use.
+        
+        Args:
+            precision: "fp32", "int8" or "bf16"
+            source_lang: Source language of the pair (None = default for all pairs)
+            target_lang: Target language of the pair
+        """
+        if precision not in PRECISION_MODES:
+            raise ValueError(f"Unknown precision '{precision}' (expected one of {PRECISION_MODES})")
+        cls._load_precision_environment()
+        with cls._cache_lock:
+            if source_lang is None or target_lang is None:
+                cls._default_precision = precision
+                affected = [pair for pair in cls._model_cache if pair not in cls._pair_precision]
+            else:
+                cls._pair_precision[(source_lang, target_lang)] = precision
+                affected = [(source_lang, target_lang)]
+            
+            # Loaded with another precision: drop, reloaded on next use
+            for pair in affected:
+                if pair in cls._model_cache and cls._loaded_precision.get(pair) != cls._effective_precision(precision):
+                    cls._evict_model(pair)
+        logging.info(
+            f"OPUS-MT precision set to {precision} "
+            f"for {f'{source_lang} -> {target_lang}' if source_lang and target_lang else 'all pairs'}"
+        )
+    
+    @classmethod
+    def get_precision(cls, source_lang: str, target_lang: str) -> str:
+        """Requested precision for a language pair."""
+        cls._load_precision_environment()
+        return cls._pair_precision.get((source_lang, target_lang), cls._default_precision)
+    
+    @classmethod
+    def _effective_precision(cls, precision: str) -> str:
+        """Downgrade a requested precision the current hardware cannot run well."""
+        if precision == "fp32" or not _torch_installed():
+            return "fp32"
+        device = cls._get_device()
+        if precision == "int8" and device != "cpu":
+            logging.warning("int8 dynamic quantization is CPU-only, using fp32")
+            return "fp32"
+        if precision == "bf16":
+            supported = _import_torch().cuda.is_bf16_supported() if device == "cuda" else _cpu_supports_bf16()
+            if not supported:
+                logging.warning("bfloat16 not supported natively on this device, using fp32")
+                return "fp32"
+        return precision
+    
+    @classmethod
+    def _load_precision_environment(cls) -> None:
+        """Apply LAC_MT_PRECISION once (e.g. "int8" or "en-it:int8,it-en:bf16")."""
+        if cls._precision_env_checked:
+            return
+        cls._precision_env_checked = True
+        for entry in os.environ.get(PRECISION_ENV, "").split(","):
+            entry = entry.strip().lower()
+            if not entry:
+                continue
+            pair, _, precision = entry.rpartition(":")
+            if precision not in PRECISION_MODES:
+                logging.warning(f"Ignoring invalid {PRECISION_ENV} entry: '{entry}'")
+                continue
+            if not pair:
+                cls._default_precision = precision
+            elif "-" in pair:
+                source_lang, target_lang = pair.split("-", 1)
+                cls._pair_precision[(source_lang, target_lang)] = precision
+            else:
+                logging.warning(f"Ignoring invalid {PRECISION_ENV} entry: '{entry}'")
+    
+    @classmethod
+    def loaded_model(cls, source_lang: str, target_lang: str) -> Optional[tuple]:
+        """(model, tokenizer, precision, backend) of a cached pair, or None."""
+        lang_pair = (source_lang, target_lang)
+        with cls._cache_lock:
+            entry = cls._model_cache.get(lang_pair)
+            if entry is None:
+                return None
+            return (*entry, cls._loaded_precision.get(lang_pair), cls._loaded_backend.get(lang_pair))
+    
+    @classmethod
+    def adopt_model(
+        cls,
+        source_lang: str,
+        target_lang: str,
+        model,
+        tokenizer,
+        precision: str = "fp32",
+        backend: str = "torch",
+    ) -> None:
+        """
+        Put an already-loaded model into the cache (e.g. weights shared by a
+        parent process, see app/core/worker_pool.py).
+        """
+        lang_pair = (source_lang, target_lang)
+        with cls._cache_lock:
+            cls._model_cache[lang_pair] = (model, tokenizer)
+            cls._model_bytes[lang_pair] = _model_nbytes(model)
+            cls._loaded_precision[lang_pair] = precision
+            cls._loaded_backend[lang_pair] = backend
+            cls._pair_precision[lang_pair] = precision
+            cls._touch(lang_pair)
+    
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        """
+        Make the class state usable in a forked child.
+        
+        Threads do not survive fork: the preload executor, pending futures and
+        janitor of the parent are dead, and a lock held by one of them would
+        never be released. ONNX Runtime sessions and SQLite connections must
+        not be shared with the parent either. Cached torch models are kept
+        (copy-on-write).
+        """
+        cls._cache_lock = threading.RLock()
+        cls._preload_executor = None
+        cls._preload_futures = {}
+        cls._janitor = None
+        cls._janitor_wake = threading.Event()
+        cls._memory = None
+        cls._memory_checked = False
+        for lang_pair, (model, _) in list(cls._model_cache.items()):
+            if isinstance(model, OnnxMarianModel):
+                cls._evict_model(lang_pair)
+    
     @classmethod
     def clear_cache(cls):
         """Clear all cached models to free memory."""
-        cls._model_cache.clear()
-        cls._model_cache_order.clear()
+        with cls._cache_lock:
+            cls._model_cache.clear()
+            cls._model_cache_order.clear()
+            cls._model_bytes.clear()
+            cls._last_used.clear()
+            cls._loaded_precision.clear()
+            cls._loaded_backend.clear()
         logging.info("Translation model cache cleared")
     
     @classmethod
     def get_cache_info(cls) -> dict:
-        """Get information about cached models."""
-        return {
-            "cached_models": list(cls._model_cache.keys()),
-            "count": len(cls._model_cache),
-            "max_size": cls._MAX_CACHED_MODELS,
-        }
+        """Get information about cached models and the translation memory."""
+        memory = cls._get_memory()
+        with cls._cache_lock:
+            info = {
+                "cached_models": list(cls._model_cache.keys()),
+                "count": len(cls._model_cache),
+                "bytes": sum(cls._model_bytes.values()),
+                "budget_bytes": cls.MODEL_CACHE_BUDGET_BYTES,
+                "model_bytes": {
+                    f"{src}-{tgt}": nbytes
+                    for (src, tgt), nbytes in cls._model_bytes.items()
+                },
+                "idle_ttl": cls.MODEL_IDLE_TTL,
+                "loading": [
+                    pair for pair, future in cls._preload_futures.items() if not future.done()
+                ],
+                "precision": {
+                    f"{src}-{tgt}": precision
+                    for (src, tgt), precision in cls._loaded_precision.items()
+                },
+                "default_precision": cls._default_precision,
+                "backend": {
+                    f"{src}-{tgt}": backend
+                    for (src, tgt), backend in cls._loaded_backend.items()
+                },
+            }
+        info["threads"] = get_governor().snapshot()
+        info["translation_memory"] = memory.stats() if memory else None
+        return info
+    
+    @classmethod
+    def _get_memory(cls) -> Optional[TranslationMemory]:
+        """Open the shared translation memory on first use."""
+        with cls._cache_lock:
+            if not cls._memory_checked:
+                cls._memory_checked = True
+                cls._memory = TranslationMemory.from_environment()
+        return cls._memory
+    
+    @classmethod
+    def _expected_backend(cls, source_lang: str, target_lang: str) -> Tuple[str, str]:
+        """
+        Backend and precision a language pair runs with.
+        
+        Taken from the loaded model, or else decided as _load_model() will:
+        the ONNX export when the precision allows it and the export exists,
+        torch otherwise. Only a forced ONNX backend without an export (the
+        export may still fail) waits for the model to load.
+        """
+        lang_pair = (source_lang, target_lang)
+        for _ in range(2):
+            with cls._cache_lock:
+                if lang_pair in cls._model_cache:
+                    return cls._loaded_backend[lang_pair], cls._loaded_precision[lang_pair]
+            precision = cls._effective_precision(cls.get_precision(source_lang, target_lang))
+            backend = cls.get_backend()
+            model_name = cls.OPUS_MODEL_MAP.get(lang_pair)
+            if (
+                model_name is None
+                or backend == "torch"
+                or (precision != "fp32" and backend != "onnx")
+                or cls._get_device() != "cpu"
+            ):
+                return "torch", precision
+            if OnnxMarianModel.is_exported(onnx_export_dir(model_name, _hub_cache_dir())):
+                return "onnx", "fp32"
+            if backend == "auto":
+                return "torch", precision
+            cls.preload(source_lang, target_lang).result()
+        return "torch", precision
+    
+    def _memory_key(self, num_beams: int = 4, no_repeat_ngram_size: int = 0) -> str:
+        """
+        Translation memory namespace: outputs differ per model, backend, precision and decoding.
+        
+        Resolved before the model has loaded too (see _expected_backend()),
+        so the first batch reads the namespace it later writes to.
+        """
+        lang_pair = (self.source_lang, self.target_lang)
+        model_name = self.OPUS_MODEL_MAP.get(lang_pair, f"{lang_pair[0]}-{lang_pair[1]}")
+        backend, precision = self._expected_backend(*lang_pair)
+        if backend == "onnx":
+            key = f"{model_name}@onnx"
+        else:
+            # fp32 keeps the bare model name, so existing entries stay valid
+            key = model_name if precision == "fp32" else f"{model_name}@{precision}"
+        if (num_beams, no_repeat_ngram_size) != (4, 0):
+            key += f"#b{num_beams}n{no_repeat_ngram_size}"
+        return key
+    
+    @staticmethod
+    def _resolve_profile(profile) -> DecodingProfile:
+        """Look up a decoding profile by name (profiles pass through)."""
+        if isinstance(profile, DecodingProfile):
+            return profile
+        try:
+            return DECODING_PROFILES[profile]
+        except KeyError:
+            raise ValueError(
+                f"Unknown decoding profile '{profile}' (expected one of {tuple(DECODING_PROFILES)})"
+            ) from None
+    
+    def set_profile(self, profile: str) -> None:
+        """Select the default decoding profile ("fast", "balanced" or "quality")."""
+        self.profile = self._resolve_profile(profile)
+        logging.info(f"Decoding profile set to {self.profile.name}")
+    
+    @staticmethod
+    def classify_segment(text: str) -> str:
+        """
+        Guess the class of a segment when the caller does not know it.
+        
+        Short segments without closing punctuation (titles, labels, running
+        headers) are headings; everything else is body text.
+        """
+        stripped = text.strip()
+        if len(stripped.split()) <= 10 and stripped[-1:] not in ".;:!?,":
+            return "heading"
+        return "body"
+    
+    @staticmethod
+    def _beams_for(profile: DecodingProfile, segment_class: str, text: str) -> int:
+        """Beam width for one segment under a profile."""
+        if len(text.split()) <= profile.greedy_max_words:
+            return 1
+        if segment_class == "heading":
+            return profile.heading_beams
+        if segment_class == "cell":
+            return profile.cell_beams
+        return profile.body_beams
+    
+    @staticmethod
+    def _max_new_tokens(profile: DecodingProfile, input_tokens: int, max_length: int) -> int:
+        """Output budget proportional to the input length."""
+        budget = int(input_tokens * profile.max_new_tokens_ratio) + profile.max_new_tokens_extra
+        return max(1, min(budget, profile.max_new_tokens_cap, max_length))
     
     def _get_model(self):
         """Get the model and tokenizer for current language pair."""
         lang_pair = (self.source_lang, self.target_lang)
         
-        if lang_pair not in self._model_cache:
-            self._load_model(self.source_lang, self.target_lang)
-        
-        return self._model_cache[lang_pair]
+        while True:
+            with self._cache_lock:
+                entry = self._model_cache.get(lang_pair)
+                if entry is not None:
+                    self._touch(lang_pair)
+                    return entry
+            # Not loaded (yet): wait for the background load, re-raising its error
+            self.preload(*lang_pair).result()
     
     def _normalize_for_translation(self, text: str) -> str:
         """
@@ -444,85 +1296,275 @@ class TranslationEngine:
                         break
         return text
 
-    def translate(self, text: str, max_length: int = 512) -> str:
+    def translate(
+        self,
+        text: str,
+        max_length: int = 512,
+        profile: Optional[str] = None,
+        segment_class: Optional[str] = None,
+    ) -> str:
         """
         Translate text using OPUS-MT with superior quality and speed.
         
         Args:
             text: Text to translate
             max_length: Maximum token length (default 512)
+            profile: Decoding profile for this call (default: self.profile)
+            segment_class: "heading", "cell" or "body" (default: guessed)
             
         Returns:
             Translated text with guaranteed completeness
         """
         if not text or len(text.strip()) < 2:
             return text
+        return self.translate_batch(
+            [text],
+            max_length=max_length,
+            profile=profile,
+            segment_classes=[segment_class] if segment_class else None,
+        )[0]
+    
+    def translate_batch(
+        self,
+        texts: List[str],
+        max_length: int = 512,
+        batch_size: Optional[int] = None,
+        profile: Optional[str] = None,
+        segment_classes: Optional[List[Optional[str]]] = None,
+    ) -> List[str]:
+        """
+        Translate many segments with batched, length-bucketed generation.
+        
+        Segments found in the translation memory are answered from disk.
+        Segments longer than chunk_tokens are split at sentence boundaries
+        (see chunk_by_token_budget()) and their pieces translated alongside
+        the other segments, then rejoined. Everything is grouped by beam
+        width, sorted by token count and split into batches, so each padded
+        batch holds sequences of similar size and little compute is wasted
+        on padding. Each batch gets an output budget proportional to its
+        input (see DecodingProfile). Results are returned in input order.
         
-        # Protect URLs from being translated (they cause hallucinations)
-        text, url_placeholders = self._protect_urls(text)
+        Args:
+            texts: Segments to translate
+            max_length: Maximum token length (default 512)
+            batch_size: Sequences per generate() call (default: self.batch_size)
+            profile: Decoding profile for this call (default: self.profile)
+            segment_classes: Class per segment ("heading", "cell", "body";
+                None entries are guessed with classify_segment())
+            
+        Returns:
+            List of translations, aligned with texts. Segments shorter than
+            2 characters are returned unchanged; a failed batch keeps its
+            source texts.
+        """
+        results = list(texts)
+        decoding = self._resolve_profile(profile) if profile else self.profile
+        no_repeat = decoding.no_repeat_ngram_size
+        
+        # Protect URLs and normalize, skipping trivial segments
+        pending: List[Tuple[int, str, dict, int]] = []
+        for idx, text in enumerate(texts):
+            if not text or len(text.strip()) < 2:
+                continue
+            segment_class = segment_classes[idx] if segment_classes else None
+            if segment_class is None:
+                segment_class = self.classify_segment(text)
+            protected, url_placeholders = self._protect_urls(text)
+            source = self._normalize_for_translation(protected)
+            num_beams = self._beams_for(decoding, segment_class, source)
+            pending.append((idx, source, url_placeholders, num_beams))
         
-        # Normalize text to avoid <unk> tokens that cause truncation
-        text = self._normalize_for_translation(text)
+        if not pending:
+            return results
         
+        # Consult the translation memory: only misses reach the model
+        memory = self._get_memory() if self.use_memory else None
+        if memory is not None:
+            misses = []
+            for num_beams in sorted({item[3] for item in pending}):
+                group = [item for item in pending if item[3] == num_beams]
+                try:
+                    # May wait for the model load (see _expected_backend())
+                    key = self._memory_key(num_beams, no_repeat)
+                except Exception as e:
+                    # The model load fails again below and keeps the sources
+                    logging.warning(f"Translation memory skipped, backend not resolved: {e}")
+                    misses.extend(group)
+                    continue
+                cached = memory.get_many(key, [item[1] for item in group])
+                for item in group:
+                    idx, source, url_placeholders, _ = item
+                    if source in cached:
+                        results[idx] = self._restore_urls(cached[source], url_placeholders)
+                    else:
+                        misses.append(item)
+            if len(misses) < len(pending):
+                logging.debug(
+                    f"Translation memory: {len(pending) - len(misses)} hits, {len(misses)} to generate"
+                )
+            pending = misses
+            if not pending:
+                return results
+        
+        # Token counts drive chunking, length bucketing and the output budget
+        budget = min(self.chunk_tokens, max_length)
+        
+        # Jobs are ((pending position, piece number, text, num_beams), token count)
+        jobs = []
+        parts: List[List[Optional[str]]] = []
         try:
-            # Get model and tokenizer for this language pair
-            model, tokenizer = self._get_model()
+            # Waits for the model load; a failed load keeps the sources
+            _, tokenizer = self._get_model()
             
-            # Tokenize input
-            inputs = tokenizer(
-                text,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=max_length
-            ).to(self._device)
+            def count_tokens(segments: List[str]) -> List[int]:
+                encoded = tokenizer(segments, truncation=False, verbose=False)
+                return [len(ids) for ids in encoded["input_ids"]]
             
-            # Generate translation
-            with torch.no_grad():
-                translated_tokens = model.generate(
-                    **inputs,
-                    max_length=max_length,
-                    num_beams=4,  # Beam search for quality
-                    early_stopping=True
-                )
+            for pos, (item, count) in enumerate(zip(pending, count_tokens([item[1] for item in pending]))):
+                pieces, piece_counts = [item[1]], [count]
+                if count > budget:
+                    pieces = chunk_by_token_budget(item[1], count_tokens, budget)
+                    piece_counts = count_tokens(pieces)
+                    logging.debug(f"Split {count}-token segment into {len(pieces)} chunks")
+                parts.append([None] * len(pieces))
+                for number, (piece, piece_count) in enumerate(zip(pieces, piece_counts)):
+                    jobs.append(((pos, number, piece, item[3]), piece_count))
+        except Exception as e:
+            capture_exception(e, context={
+                "operation": "translate_batch_prepare",
+                "segments": len(pending),
+                "source_lang": self.source_lang,
+                "target_lang": self.target_lang,
+                "profile": decoding.name,
+            }, tags={"component": "translator"})
+            logging.error(f"OPUS-MT model unavailable, keeping {len(pending)} segments untranslated: {e}")
+            return results
+        
+        jobs.sort(key=lambda job: (job[0][3], job[1]))
+        size = max(1, batch_size or self.batch_size)
+        
+        for num_beams, group in itertools.groupby(jobs, key=lambda job: job[0][3]):
+            group = list(group)
             
-            # Decode translation
-            translation = tokenizer.batch_decode(
-                translated_tokens,
-                skip_special_tokens=True
-            )[0]
+            for start in range(0, len(group), size):
+                batch = [job for job, _ in group[start:start + size]]
+                max_new_tokens = self._max_new_tokens(
+                    decoding, max(count for _, count in group[start:start + size]), max_length
+                )
+                try:
+                    translations = self._generate(
+                        [job[2] for job in batch],
+                        max_length,
+                        num_beams=num_beams,
+                        max_new_tokens=max_new_tokens,
+                        no_repeat_ngram_size=no_repeat,
+                    )
+                except Exception as e:
+                    capture_exception(e, context={
+                        "operation": "translate_batch",
+                        "batch_size": len(batch),
+                        "text_length": sum(len(job[2]) for job in batch),
+                        "source_lang": self.source_lang,
+                        "target_lang": self.target_lang,
+                        "profile": decoding.name,
+                    }, tags={"component": "translator"})
+                    logging.error(f"OPUS-MT batch translation failed ({len(batch)} segments): {e}")
+                    continue
+                
+                for (pos, number, _, _), translation in zip(batch, translations):
+                    parts[pos][number] = translation
+        
+        # Rejoin chunked segments; a segment with a failed piece keeps its source
+        learned: Dict[int, Dict[str, str]] = {}
+        for (idx, source, url_placeholders, num_beams), pieces in zip(pending, parts):
+            if any(piece is None for piece in pieces):
+                continue
+            translation = " ".join(piece.strip() for piece in pieces)
+            learned.setdefault(num_beams, {})[source] = translation
             
             # Restore protected URLs
             translation = self._restore_urls(translation, url_placeholders)
             
             # Quality logging
-            original_words = len(text.split())
+            original_words = len(source.split())
             translated_words = len(translation.split())
             ratio = translated_words / original_words if original_words > 0 else 1.0
             
             logging.debug(
-                f"OPUS-MT: '{text[:50]}...' ({original_words}w) -> "
+                f"OPUS-MT: '{source[:50]}...' ({original_words}w) -> "
                 f"'{translation[:50]}...' ({translated_words}w, {ratio:.1%})"
             )
-            
-            return translation
-            
-        except Exception as e:
-            capture_exception(e, context={
-                "operation": "translate",
-                "text_length": len(text) if text else 0,
-                "source_lang": self.source_lang,
-                "target_lang": self.target_lang,
-            }, tags={"component": "translator"})
-            logging.error(f"OPUS-MT translation failed: {e}")
-            return text
+            results[idx] = translation
+        
+        if memory is not None:
+            for num_beams, entries in learned.items():
+                memory.put_many(self._memory_key(num_beams, no_repeat), entries)
+        
+        return results
+    
+    def _generate(
+        self,
+        texts: List[str],
+        max_length: int,
+        num_beams: int = 4,
+        max_new_tokens: Optional[int] = None,
+        no_repeat_ngram_size: int = 0,
+    ) -> List[str]:
+        """Run one padded generate() call over prepared segments."""
+        # Get model and tokenizer for this language pair
+        model, tokenizer = self._get_model()
+        max_new_tokens = max_new_tokens or max_length
+        
+        if isinstance(model, OnnxMarianModel):
+            inputs = tokenizer(
+                texts,
+                return_tensors="np",
+                padding=True,
+                truncation=True,
+                max_length=max_length
+            )
+            token_ids = model.generate(
+                inputs["input_ids"],
+                inputs["attention_mask"],
+                max_length=max_new_tokens + 1,  # + decoder start token
+                num_beams=num_beams,
+                no_repeat_ngram_size=no_repeat_ngram_size,
+            )
+            return tokenizer.batch_decode(token_ids, skip_special_tokens=True)
+        
+        # Tokenize input (padded to the longest sequence in the batch)
+        inputs = tokenizer(
+            texts,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=max_length
+        ).to(self._get_device())
+        
+        generate_kwargs = {"max_new_tokens": max_new_tokens, "num_beams": num_beams}
+        if num_beams > 1:
+            generate_kwargs["early_stopping"] = True
+        if no_repeat_ngram_size > 0:
+            # Repetition guard: degenerate loops stop instead of filling the budget
+            generate_kwargs["no_repeat_ngram_size"] = no_repeat_ngram_size
+        
+        # Generate translation
+        with _import_torch().no_grad():
+            translated_tokens = model.generate(**inputs, **generate_kwargs)
+        
+        # Decode translation
+        return tokenizer.batch_decode(
+            translated_tokens,
+            skip_special_tokens=True
+        )
     
     def set_languages(self, source_lang: str, target_lang: str) -> None:
-        """Update source and target languages (loads new model if needed)."""
+        """Update source and target languages (starts loading the new model in the background)."""
         if (source_lang, target_lang) != (self.source_lang, self.target_lang):
+            self._check_pair(source_lang, target_lang)
             self.source_lang = source_lang
             self.target_lang = target_lang
-            self._load_model(source_lang, target_lang)
+            self.preload(source_lang, target_lang)
             logging.info(f"Languages updated: {source_lang} -> {target_lang}")
     
     @classmethod
@@ -534,3 +1576,7 @@ class TranslationEngine:
     def get_supported_languages(cls) -> list:
         """Get list of supported language names."""
         return list(cls.SUPPORTED_LANGUAGES.keys())
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=TranslationEngine._reset_after_fork)
@@ -0,0 +1,211 @@
+"""
+Worker process pool sharing one copy of the OPUS-MT weights.
+
+Scaling translation over processes normally means every worker calls
+MarianMTModel.from_pretrained and holds a private copy of the weights
+(~300 MB per language pair). TranslationWorkerPool loads each language
+pair once in the parent, moves the tensors to shared memory
+(Module.share_memory()) and hands them to the workers:
+
+- fork (Linux/macOS): workers inherit the model; the shared tensors are
+  mapped, not copied, so N workers cost one model's worth of RSS.
+- spawn (Windows): the tensors travel as shared-memory handles through
+  torch.multiprocessing's pickler instead of being copied.
+
+Inside a worker, worker_translator() returns a regular TranslationEngine
+whose cache already holds the shared model. ONNX Runtime sessions cannot
+be shared between processes: with the ONNX backend each worker opens its
+own sessions.
+
+Usage:
+    from app.core.worker_pool import TranslationWorkerPool, worker_translator
+
+    def translate_chunk(texts):
+        return worker_translator().translate_batch(texts)
+
+    with TranslationWorkerPool("en", "it", workers=4) as pool:
+        futures = [pool.submit(translate_chunk, chunk) for chunk in chunks]
+"""
+import logging
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .resources import available_cpus, get_governor
+from .translator import TranslationEngine
+
+logger = logging.getLogger(__name__)
+
+# Engines of the current worker process (set up by _init_worker)
+_worker_engines: Dict[Tuple[str, str], TranslationEngine] = {}
+_worker_default_pair: Optional[Tuple[str, str]] = None
+_worker_engine_options: dict = {}
+
+
+def default_start_method() -> str:
+    """fork where available (copy-on-write sharing), else spawn."""
+    return "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _init_worker(shared: dict, default_pair: Tuple[str, str], workers: int, engine_options: dict) -> None:
+    """Pool initializer: adopt the parent's models and take a share of the CPU."""
+    global _worker_default_pair, _worker_engine_options
+
+    governor = get_governor()
+    governor.configure(workers=workers)
+    governor.apply_torch()
+    # OCR/layout sessions inherited through fork need fresh thread pools
+    governor.refresh()
+
+    # Shared weights stay for the worker's lifetime
+    TranslationEngine.configure_cache(idle_ttl=0)
+    for (source_lang, target_lang), (model, tokenizer, precision) in shared.items():
+        TranslationEngine.adopt_model(source_lang, target_lang, model, tokenizer, precision)
+
+    _worker_engines.clear()
+    _worker_default_pair = default_pair
+    _worker_engine_options = dict(engine_options)
+
+
+def worker_translator(
+    source_lang: Optional[str] = None,
+    target_lang: Optional[str] = None,
+) -> TranslationEngine:
+    """
+    TranslationEngine of the current pool worker.
+
+    Defaults to the pool's first language pair. Pairs the pool did not
+    share are loaded privately on first use. Engines are created with the
+    pool's engine_options.
+
+    Raises:
+        RuntimeError: Not called from a TranslationWorkerPool worker
+    """
+    if source_lang and target_lang:
+        lang_pair = (source_lang, target_lang)
+    else:
+        lang_pair = _worker_default_pair
+    if lang_pair is None:
+        raise RuntimeError("worker_translator() called outside a TranslationWorkerPool worker")
+
+    engine = _worker_engines.get(lang_pair)
+    if engine is None:
+        engine = TranslationEngine(*lang_pair, **_worker_engine_options)
+        _worker_engines[lang_pair] = engine
+    return engine
+
+
+def _translate_slice(lang_pair: Tuple[str, str], texts: List[str], options: dict) -> List[str]:
+    return worker_translator(*lang_pair).translate_batch(texts, **options)
+
+
+class TranslationWorkerPool:
+    """
+    Process pool whose workers share the parent's OPUS-MT weights.
+
+    Models are loaded (and moved to shared memory) when the pool is
+    created; worker processes start on the first submit().
+    """
+
+    def __init__(
+        self,
+        source_lang: str = "en",
+        target_lang: str = "it",
+        workers: Optional[int] = None,
+        extra_pairs: Sequence[Tuple[str, str]] = (),
+        start_method: Optional[str] = None,
+        engine_options: Optional[dict] = None,
+    ):
+        """
+        Args:
+            source_lang: Source language code of the default pair
+            target_lang: Target language code of the default pair
+            workers: Worker processes (default: available CPUs)
+            extra_pairs: Further language pairs to share with the workers
+            start_method: "fork" or "spawn" (default: fork where available)
+            engine_options: TranslationEngine arguments for the workers'
+                engines (see TranslationEngine.engine_options())
+
+        Raises:
+            ValueError: Language pair not supported
+        """
+        self.workers = max(1, workers or available_cpus())
+        self.pairs = [(source_lang, target_lang), *[tuple(pair) for pair in extra_pairs]]
+        self.start_method = start_method or default_start_method()
+
+        # Each worker gets its share of the CPU budget
+        get_governor().configure(workers=self.workers)
+
+        shared = {}
+        for lang_pair in self.pairs:
+            TranslationEngine(*lang_pair).wait_until_ready()
+            model, tokenizer, precision, backend = TranslationEngine.loaded_model(*lang_pair)
+            if backend != "torch":
+                logger.warning(
+                    f"{lang_pair[0]} -> {lang_pair[1]}: {backend} models cannot be shared, "
+                    f"each worker loads its own"
+                )
+                continue
+            try:
+                model.share_memory()
+            except RuntimeError as e:
+                # Still shared copy-on-write under fork
+                logger.debug(f"share_memory() failed for {lang_pair}: {e}")
+            shared[lang_pair] = (model, tokenizer, precision)
+
+        if self.start_method == "spawn":
+            # Registers the shared-memory tensor pickler used to send the models
+            import torch.multiprocessing  # noqa: F401
+        context = multiprocessing.get_context(self.start_method)
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(shared, self.pairs[0], self.workers, engine_options or {}),
+        )
+        logger.info(
+            f"Translation worker pool: {self.workers} workers ({self.start_method}), "
+            f"shared models: {[f'{src}-{tgt}' for src, tgt in shared]}"
+        )
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run fn(*args, **kwargs) in a worker; fn may call worker_translator()."""
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def map(self, fn: Callable, *iterables: Iterable, chunksize: int = 1):
+        """Executor.map() over the workers, results in input order."""
+        return self._executor.map(fn, *iterables, chunksize=chunksize)
+
+    def translate_batch(
+        self,
+        texts: List[str],
+        source_lang: Optional[str] = None,
+        target_lang: Optional[str] = None,
+        **options,
+    ) -> List[str]:
+        """
+        Translate segments split evenly over the workers (input order kept).
+
+        options are passed to TranslationEngine.translate_batch().
+        """
+        if not texts:
+            return []
+        lang_pair = (source_lang or self.pairs[0][0], target_lang or self.pairs[0][1])
+        size = -(-len(texts) // self.workers)
+        futures = [
+            self.submit(_translate_slice, lang_pair, texts[start:start + size], options)
+            for start in range(0, len(texts), size)
+        ]
+        return [translation for future in futures for translation in future.result()]
+
+    def close(self, wait: bool = True) -> None:
+        """Shut the workers down and give the CPU budget back."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        get_governor().configure(workers=1)
+
+    def __enter__(self) -> "TranslationWorkerPool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -12,12 +12,13 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QThread, Signal, Slot, QPropertyAnimation, QEasingCurve, Property
 from PySide6.QtGui import QAction, QKeySequence
 import logging
-import gc
 from pathlib import Path
-import pymupdf
 
 from .pdf_viewer import PDFViewerWidget
 from ..core import TranslationEngine, PDFProcessor
+from ..core.translation_server import RemoteTranslationEngine
+from ..core.job_journal import JobJournal
+from ..core.page_store import TranslatedPageStore
 from ..core.sentry_integration import (
     capture_exception,
     add_breadcrumb,
@@ -32,21 +33,32 @@ class TranslationWorker(QThread):
     finished = Signal(object)
     error = Signal(str)
     
-    def __init__(self, pdf_processor, translator, page_num, use_original_color=True):
+    def __init__(self, pdf_processor, translator, page_num, use_original_color=True, into=None):
         super().__init__()
         self.pdf_processor = pdf_processor
         self.translator = translator
         self.page_num = page_num
         self.use_original_color = use_original_color
+        # TranslatedPageStore the page is translated into (in place)
+        self.into = into
         
     def run(self):
         try:
-            translated_doc = self.pdf_processor.translate_page(
-                self.page_num,
-                self.translator,
-                use_original_color=self.use_original_color
-            )
-            self.finished.emit(translated_doc)
+            # Segments/OCR and MT run without the document lock; it is held
+            # only while the translation is inserted, so the viewer can
+            # render meanwhile
+            plan, ocr_result = self.pdf_processor.prepare_page(self.page_num, self.translator)
+            with self.pdf_processor.mupdf_lock:
+                self.pdf_processor.translate_page(
+                    self.page_num,
+                    self.translator,
+                    use_original_color=self.use_original_color,
+                    plan=plan,
+                    ocr_result=ocr_result,
+                    into=self.into,
+                )
+            self.into.mark_translated(self.page_num)
+            self.finished.emit(self.page_num)
         except Exception as e:
             # Report to Sentry with context
             capture_exception(e, context={
@@ -57,25 +69,49 @@ class TranslationWorker(QThread):
             self.error.emit(str(e))
 
 
+class PageRenderWorker(QThread):
+    """Background worker rendering a translated page while the document is busy."""
+    
+    # Signal: page_num, PNG bytes, width, height
+    rendered = Signal(int, object, int, int)
+    
+    def __init__(self, page_store, page_num):
+        super().__init__()
+        self.page_store = page_store
+        self.page_num = page_num
+    
+    def run(self):
+        try:
+            img_data, width, height = self.page_store.render_png(self.page_num)
+            self.rendered.emit(self.page_num, img_data, width, height)
+        except Exception as e:
+            logging.error(f"Failed to render translated page {self.page_num + 1}: {e}")
+
+
 class BatchTranslationWorker(QThread):
     """Background worker for batch translation of all pages."""
     
     # Signal: current_page, total_pages
     progress = Signal(int, int)
-    # Signal: page_num, pdf_bytes (serialized document)
-    page_finished = Signal(int, bytes)
+    # Signal: page_num (translated in place in the output document)
+    page_finished = Signal(int)
     # Signal: total pages count
     all_finished = Signal(int)
     # Signal: error message
     error = Signal(str)
     
-    def __init__(self, pdf_processor, translator, already_translated_pages: set = None, use_original_color=True):
+    def __init__(self, pdf_processor, translator, already_translated_pages: set = None, use_original_color=True,
+                 journal: JobJournal = None, into=None):
         super().__init__()
         self.pdf_processor = pdf_processor
         self.translator = translator
         # Store just the page numbers that are already translated
         self.already_translated_pages = already_translated_pages or set()
         self.use_original_color = use_original_color
+        # Checkpoints of earlier (crashed or cancelled) runs on this document
+        self.journal = journal
+        # TranslatedPageStore the pages are translated into (in place)
+        self.into = into
         self._cancelled = False
         self.pages_translated = 0
     
@@ -88,38 +124,37 @@ class BatchTranslationWorker(QThread):
             total_pages = self.pdf_processor.page_count
             self.pages_translated = 0
             
-            for page_num in range(total_pages):
-                # Check for cancellation
-                if self._cancelled:
-                    logging.info("Batch translation cancelled by user")
-                    break
-                
-                # Skip already translated pages
-                if page_num in self.already_translated_pages:
-                    self.progress.emit(page_num + 1, total_pages)
-                    continue
-                
-                # Emit progress before starting
-                self.progress.emit(page_num + 1, total_pages)
-                
-                # Translate the page
-                translated_doc = self.pdf_processor.translate_page(
-                    page_num,
-                    self.translator,
-                    use_original_color=self.use_original_color
-                )
-                
-                # Serialize document to bytes for thread-safe transfer
-                if translated_doc:
-                    pdf_bytes = translated_doc.tobytes()
-                    self.page_finished.emit(page_num, pdf_bytes)
-                    self.pages_translated += 1
-                    logging.info(f"Worker: Page {page_num + 1} translated ({self.pages_translated} total)")
-                else:
-                    logging.warning(f"Worker: Page {page_num + 1} returned None")
+            pending_pages = [
+                p for p in range(total_pages) if p not in self.already_translated_pages
+            ]
+            if pending_pages:
+                self.progress.emit(pending_pages[0] + 1, total_pages)
+            
+            def page_done(page_num: int, _pdf_bytes) -> None:
+                self.page_finished.emit(page_num)
+                self.pages_translated += 1
+                logging.info(f"Worker: Page {page_num + 1} translated ({self.pages_translated} total)")
+            
+            # Pages are translated inside the shared output document (in
+            # parallel worker processes when LAC_PAGE_WORKERS > 1); pages
+            # arrive in completion order
+            self.pdf_processor.translate_document(
+                self.translator,
+                pages=pending_pages,
+                progress_callback=lambda done, _: self.progress.emit(
+                    len(self.already_translated_pages) + done, total_pages
+                ),
+                page_callback=page_done,
+                should_cancel=lambda: self._cancelled,
+                journal=self.journal,
+                into=self.into,
+                use_original_color=self.use_original_color,
+            )
             
-            # Emit all finished with count
-            if not self._cancelled:
+            if self._cancelled:
+                logging.info("Batch translation cancelled by user")
+            else:
+                # Emit all finished with count
                 self.all_finished.emit(self.pages_translated)
                 
         except Exception as e:
@@ -231,9 +266,14 @@ class MainWindow(QMainWindow):
         self.pdf_processor = None
         self.translator = None
         self.current_page = 0
-        self.translated_pages = {}
+        # Translated pages live in one file-backed copy of the document,
+        # translated in place and spilled to disk past a memory budget
+        self.page_store = None
+        self.translated_pages = set()
         self.translation_worker = None
         self.batch_translation_worker = None
+        self.render_workers = set()
+        self.job_journal = None
         
         self._init_ui()
         self._create_actions()
@@ -242,7 +282,11 @@ class MainWindow(QMainWindow):
         
         source_code = TranslationEngine.get_language_code("English")
         target_code = TranslationEngine.get_language_code("Italiano")
-        self.translator = TranslationEngine(source_code, target_code)
+        # Shared translation server if configured (LAC_MT_SERVER), else local models
+        self.translator = (
+            RemoteTranslationEngine.from_environment(source_code, target_code)
+            or TranslationEngine(source_code, target_code)
+        )
         
         logging.info("LAC Translate Enterprise initialized")
     
@@ -1002,6 +1046,12 @@ class MainWindow(QMainWindow):
         try:
             if self.pdf_processor:
                 self.pdf_processor.close()
+            if self.job_journal:
+                self.job_journal.close()
+                self.job_journal = None
+            if self.page_store:
+                self.page_store.close()
+                self.page_store = None
             
             self.pdf_processor = PDFProcessor(file_path)
             self.current_page = 0
@@ -1077,13 +1127,36 @@ class MainWindow(QMainWindow):
             self.translated_viewer.clear()
             self.translated_panel.set_active(False)
     
+    def _output_document(self) -> TranslatedPageStore:
+        """Store of the open document that translations are written into."""
+        if self.page_store is None:
+            self.page_store = TranslatedPageStore(self.pdf_processor)
+        return self.page_store
+    
     def display_translated_page(self, page_num):
         """Display translated version of page."""
-        translated_doc = self.translated_pages[page_num]
-        page = translated_doc[0]
-        pix = page.get_pixmap(matrix=pymupdf.Matrix(1.5, 1.5))
-        img_data = pix.tobytes("png")
-        self.translated_viewer.display_page(img_data, pix.width, pix.height)
+        # A worker inserting a page holds the document: render in the
+        # background then, keeping the current view until it is done
+        view = self.page_store.render_png(page_num, wait=False)
+        if view is None:
+            worker = PageRenderWorker(self.page_store, page_num)
+            worker.rendered.connect(self.on_translated_page_rendered)
+            worker.finished.connect(lambda: self.render_workers.discard(worker))
+            self.render_workers.add(worker)
+            worker.start()
+            return
+        img_data, width, height = view
+        self.translated_viewer.display_page(img_data, width, height)
+        self.translated_viewer.zoom_fit()
+    
+    @Slot(int, object, int, int)
+    def on_translated_page_rendered(self, page_num, img_data, width, height):
+        """Show a translated page rendered in the background, if still current."""
+        if self.sender().page_store is not self.page_store:
+            return  # another document was opened meanwhile
+        if page_num != self.current_page or page_num not in self.translated_pages:
+            return
+        self.translated_viewer.display_page(img_data, width, height)
         self.translated_viewer.zoom_fit()
     
     @Slot()
@@ -1150,21 +1223,20 @@ class MainWindow(QMainWindow):
         self.translation_worker = TranslationWorker(
             self.pdf_processor,
             self.translator,
-            self.current_page
+            self.current_page,
+            into=self._output_document(),
         )
         self.translation_worker.finished.connect(self.on_translation_finished)
         self.translation_worker.error.connect(self.on_translation_error)
         self.translation_worker.start()
     
     @Slot(object)
-    def on_translation_finished(self, translated_doc):
+    def on_translation_finished(self, page_num):
         """Handle translation completion."""
-        self.translated_pages[self.current_page] = translated_doc
-        self.display_translated_page(self.current_page)
-        self.translated_panel.set_active(True)
-        
-        # Force garbage collection to prevent memory buildup
-        gc.collect()
+        self.translated_pages.add(page_num)
+        if page_num == self.current_page:
+            self.display_translated_page(page_num)
+            self.translated_panel.set_active(True)
         
         self.progress_container.setVisible(False)
         self.status_bar.showMessage(
@@ -1266,11 +1338,20 @@ class MainWindow(QMainWindow):
         self.btn_translate_all.setText("Cancel Translation")
         self.btn_translate_all.setEnabled(True)
         
+        # Resume from the checkpoints of an interrupted run, if any
+        if self.job_journal is None:
+            try:
+                self.job_journal = JobJournal.for_source(self.pdf_processor.pdf_path)
+            except Exception as e:
+                logging.warning(f"Job journal unavailable, pages will not be checkpointed: {e}")
+        
         # Start batch translation worker
         self.batch_translation_worker = BatchTranslationWorker(
             self.pdf_processor,
             self.translator,
-            already_translated_pages=set(self.translated_pages.keys())
+            already_translated_pages=set(self.translated_pages),
+            journal=self.job_journal,
+            into=self._output_document(),
         )
         # Use Qt.QueuedConnection for cross-thread signal handling
         self.batch_translation_worker.progress.connect(
@@ -1297,27 +1378,20 @@ class MainWindow(QMainWindow):
         self.progress_label.setText(f"Translating page {current_page} of {total_pages}...")
         self.status_bar.showMessage(f"Translating page {current_page}/{total_pages}")
     
-    @Slot(int, bytes)
-    def on_batch_page_finished(self, page_num: int, pdf_bytes: bytes):
+    @Slot(int)
+    def on_batch_page_finished(self, page_num: int):
         """Handle completion of a single page during batch translation."""
-        if pdf_bytes:
+        # The page is already in self.page_store
+        self.translated_pages.add(page_num)
+        logging.info(f"Batch: Page {page_num + 1} translated (total: {len(self.translated_pages)})")
+        
+        # Update viewer if this is the current page
+        if page_num == self.current_page:
             try:
-                # Deserialize PDF bytes back to document
-                translated_doc = pymupdf.open(stream=pdf_bytes, filetype="pdf")
-                self.translated_pages[page_num] = translated_doc
-                logging.info(f"Batch: Page {page_num + 1} translated and stored (total: {len(self.translated_pages)})")
-                
-                # Update viewer if this is the current page
-                if page_num == self.current_page:
-                    self.display_translated_page(page_num)
-                    self.translated_panel.set_active(True)
-                
-                # Force garbage collection to prevent memory buildup
-                gc.collect()
+                self.display_translated_page(page_num)
+                self.translated_panel.set_active(True)
             except Exception as e:
-                logging.error(f"Failed to deserialize page {page_num + 1}: {e}")
-        else:
-            logging.warning(f"Batch: Page {page_num + 1} returned empty bytes!")
+                logging.error(f"Failed to display page {page_num + 1}: {e}")
     
     @Slot(int)
     def on_batch_all_finished(self, pages_count: int):
@@ -1407,19 +1481,9 @@ class MainWindow(QMainWindow):
             return
         
         try:
-            output_doc = pymupdf.open()
-            
-            for page_num in sorted(self.translated_pages.keys()):
-                translated_doc = self.translated_pages[page_num]
-                output_doc.insert_pdf(translated_doc)
-            
-            output_doc.save(
-                file_path,
-                garbage=4,
-                deflate=True,
-                clean=True
-            )
-            output_doc.close()
+            # Written straight from the store's file: shared images and
+            # fonts once, untranslated pages dropped
+            self.page_store.save(file_path)
             
             # Track successful save
             add_breadcrumb(
@@ -1438,6 +1502,11 @@ class MainWindow(QMainWindow):
             
             logging.info(f"Saved translated PDF: {file_path}")
             
+            # Whole document saved: the checkpoints are no longer needed
+            if self.job_journal and len(self.translated_pages) == self.pdf_processor.page_count:
+                self.job_journal.discard()
+                self.job_journal = None
+            
         except Exception as e:
             # Report to Sentry
             capture_exception(e, context={
@@ -4,6 +4,12 @@ LAC Translate - PyInstaller Build Specification (Windows & Linux)
 
 App: Professional PDF translation with OCR (RapidDoc + RapidOCR + NLLB-200)
 Version: 1.0.0
+
+Torch-free variant: LAC_BUILD_ONNX_ONLY=1 pyinstaller lac_translate.spec
+leaves torch out of the bundle (several hundred MB). The app then
+translates on ONNX Runtime only, so every language pair needs an ONNX
+export in the user's Hugging Face cache (TranslationEngine.export_onnx(),
+run where torch and optimum are installed).
 """
 
 import sys
@@ -13,6 +19,9 @@ from PyInstaller.utils.hooks import collect_data_files, collect_submodules, coll
 
 block_cipher = None
 
+# Build without torch (see above)
+ONNX_ONLY = os.environ.get('LAC_BUILD_ONNX_ONLY', '').strip().lower() in ('1', 'true', 'yes')
+
 # Collect binaries/dynamic libraries (must be before openvino section)
 binaries = []
 
@@ -75,9 +84,6 @@ hiddenimports = [
     'transformers.models.m2m_100',
     'sentencepiece',
     'sacremoses',
-    'torch',
-    'torch.nn',
-    'torch.nn.functional',
     
     # PDF processing
     'fitz',
@@ -105,6 +111,19 @@ hiddenimports = [
     'app.core',
     'app.core.pdf_processor',
     'app.core.translator',
+    'app.core.translation_memory',
+    'app.core.translation_plan',
+    'app.core.onnx_marian',
+    'app.core.resources',
+    'app.core.translation_server',
+    'app.core.worker_pool',
+    'app.core.page_pipeline',
+    'app.core.job_journal',
+    'app.core.page_store',
+    'app.core.ocr_cache',
+    'app.core.ocr_pool',
+    'app.core.page_analysis',
+    'app.core.page_triage',
     'app.core.rapid_ocr',
     'app.core.rapid_doc_engine',
     'app.core.ocr_utils',
@@ -117,9 +136,17 @@ hiddenimports = [
     'app.ui.pdf_viewer',
 ]
 
+if not ONNX_ONLY:
+    hiddenimports += [
+        'torch',
+        'torch.nn',
+        'torch.nn.functional',
+    ]
+
 # Collect all submodules for complex packages
 hiddenimports += collect_submodules('transformers')
-hiddenimports += collect_submodules('torch')
+if not ONNX_ONLY:
+    hiddenimports += collect_submodules('torch')
 hiddenimports += collect_submodules('PySide6')
 hiddenimports += collect_submodules('rapidocr')
 hiddenimports += collect_submodules('rapid_doc')
@@ -134,6 +161,8 @@ excludes = [
     'notebook',
     'pytest',
 ]
+if ONNX_ONLY:
+    excludes += ['torch', 'torchvision', 'torchaudio', 'optimum']
 
 a = Analysis(
     ['app/main_qt.py'],